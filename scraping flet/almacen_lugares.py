@@ -0,0 +1,251 @@
+"""
+Almacén SQLite opcional de corridas, búsquedas y lugares, con índices para consultas entre corridas
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+
+from cache_lugares import extraer_id_lugar
+from escritor_resultados import EscritorIncremental
+from lugar import CAMPOS_LUGAR, Lugar
+
+# Base de datos por defecto (junto a las carpetas de resultados)
+RUTA_BASE_DATOS = "resultados.db"
+
+# Escrituras de lugares (nuevos, actualizados o vinculados) entre cada commit; el resto se confirma al terminar la corrida
+LUGARES_POR_COMMIT = 25
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS busquedas (
+    id INTEGER PRIMARY KEY,
+    query TEXT NOT NULL,
+    location TEXT NOT NULL,
+    UNIQUE (query, location)
+);
+CREATE TABLE IF NOT EXISTS corridas (
+    id INTEGER PRIMARY KEY,
+    busqueda_id INTEGER NOT NULL REFERENCES busquedas(id),
+    timestamp TEXT NOT NULL,
+    iniciada TEXT NOT NULL,
+    terminada TEXT,
+    total INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS lugares (
+    id_lugar TEXT PRIMARY KEY,
+    nombre TEXT,
+    tipo TEXT,
+    direccion TEXT,
+    telefono TEXT,
+    website TEXT,
+    rating REAL,
+    cantidad_reseñas INTEGER,
+    url TEXT,
+    actualizado TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS corrida_lugares (
+    corrida_id INTEGER NOT NULL REFERENCES corridas(id),
+    id_lugar TEXT NOT NULL REFERENCES lugares(id_lugar),
+    posicion INTEGER NOT NULL,
+    PRIMARY KEY (corrida_id, id_lugar)
+);
+CREATE INDEX IF NOT EXISTS idx_lugares_telefono ON lugares(telefono);
+CREATE INDEX IF NOT EXISTS idx_lugares_tipo ON lugares(tipo);
+CREATE INDEX IF NOT EXISTS idx_corrida_lugares_lugar ON corrida_lugares(id_lugar);
+CREATE INDEX IF NOT EXISTS idx_busquedas_location ON busquedas(location);
+"""
+
+# Un dato nuevo pisa al guardado, salvo que venga vacío: así se conserva lo más reciente conocido
+UPSERT_LUGAR = """
+INSERT INTO lugares (id_lugar, nombre, tipo, direccion, telefono, website, rating, cantidad_reseñas, url, actualizado)
+VALUES (:id_lugar, :nombre, :tipo, :direccion, :telefono, :website, :rating, :cantidad_reseñas, :url, :actualizado)
+ON CONFLICT (id_lugar) DO UPDATE SET
+    nombre = COALESCE(excluded.nombre, nombre),
+    tipo = COALESCE(excluded.tipo, tipo),
+    direccion = COALESCE(excluded.direccion, direccion),
+    telefono = COALESCE(excluded.telefono, telefono),
+    website = COALESCE(excluded.website, website),
+    rating = COALESCE(excluded.rating, rating),
+    cantidad_reseñas = COALESCE(excluded.cantidad_reseñas, cantidad_reseñas),
+    url = COALESCE(excluded.url, url),
+    actualizado = excluded.actualizado
+"""
+
+
+def clave_lugar(lugar, url=None):
+    """Identificador del lugar: el de su URL de Maps o, sin URL, su nombre y dirección"""
+    if url:
+        return extraer_id_lugar(url)
+    return f"{(lugar.nombre or '').lower()}|{(lugar.direccion or '').lower()}"
+
+
+class AlmacenLugares:
+    """Guarda cada lugar extraído en SQLite, una sola vez por lugar aunque aparezca en varias corridas.
+
+    Las búsquedas (query + location) agrupan corridas, y cada corrida recuerda qué lugares
+    trajo y en qué orden. Los JSON/CSV/TXT de una corrida se pueden volver a generar con `exportar`.
+    """
+
+    def __init__(self, ruta=RUTA_BASE_DATOS):
+        self.ruta = ruta
+        self._lock = threading.Lock()
+        self._sin_confirmar = 0
+        self._posiciones = {}
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self._conexion.row_factory = sqlite3.Row
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.executescript(ESQUEMA)
+        self._conexion.commit()
+
+    def iniciar_corrida(self, query, location, timestamp):
+        """Registra una corrida nueva de la búsqueda y devuelve su id"""
+        with self._lock:
+            self._conexion.execute(
+                "INSERT OR IGNORE INTO busquedas (query, location) VALUES (?, ?)", (query, location)
+            )
+            busqueda_id = self._conexion.execute(
+                "SELECT id FROM busquedas WHERE query = ? AND location = ?", (query, location)
+            ).fetchone()[0]
+            cursor = self._conexion.execute(
+                "INSERT INTO corridas (busqueda_id, timestamp, iniciada) VALUES (?, ?, ?)",
+                (busqueda_id, timestamp, datetime.now().isoformat(timespec='seconds'))
+            )
+            self._conexion.commit()
+            self._posiciones[cursor.lastrowid] = 0
+            return cursor.lastrowid
+
+    @staticmethod
+    def _fila(lugar, url=None, id_lugar=None):
+        # Los campos ya vienen tipados: None se guarda como NULL y no pisa lo conocido
+        fila = lugar.a_dict()
+        fila['id_lugar'] = id_lugar or clave_lugar(lugar, url)
+        fila['url'] = url
+        fila['actualizado'] = datetime.now().isoformat(timespec='seconds')
+        return fila
+
+    def guardar_lugar(self, corrida_id, lugar, url=None, id_lugar=None):
+        """Inserta o actualiza el `Lugar` y lo asocia a la corrida"""
+        fila = self._fila(lugar, url, id_lugar)
+
+        with self._lock:
+            self._conexion.execute(UPSERT_LUGAR, fila)
+            posicion = self._posiciones.get(corrida_id, 0)
+            cursor = self._conexion.execute(
+                "INSERT OR IGNORE INTO corrida_lugares (corrida_id, id_lugar, posicion) VALUES (?, ?, ?)",
+                (corrida_id, fila['id_lugar'], posicion)
+            )
+            self._posiciones[corrida_id] = posicion + cursor.rowcount
+            self._contar_escritura()
+
+    def _contar_escritura(self):
+        """Confirma cada LUGARES_POR_COMMIT escrituras, sean lugares nuevos, actualizados o vinculados.
+
+        Se llama con el lock tomado.
+        """
+        self._sin_confirmar += 1
+        if self._sin_confirmar >= LUGARES_POR_COMMIT:
+            self._conexion.commit()
+            self._sin_confirmar = 0
+
+    def actualizar_lugar(self, id_lugar, lugar):
+        """Actualiza los datos de un lugar ya guardado sin sumarlo a ninguna corrida"""
+        with self._lock:
+            self._conexion.execute(UPSERT_LUGAR, self._fila(lugar, id_lugar=id_lugar))
+            self._contar_escritura()
+
+    def vincular_lugar(self, corrida_id, id_lugar):
+        """Asocia a la corrida un lugar ya guardado (un duplicado u omitido), sin tocar sus datos.
+
+        Si el lugar no está en la base no se hace nada.
+        """
+        with self._lock:
+            posicion = self._posiciones.get(corrida_id, 0)
+            cursor = self._conexion.execute(
+                "INSERT OR IGNORE INTO corrida_lugares (corrida_id, id_lugar, posicion) "
+                "SELECT ?, id_lugar, ? FROM lugares WHERE id_lugar = ?",
+                (corrida_id, posicion, id_lugar)
+            )
+            self._posiciones[corrida_id] = posicion + cursor.rowcount
+            self._contar_escritura()
+
+    def terminar_corrida(self, corrida_id):
+        """Cierra la corrida con su total de lugares y confirma todo lo pendiente"""
+        with self._lock:
+            self._conexion.execute(
+                "UPDATE corridas SET terminada = ?, "
+                "total = (SELECT COUNT(*) FROM corrida_lugares WHERE corrida_id = ?) WHERE id = ?",
+                (datetime.now().isoformat(timespec='seconds'), corrida_id, corrida_id)
+            )
+            self._conexion.commit()
+            self._sin_confirmar = 0
+            self._posiciones.pop(corrida_id, None)
+
+    def consultar(self, location=None, query=None, tipo=None, con_telefono=False):
+        """Lugares distintos de todas las corridas que cumplen los filtros, como `Lugar`.
+
+        `location` y `query` buscan por texto parcial (LIKE de SQLite).
+        """
+        condiciones = []
+        parametros = []
+        if location:
+            condiciones.append("b.location LIKE ?")
+            parametros.append(f"%{location}%")
+        if query:
+            condiciones.append("b.query LIKE ?")
+            parametros.append(f"%{query}%")
+        if tipo:
+            condiciones.append("l.tipo = ?")
+            parametros.append(tipo)
+        if con_telefono:
+            condiciones.append("l.telefono IS NOT NULL")
+
+        sql = (
+            "SELECT DISTINCT l.* FROM lugares l "
+            "JOIN corrida_lugares cl ON cl.id_lugar = l.id_lugar "
+            "JOIN corridas c ON c.id = cl.corrida_id "
+            "JOIN busquedas b ON b.id = c.busqueda_id"
+        )
+        if condiciones:
+            sql += " WHERE " + " AND ".join(condiciones)
+        sql += " ORDER BY l.nombre"
+
+        with self._lock:
+            return [self._a_lugar(fila) for fila in self._conexion.execute(sql, parametros)]
+
+    def lugares_de_corrida(self, corrida_id):
+        """Lugares de una corrida, en el orden en que se extrajeron"""
+        with self._lock:
+            filas = self._conexion.execute(
+                "SELECT l.* FROM corrida_lugares cl JOIN lugares l ON l.id_lugar = cl.id_lugar "
+                "WHERE cl.corrida_id = ? ORDER BY cl.posicion",
+                (corrida_id,)
+            ).fetchall()
+        return [self._a_lugar(fila) for fila in filas]
+
+    def exportar(self, corrida_id):
+        """Genera los JSON/CSV/TXT de una corrida desde la base; devuelve el escritor usado"""
+        with self._lock:
+            corrida = self._conexion.execute(
+                "SELECT b.query, b.location, c.timestamp FROM corridas c "
+                "JOIN busquedas b ON b.id = c.busqueda_id WHERE c.id = ?",
+                (corrida_id,)
+            ).fetchone()
+        if corrida is None:
+            raise ValueError(f"No existe la corrida {corrida_id}")
+
+        escritor = EscritorIncremental(corrida['query'], corrida['location'], f"{corrida['timestamp']}_db")
+        for lugar in self.lugares_de_corrida(corrida_id):
+            escritor.agregar(lugar)
+        escritor.cerrar()
+        return escritor
+
+    def cerrar(self):
+        """Confirma lo pendiente y cierra la conexión"""
+        with self._lock:
+            self._conexion.commit()
+            self._conexion.close()
+
+    @staticmethod
+    def _a_lugar(fila):
+        # Las columnas ya tienen el tipo de cada campo; NULL vuelve como None
+        return Lugar(**{campo: fila[campo] for campo in CAMPOS_LUGAR})
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Benchmark del scraper contra el sitio de prueba local, sin salir a internet
+
+Corre la misma búsqueda con cada combinación de modo, navegadores y pestañas y reporta
+lugares por minuto, latencia por etapa (las métricas del motor) y memoria.
+Necesita Chrome, igual que el scraper.
+
+Ejemplos:
+    python benchmark_scraping.py
+    python benchmark_scraping.py --lugares 200 --latencia 0.3 --navegadores 1 2 4 --pestanas 1 3
+    python benchmark_scraping.py --modos detalle listado --desde-json resultados_20250101_000000.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from motor_scraping import CONFIG_POR_DEFECTO, MotorScraping
+from sitio_prueba import SitioPrueba, lugares_sinteticos
+
+# Opciones del motor que definen cada modo de extracción
+MODOS = {
+    'detalle': {},
+    'liviana': {'red_liviana': True},
+    # Sin completar teléfonos: mide solo la lectura de las tarjetas
+    'listado': {'solo_listado': True, 'completar_telefonos': False},
+}
+
+
+def memoria_proceso_mb():
+    """Pico de memoria residente de este proceso (MB), o None donde no se puede medir"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux lo informa en KB y macOS en bytes
+    return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+
+def ejecutar_escenario(sitio, modo, navegadores, pestanas, args):
+    """Corre una búsqueda completa contra el sitio y devuelve sus mediciones"""
+    config = dict(
+        CONFIG_POR_DEFECTO,
+        max_results=len(sitio.lugares),
+        espera_inactiva=max(1, sitio.latencia * 4),
+        num_workers=navegadores,
+        pestanas=pestanas,
+        headless=not args.visible,
+        url_base=sitio.url_base,
+        **MODOS[modo],
+    )
+    errores = []
+
+    def al_log(mensaje, nivel, icono):
+        if nivel == 'error':
+            errores.append(mensaje)
+
+    motor = MotorScraping(al_log=al_log)
+    motor.iniciar()
+    peticiones_antes = sitio.peticiones
+    inicio = time.perf_counter()
+    try:
+        total = motor.buscar("benchmark", "sitio de prueba", config)
+        segundos = time.perf_counter() - inicio
+        # Los navegadores siguen abiertos hasta cerrar el motor: se miden antes
+        memoria_navegadores = motor.sesiones.memoria_total_mb()
+    finally:
+        motor.cerrar()
+
+    return {
+        'modo': modo,
+        'navegadores': navegadores,
+        'pestanas': pestanas,
+        'lugares': total,
+        'fallidos': motor.estadisticas.fallidos,
+        'segundos': round(segundos, 2),
+        'lugares_por_minuto': round(total / segundos * 60, 1) if segundos else None,
+        'peticiones': sitio.peticiones - peticiones_antes,
+        # Los mismos histogramas por etapa que muestra la app
+        'etapas': motor.metricas.resumen(),
+        'memoria_navegadores_mb': round(memoria_navegadores, 1),
+        'memoria_proceso_mb': memoria_proceso_mb(),
+        'errores': errores[:5],
+    }
+
+
+def imprimir_escenario(resultado):
+    """Una línea de resumen y la latencia de cada etapa"""
+    print(
+        f"▶️ {resultado['modo']:<8} {resultado['navegadores']} nav × {resultado['pestanas']} pest: "
+        f"{resultado['lugares']} lugares en {resultado['segundos']:.1f} s • "
+        f"{resultado['lugares_por_minuto']} lugares/min • "
+        f"Chrome {resultado['memoria_navegadores_mb']:.0f} MB",
+        flush=True
+    )
+    for etapa, medida in resultado['etapas'].items():
+        print(
+            f"     {etapa:<16} n={medida['eventos']:<4} p50={medida['p50'] * 1000:7.0f} ms  "
+            f"p95={medida['p95'] * 1000:7.0f} ms  max={medida['max'] * 1000:7.0f} ms"
+        )
+    for error in resultado['errores']:
+        print(f"     ❌ {error}", file=sys.stderr)
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(description="⏱️ Benchmark del scraper contra un sitio de Maps local")
+    parser.add_argument('--lugares', type=int, default=60, help="Lugares sintéticos del sitio de prueba")
+    parser.add_argument('--desde-json', help="Usa los lugares del JSON de una corrida anterior")
+    parser.add_argument('--latencia', type=float, default=0.2, help="Demora de cada respuesta del sitio (s)")
+    parser.add_argument('--variacion', type=float, default=0.25, help="Variación de la latencia (fracción)")
+    parser.add_argument('--modos', nargs='+', choices=list(MODOS), default=['detalle'])
+    parser.add_argument('--navegadores', nargs='+', type=int, default=[1, 2])
+    parser.add_argument('--pestanas', nargs='+', type=int, default=[1])
+    parser.add_argument('--repeticiones', type=int, default=1, help="Veces que se corre cada escenario")
+    parser.add_argument('--visible', action='store_true', help="Muestra los navegadores")
+    parser.add_argument('--salida', help="JSON con el reporte (por defecto benchmark_<fecha>.json)")
+    return parser
+
+
+def main(argv=None):
+    """🚀 Punto de entrada; devuelve el código de salida"""
+    args = crear_parser().parse_args(argv)
+    salida = os.path.abspath(args.salida or f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+
+    opciones = {'latencia': args.latencia, 'variacion': args.variacion}
+    if args.desde_json:
+        sitio = SitioPrueba.desde_json(args.desde_json, **opciones)
+    else:
+        sitio = SitioPrueba(lugares_sinteticos(args.lugares), **opciones)
+
+    resultados = []
+    directorio_original = os.getcwd()
+    # Los JSON/CSV de cada escenario van a una carpeta temporal para no mezclarse con los reales
+    with sitio, tempfile.TemporaryDirectory(prefix="benchmark_") as temporal:
+        print(f"🌐 Sitio de prueba en {sitio.url_base}: {len(sitio.lugares)} lugares, "
+              f"{args.latencia:g} s de latencia", flush=True)
+        os.chdir(temporal)
+        try:
+            for modo in args.modos:
+                # En modo listado no se abre ningún lugar: los navegadores y pestañas no cambian nada
+                combinaciones = [(1, 1)] if modo == 'listado' else [
+                    (navegadores, pestanas) for navegadores in args.navegadores for pestanas in args.pestanas
+                ]
+                for navegadores, pestanas in combinaciones:
+                    for _ in range(args.repeticiones):
+                        resultado = ejecutar_escenario(sitio, modo, navegadores, pestanas, args)
+                        imprimir_escenario(resultado)
+                        resultados.append(resultado)
+        finally:
+            os.chdir(directorio_original)
+
+    reporte = {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'sitio': {'lugares': len(sitio.lugares), 'latencia': args.latencia, 'variacion': args.variacion},
+        'escenarios': resultados,
+    }
+    with open(salida, 'w', encoding='utf-8') as f:
+        json.dump(reporte, f, ensure_ascii=False, indent=2)
+    print(f"💾 Reporte guardado en {salida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
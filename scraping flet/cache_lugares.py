@@ -0,0 +1,113 @@
+"""
+Caché persistente en disco de lugares ya extraídos, con vencimiento por antigüedad
+"""
+
+import json
+import os
+import re
+import threading
+import time
+
+# Archivo de caché por defecto (junto a las carpetas de resultados)
+RUTA_CACHE = "cache_lugares.json"
+
+# Antigüedad a partir de la cual una entrada se borra del disco, sea cual sea el TTL de la corrida
+EDAD_MAXIMA_HORAS = 90 * 24
+
+# El identificador de Google Maps viene en el segmento data de la URL: ...!1s0x95a...:0x1f3...!8m2...
+PATRON_ID_LUGAR = re.compile(r'!1s(0x[0-9a-fA-F]+:0x[0-9a-fA-F]+)')
+
+
+def extraer_id_lugar(url):
+    """Obtiene el identificador del lugar desde una URL /maps/place/
+
+    Si la URL no trae el identificador se usa la URL sin parámetros de consulta.
+    """
+    url = url or ""
+    coincidencia = PATRON_ID_LUGAR.search(url)
+    if coincidencia:
+        return coincidencia.group(1).lower()
+    return url.split('?')[0].rstrip('/')
+
+
+class CacheLugares:
+    """Guarda cada lugar extraído con la fecha en que se obtuvo.
+
+    Los lugares dentro del TTL se sirven desde la caché; los vencidos cuentan como fallo.
+    El TTL cambia con cada corrida, así que no decide qué se borra: en disco las entradas
+    duran hasta `edad_maxima_horas` o hasta que sobran más de `max_entradas`.
+    """
+
+    def __init__(self, ruta=RUTA_CACHE, ttl_horas=168, max_entradas=20000, edad_maxima_horas=EDAD_MAXIMA_HORAS):
+        self.ruta = ruta
+        self.ttl = ttl_horas * 3600
+        self.edad_maxima = edad_maxima_horas * 3600
+        self.max_entradas = max_entradas
+        self.aciertos = 0
+        self.fallos = 0
+        self._entradas = None
+        self._cambios = 0
+        self._lock = threading.Lock()
+
+    def _asegurar_cargada(self):
+        """Lee el archivo de caché la primera vez que se usa"""
+        if self._entradas is not None:
+            return
+        self._entradas = {}
+        if os.path.exists(self.ruta):
+            try:
+                with open(self.ruta, 'r', encoding='utf-8') as f:
+                    self._entradas = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Caché ilegible, se empieza vacía: {e}")
+
+    def reiniciar_contadores(self):
+        """Pone en cero los contadores de aciertos y fallos"""
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, id_lugar):
+        """Devuelve una copia del lugar si está en caché y no venció, o None"""
+        with self._lock:
+            self._asegurar_cargada()
+            entrada = self._entradas.get(id_lugar)
+            if entrada and time.time() - entrada['ts'] <= self.ttl:
+                self.aciertos += 1
+                return dict(entrada['info'])
+            self.fallos += 1
+            return None
+
+    def guardar(self, id_lugar, info):
+        """Agrega o renueva un lugar en la caché"""
+        with self._lock:
+            self._asegurar_cargada()
+            self._entradas[id_lugar] = {'info': dict(info), 'ts': time.time()}
+            self._cambios += 1
+            debe_persistir = self._cambios >= 25
+
+        # Se persiste cada tanto para no perder todo si el programa se cierra
+        if debe_persistir:
+            self.persistir()
+
+    def purgar(self):
+        """Elimina las entradas de más de `edad_maxima` y, si sobran, las más antiguas"""
+        with self._lock:
+            self._asegurar_cargada()
+            limite = time.time() - self.edad_maxima
+            self._entradas = {
+                id_lugar: entrada for id_lugar, entrada in self._entradas.items()
+                if entrada['ts'] >= limite
+            }
+            if len(self._entradas) > self.max_entradas:
+                mas_recientes = sorted(self._entradas.items(), key=lambda par: par[1]['ts'], reverse=True)
+                self._entradas = dict(mas_recientes[:self.max_entradas])
+
+    def persistir(self):
+        """Escribe la caché a disco de forma atómica"""
+        self.purgar()
+        with self._lock:
+            temporal = f"{self.ruta}.tmp"
+            with open(temporal, 'w', encoding='utf-8') as f:
+                json.dump(self._entradas, f, ensure_ascii=False)
+            os.replace(temporal, self.ruta)
+            self._cambios = 0
@@ -0,0 +1,165 @@
+"""
+Índice de deduplicación de lugares, dentro de una corrida y entre corridas
+"""
+
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+
+from cache_lugares import extraer_id_lugar
+from lugar import Lugar
+
+# Índice persistente por defecto (junto a las carpetas de resultados)
+RUTA_INDICE_LUGARES = "indice_lugares.json"
+
+# Dígitos mínimos para que un teléfono identifique a un lugar
+DIGITOS_MINIMOS_TELEFONO = 7
+
+
+def normalizar_texto(texto):
+    """Minúsculas, sin acentos y con cualquier separador reducido a un espacio"""
+    texto = unicodedata.normalize('NFKD', str(texto or ""))
+    texto = "".join(c for c in texto if not unicodedata.combining(c)).lower()
+    return " ".join(re.findall(r'[a-z0-9]+', texto))
+
+
+def normalizar_telefono(telefono):
+    """Solo los dígitos del teléfono, o None si son muy pocos para identificar un lugar"""
+    digitos = re.sub(r'\D', '', str(telefono or ""))
+    return digitos if len(digitos) >= DIGITOS_MINIMOS_TELEFONO else None
+
+
+def claves_lugar(lugar, url=None):
+    """Claves por las que se reconoce un lugar, de la más a la menos confiable.
+
+    La primera es el identificador de la URL de Maps (sin prefijo, igual que en la caché);
+    le siguen el teléfono normalizado y el nombre + dirección normalizados.
+    """
+    claves = []
+    if url:
+        claves.append(extraer_id_lugar(url))
+
+    telefono = normalizar_telefono(lugar.telefono)
+    if telefono:
+        claves.append(f"tel:{telefono}")
+
+    nombre = normalizar_texto(lugar.nombre)
+    direccion = normalizar_texto(lugar.direccion)
+    if nombre and direccion:
+        claves.append(f"na:{nombre}|{direccion}")
+
+    return claves
+
+
+def es_id_maps(clave):
+    """Indica si la clave es un identificador de Maps y no un teléfono o nombre + dirección"""
+    return not clave.startswith(('tel:', 'na:'))
+
+
+class IndiceDeduplicacion:
+    """Recuerda cada lugar ya extraído para no visitarlo ni guardarlo dos veces.
+
+    Cada lugar tiene una clave canónica (la primera que se le conoció) y un registro
+    fusionado que conserva el dato más reciente de cada campo. Con `ruta` el índice
+    se guarda en disco y vale entre corridas; sin ella solo dura la corrida.
+    """
+
+    def __init__(self, ruta=None):
+        self.ruta = ruta
+        self.duplicados = 0
+        self._claves = {}
+        self._registros = {}
+        self._cambios = 0
+        self._lock = threading.Lock()
+
+        if ruta and os.path.exists(ruta):
+            try:
+                with open(ruta, 'r', encoding='utf-8') as f:
+                    self._registros = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Índice de lugares ilegible, se empieza vacío: {e}")
+            for canonica, registro in self._registros.items():
+                for clave in registro['claves']:
+                    self._claves[clave] = canonica
+
+    def __len__(self):
+        return len(self._registros)
+
+    def ya_visto(self, url):
+        """Indica, antes de abrirlo, si el lugar de esta URL ya se extrajo"""
+        return self.canonica(url) is not None
+
+    def canonica(self, url):
+        """Clave canónica del lugar de esta URL si ya se extrajo, o None"""
+        if not url:
+            return None
+        with self._lock:
+            return self._claves.get(extraer_id_lugar(url))
+
+    def _buscar(self, claves):
+        """Clave canónica del lugar que coincide con alguna de las claves, o None"""
+        id_nuevo = claves[0] if es_id_maps(claves[0]) else None
+        for clave in claves:
+            canonica = self._claves.get(clave)
+            if canonica is None:
+                continue
+            # Dos lugares con identificadores de Maps distintos nunca son el mismo,
+            # aunque compartan teléfono (p. ej. sucursales con central telefónica)
+            ids_existentes = [c for c in self._registros[canonica]['claves'] if es_id_maps(c)]
+            if id_nuevo and ids_existentes and id_nuevo not in ids_existentes:
+                continue
+            return canonica
+        return None
+
+    def registrar(self, lugar, url=None):
+        """Agrega el `Lugar` o lo fusiona con el que ya estaba.
+
+        Devuelve (clave canónica, es_nuevo).
+        """
+        claves = claves_lugar(lugar, url)
+        if not claves:
+            return None, True
+
+        with self._lock:
+            canonica = self._buscar(claves)
+            if canonica is None:
+                canonica = claves[0]
+                self._registros[canonica] = {'claves': [], 'info': {}}
+                es_nuevo = True
+            else:
+                self.duplicados += 1
+                es_nuevo = False
+
+            registro = self._registros[canonica]
+            # Lo recién extraído pisa lo anterior, salvo los campos que vienen vacíos
+            for campo, valor in lugar.a_dict().items():
+                if valor is not None or campo not in registro['info']:
+                    registro['info'][campo] = valor
+            registro['actualizado'] = time.time()
+            for clave in claves:
+                if clave not in self._claves:
+                    self._claves[clave] = canonica
+                    registro['claves'].append(clave)
+            self._cambios += 1
+
+        return canonica, es_nuevo
+
+    def registro(self, canonica):
+        """`Lugar` con los datos fusionados de todas las veces que se extrajo"""
+        with self._lock:
+            # desde_dict también limpia los registros guardados por versiones anteriores
+            return Lugar.desde_dict(self._registros[canonica]['info'])
+
+    def persistir(self):
+        """Escribe el índice a disco de forma atómica, si tiene ruta y hubo cambios"""
+        if not self.ruta or not self._cambios:
+            return
+        with self._lock:
+            temporal = f"{self.ruta}.tmp"
+            with open(temporal, 'w', encoding='utf-8') as f:
+                json.dump(self._registros, f, ensure_ascii=False)
+            os.replace(temporal, self.ruta)
+            self._cambios = 0
@@ -0,0 +1,198 @@
+"""
+Escritura incremental y a prueba de cortes de los resultados de una búsqueda
+"""
+
+import csv
+import json
+import os
+import textwrap
+import time
+from datetime import datetime
+
+from estadisticas import EstadisticasIncrementales
+from lugar import CAMPOS_LUGAR, Lugar
+
+
+def nombre_carpeta_busqueda(query, location):
+    """Arma un nombre de carpeta válido a partir de la búsqueda del usuario"""
+    nombre_carpeta = f"{query} en {location}"
+    # Limpiar el nombre de la carpeta para que sea válido en el sistema de archivos
+    nombre_carpeta = "".join(c for c in nombre_carpeta if c.isalnum() or c in (' ', '_', '-', ',')).rstrip()
+    return nombre_carpeta.replace("  ", " ").strip()
+
+
+def tiene_telefono(lugar):
+    """Indica si el lugar tiene teléfono"""
+    return lugar.telefono is not None
+
+
+def mostrar(valor):
+    """Valor de un campo para el reporte de texto"""
+    return "N/A" if valor is None else valor
+
+
+class EscritorIncremental:
+    """Agrega cada lugar a un JSONL y a los CSV apenas se extrae.
+
+    Los archivos se abren recién con el primer lugar y se sincronizan a disco cada
+    `registros_por_sync` lugares o `segundos_por_sync` segundos. Al cerrar se generan
+    el JSON final y el reporte TXT leyendo el JSONL, sin mantener los lugares en memoria.
+    """
+
+    def __init__(self, query, location, timestamp=None, registros_por_sync=10, segundos_por_sync=5):
+        self.query = query
+        self.location = location
+        self.timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.carpeta = nombre_carpeta_busqueda(query, location)
+        self.registros_por_sync = registros_por_sync
+        self.segundos_por_sync = segundos_por_sync
+        self.total = 0
+        self.carpeta_creada = False
+        self.estadisticas = EstadisticasIncrementales()
+        # Id de la corrida en el almacén SQLite, si está activo
+        self.corrida_id = None
+
+        self.ruta_jsonl = os.path.join(self.carpeta, f"resultados_{self.timestamp}.jsonl")
+        self.ruta_json = os.path.join(self.carpeta, f"resultados_{self.timestamp}.json")
+        self.ruta_csv = os.path.join(self.carpeta, f"resultados_{self.timestamp}.csv")
+        self.ruta_csv_tel = os.path.join(self.carpeta, f"resultados_CON_TELEFONO_{self.timestamp}.csv")
+        self.ruta_txt = os.path.join(self.carpeta, f"REPORTE_{self.timestamp}.txt")
+        # Lo escribe el motor al terminar la búsqueda, con los tiempos por etapa
+        self.ruta_metricas = os.path.join(self.carpeta, f"METRICAS_{self.timestamp}.json")
+
+        self._archivos = {}
+        self._escritores_csv = {}
+        self._pendientes_sync = 0
+        self._ultimo_sync = time.time()
+
+    def _abrir_csv(self, ruta):
+        """Abre un CSV en modo agregar, escribiendo el encabezado solo si es nuevo"""
+        es_nuevo = not os.path.exists(ruta) or os.path.getsize(ruta) == 0
+        archivo = open(ruta, 'a', newline='', encoding='utf-8')
+        escritor = csv.DictWriter(archivo, fieldnames=CAMPOS_LUGAR, extrasaction='ignore')
+        if es_nuevo:
+            escritor.writeheader()
+        self._archivos[ruta] = archivo
+        self._escritores_csv[ruta] = escritor
+        return escritor
+
+    def crear_carpeta(self):
+        """Crea la carpeta de la búsqueda si no existe (p. ej. antes de guardar su punto de control)"""
+        if not os.path.exists(self.carpeta):
+            os.makedirs(self.carpeta)
+            self.carpeta_creada = True
+
+    def lugares_guardados(self):
+        """Lugares que ya tiene el JSONL de esta búsqueda, de una corrida anterior que se reanuda"""
+        if os.path.exists(self.ruta_jsonl):
+            yield from self._leer_jsonl()
+
+    def agregar(self, lugar):
+        """Escribe un `Lugar` en el JSONL y en los CSV (los campos vacíos quedan en blanco).
+
+        Devuelve True si con este lugar se sincronizó todo a disco.
+        """
+        if not self._archivos:
+            self.crear_carpeta()
+            # Al reanudar, las estadísticas arrancan con lo que ya estaba escrito
+            if os.path.exists(self.ruta_jsonl):
+                for anterior in self._leer_jsonl():
+                    self.estadisticas.registrar(anterior)
+            self._archivos[self.ruta_jsonl] = open(self.ruta_jsonl, 'a', encoding='utf-8')
+            self._abrir_csv(self.ruta_csv)
+
+        fila = lugar.a_dict()
+        self._archivos[self.ruta_jsonl].write(json.dumps(fila, ensure_ascii=False) + "\n")
+        self._escritores_csv[self.ruta_csv].writerow(fila)
+
+        if tiene_telefono(lugar):
+            escritor_tel = self._escritores_csv.get(self.ruta_csv_tel) or self._abrir_csv(self.ruta_csv_tel)
+            escritor_tel.writerow(fila)
+
+        self.total += 1
+        self.estadisticas.registrar(lugar)
+        self._pendientes_sync += 1
+        if (self._pendientes_sync >= self.registros_por_sync
+                or time.time() - self._ultimo_sync >= self.segundos_por_sync):
+            self.sincronizar()
+            return True
+        return False
+
+    def sincronizar(self):
+        """Fuerza la escritura a disco de todo lo agregado hasta ahora"""
+        for archivo in self._archivos.values():
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        self._pendientes_sync = 0
+        self._ultimo_sync = time.time()
+
+    def _leer_jsonl(self):
+        """Recorre los lugares guardados en el JSONL, ignorando una última línea cortada"""
+        with open(self.ruta_jsonl, 'r', encoding='utf-8') as f:
+            for linea in f:
+                try:
+                    yield Lugar.desde_dict(json.loads(linea))
+                except ValueError:
+                    continue
+
+    def cerrar(self):
+        """Cierra los archivos y genera el JSON final y el reporte TXT.
+
+        Devuelve las estadísticas de la búsqueda, o None si no se escribió ningún lugar.
+        """
+        if not self._archivos:
+            return None
+
+        self.sincronizar()
+        for archivo in self._archivos.values():
+            archivo.close()
+        self._archivos = {}
+        self._escritores_csv = {}
+
+        # JSON - Uno por cada búsqueda, escrito en streaming desde el JSONL
+        escritos = 0
+        with open(self.ruta_json, 'w', encoding='utf-8') as f:
+            f.write("[")
+            for lugar in self._leer_jsonl():
+                # Misma forma que json.dump(lista, indent=2)
+                f.write(",\n" if escritos else "\n")
+                f.write(textwrap.indent(json.dumps(lugar.a_dict(), ensure_ascii=False, indent=2), "  "))
+                escritos += 1
+            f.write("\n]" if escritos else "]")
+
+        estadisticas = self.estadisticas
+        rating_promedio = estadisticas.rating_promedio
+
+        # TXT Reporte
+        with open(self.ruta_txt, 'w', encoding='utf-8') as f:
+            f.write("=" * 80 + "\n")
+            f.write(f"🗺️  REPORTE: {self.query.upper()}\n")
+            f.write(f"📍 UBICACIÓN: {self.location}\n")
+            f.write(f"📅 FECHA: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write("=" * 80 + "\n\n")
+            f.write(f"Total: {estadisticas.total}\n")
+            f.write(f"Con teléfono: {estadisticas.con_telefono}\n")
+            f.write(f"Con website: {estadisticas.con_website}\n")
+            if rating_promedio is not None:
+                f.write(f"Rating promedio: {rating_promedio:.2f} ({estadisticas.con_rating} con rating)\n")
+            if estadisticas.fallidos or estadisticas.omitidos:
+                f.write(f"Fallidos: {estadisticas.fallidos} / Omitidos: {estadisticas.omitidos}\n")
+            f.write("\n")
+            f.write("Categorías:\n")
+            for tipo, cantidad in estadisticas.tipos_frecuentes(None):
+                f.write(f"   {tipo}: {cantidad}\n")
+            f.write("\n")
+            f.write("=" * 80 + "\n")
+            f.write("LISTADO COMPLETO\n")
+            f.write("=" * 80 + "\n\n")
+
+            for i, item in enumerate(self._leer_jsonl(), 1):
+                f.write(f"{i}. {mostrar(item.nombre)}\n")
+                f.write(f"   Tipo: {mostrar(item.tipo)}\n")
+                f.write(f"   Dirección: {mostrar(item.direccion)}\n")
+                f.write(f"   Teléfono: {mostrar(item.telefono)}\n")
+                f.write(f"   Website: {mostrar(item.website)}\n")
+                f.write(f"   Rating: {mostrar(item.rating)} ({mostrar(item.cantidad_reseñas)})\n")
+                f.write("\n" + "-" * 80 + "\n\n")
+
+        return estadisticas
@@ -0,0 +1,67 @@
+"""
+Estadísticas de los resultados actualizadas en O(1) por lugar
+"""
+
+import threading
+from collections import Counter
+
+
+class EstadisticasIncrementales:
+    """Acumula contadores a medida que llegan los lugares, sin recorrer los resultados"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Pone todos los contadores en cero"""
+        with self._lock:
+            self.total = 0
+            self.con_telefono = 0
+            self.con_website = 0
+            self.con_rating = 0
+            self.suma_rating = 0.0
+            self.tipos = Counter()
+            self.exitos = 0
+            self.fallidos = 0
+            self.omitidos = 0
+
+    def registrar(self, lugar):
+        """Suma un `Lugar` extraído"""
+        with self._lock:
+            self.total += 1
+            self.exitos += 1
+            if lugar.telefono is not None:
+                self.con_telefono += 1
+            if lugar.website is not None:
+                self.con_website += 1
+            if lugar.rating is not None:
+                self.con_rating += 1
+                self.suma_rating += lugar.rating
+            self.tipos[lugar.tipo or "N/A"] += 1
+
+    def registrar_fallo(self):
+        """Suma un lugar que no se pudo extraer"""
+        with self._lock:
+            self.fallidos += 1
+
+    def registrar_omitidos(self, cantidad=1):
+        """Suma lugares que quedaron sin procesar (por ejemplo, al detener)"""
+        with self._lock:
+            self.omitidos += cantidad
+
+    @property
+    def sin_telefono(self):
+        return self.total - self.con_telefono
+
+    @property
+    def rating_promedio(self):
+        """Promedio de los ratings numéricos, o None si no hay ninguno"""
+        if not self.con_rating:
+            return None
+        return self.suma_rating / self.con_rating
+
+    def tipos_frecuentes(self, cantidad=5):
+        """Las categorías más frecuentes como lista de (tipo, cantidad)"""
+        with self._lock:
+            return self.tipos.most_common(cantidad)
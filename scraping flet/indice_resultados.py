@@ -0,0 +1,78 @@
+"""
+Índice en memoria sobre los resultados para filtrarlos al instante
+"""
+
+
+class IndiceResultados:
+    """Se actualiza con cada resultado que llega y responde filtros sin recorrer las tarjetas.
+
+    Los resultados se identifican por su posición (base 0) en la lista de resultados.
+    """
+
+    def __init__(self):
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Vacía el índice"""
+        self._nombres = []
+        self._tipos = []
+        self._ratings = []
+        self._con_telefono = set()
+        self._con_website = set()
+        self.por_tipo = {}
+
+    def __len__(self):
+        return len(self._nombres)
+
+    def agregar(self, lugar):
+        """Indexa un `Lugar` nuevo y devuelve su posición"""
+        posicion = len(self._nombres)
+        tipo = lugar.tipo or "N/A"
+
+        self._nombres.append((lugar.nombre or "").lower())
+        self._tipos.append(tipo)
+        self._ratings.append(lugar.rating)
+        self.por_tipo.setdefault(tipo, []).append(posicion)
+        if lugar.telefono is not None:
+            self._con_telefono.add(posicion)
+        if lugar.website is not None:
+            self._con_website.add(posicion)
+
+        return posicion
+
+    def tipos(self):
+        """Categorías presentes, ordenadas alfabéticamente"""
+        return sorted(self.por_tipo)
+
+    def coincide(self, posicion, texto="", tipo=None, con_telefono=False, con_website=False, rating_minimo=None):
+        """Indica si el resultado en `posicion` pasa todos los filtros"""
+        if tipo and self._tipos[posicion] != tipo:
+            return False
+        if con_telefono and posicion not in self._con_telefono:
+            return False
+        if con_website and posicion not in self._con_website:
+            return False
+        if rating_minimo is not None:
+            rating = self._ratings[posicion]
+            if rating is None or rating < rating_minimo:
+                return False
+        if texto and texto.lower() not in self._nombres[posicion]:
+            return False
+        return True
+
+    def filtrar(self, texto="", tipo=None, con_telefono=False, con_website=False, rating_minimo=None):
+        """Devuelve, en orden, las posiciones de los resultados que pasan los filtros"""
+        # Se parte del conjunto indexado más chico y se verifica el resto de los filtros
+        candidatos = None
+        if tipo:
+            candidatos = self.por_tipo.get(tipo, [])
+        for activo, conjunto in ((con_telefono, self._con_telefono), (con_website, self._con_website)):
+            if activo and (candidatos is None or len(conjunto) < len(candidatos)):
+                candidatos = sorted(conjunto)
+        if candidatos is None:
+            candidatos = range(len(self._nombres))
+
+        return [
+            posicion for posicion in candidatos
+            if self.coincide(posicion, texto, tipo, con_telefono, con_website, rating_minimo)
+        ]
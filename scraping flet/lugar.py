@@ -0,0 +1,128 @@
+"""
+Registro tipado de un lugar extraído, con sus campos ya limpios
+"""
+
+import re
+import unicodedata
+
+# Campos de cada lugar extraído, en el orden en que se exportan
+CAMPOS_LUGAR = ['nombre', 'tipo', 'direccion', 'telefono', 'website', 'rating', 'cantidad_reseñas']
+
+# Valores con los que las versiones anteriores marcaban un dato faltante
+VALORES_VACIOS = ("", "N/A")
+
+# Cantidades abreviadas que muestra Maps: '1,2 mil', '2.3K', '1,5 M', '1 mill.'
+PATRON_CANTIDAD_ABREVIADA = re.compile(r'(\d+(?:[.,]\d+)?)\s*(mill|mil|k|m)(?![a-z])', re.IGNORECASE)
+MULTIPLICADORES = {'k': 1000, 'mil': 1000, 'm': 1000000, 'mill': 1000000}
+
+
+def limpiar_texto(valor):
+    """Texto en una sola línea, sin íconos ni espacios sobrantes, o None si está vacío.
+
+    Los botones de Maps traen un glifo del ícono (caracteres de uso privado) y saltos
+    de línea delante del dato, como en las direcciones.
+    """
+    if valor is None:
+        return None
+    texto = "".join(c for c in str(valor) if unicodedata.category(c) not in ('Co', 'Cc') or c.isspace())
+    texto = " ".join(texto.split())
+    return None if texto in VALORES_VACIOS else texto
+
+
+def a_float(valor):
+    """Convierte un rating como '4,5' o '4.5' en float, o None si no es un número"""
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    try:
+        return float(str(valor).strip().replace(',', '.'))
+    except (TypeError, ValueError):
+        return None
+
+
+def a_entero(valor):
+    """Convierte una cantidad de reseñas como '(1.234)' en 1234, o None si no trae dígitos.
+
+    Las abreviadas ('(1,2 mil)', '(2.3K)') se expanden: ahí la coma o el punto son decimales.
+    """
+    if isinstance(valor, int):
+        return valor
+    texto = str(valor or "")
+    abreviada = PATRON_CANTIDAD_ABREVIADA.search(texto)
+    if abreviada:
+        numero = float(abreviada.group(1).replace(',', '.'))
+        return round(numero * MULTIPLICADORES[abreviada.group(2).lower()])
+    digitos = re.sub(r'\D', '', texto)
+    return int(digitos) if digitos else None
+
+
+def telefono_e164(valor):
+    """Teléfono en formato E.164 ('+582129097111') si trae código de país.
+
+    Sin '+' ni '00' delante no se puede saber el país, y quedan solo sus dígitos.
+    None si no trae ningún dígito.
+    """
+    texto = limpiar_texto(valor)
+    if texto is None:
+        return None
+    texto = re.sub(r'^(phone:)?tel:', '', texto)
+    digitos = re.sub(r'\D', '', texto)
+    if not digitos:
+        return None
+    if texto.startswith('+'):
+        return f"+{digitos}"
+    if digitos.startswith('00'):
+        return f"+{digitos[2:]}"
+    return digitos
+
+
+class Lugar:
+    """Un lugar extraído, con tipos ya resueltos: rating float, reseñas int y None para lo que falta.
+
+    Se arma una sola vez con `desde_dict` a partir de lo leído en la página (o de un
+    JSON ya guardado) y se exporta con `a_dict`. `__slots__` evita un dict por lugar.
+    """
+
+    __slots__ = tuple(CAMPOS_LUGAR)
+
+    def __init__(self, nombre=None, tipo=None, direccion=None, telefono=None, website=None,
+                 rating=None, cantidad_reseñas=None):
+        self.nombre = nombre
+        self.tipo = tipo
+        self.direccion = direccion
+        self.telefono = telefono
+        self.website = website
+        self.rating = rating
+        self.cantidad_reseñas = cantidad_reseñas
+
+    @classmethod
+    def desde_dict(cls, datos):
+        """Limpia y convierte los campos de un dict crudo, aceptando también el viejo "N/A\""""
+        return cls(
+            nombre=limpiar_texto(datos.get('nombre')),
+            tipo=limpiar_texto(datos.get('tipo')),
+            direccion=limpiar_texto(datos.get('direccion')),
+            telefono=telefono_e164(datos.get('telefono')),
+            website=limpiar_texto(datos.get('website')),
+            rating=a_float(limpiar_texto(datos.get('rating'))),
+            cantidad_reseñas=a_entero(datos.get('cantidad_reseñas')),
+        )
+
+    def a_dict(self):
+        """Los campos en el orden de exportación; lo que falta queda como None (null en JSON)"""
+        return {campo: getattr(self, campo) for campo in CAMPOS_LUGAR}
+
+    def fusionar(self, otro):
+        """Pisa los campos con los de `otro` que no estén vacíos"""
+        for campo in CAMPOS_LUGAR:
+            valor = getattr(otro, campo)
+            if valor is not None:
+                setattr(self, campo, valor)
+        return self
+
+    def __eq__(self, otro):
+        if not isinstance(otro, Lugar):
+            return NotImplemented
+        return self.a_dict() == otro.a_dict()
+
+    def __repr__(self):
+        return f"Lugar({self.nombre!r}, telefono={self.telefono!r}, rating={self.rating!r})"
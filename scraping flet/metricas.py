@@ -0,0 +1,133 @@
+"""
+Tiempos por etapa del scraping, acumulados en histogramas de latencia
+"""
+
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+# Etapas que mide el motor, en el orden en que ocurren, con su nombre para mostrar
+ETAPAS = {
+    'navegador': "Arranque de Chrome",
+    'carga_busqueda': "Carga de la búsqueda",
+    'espera_feed': "Espera del feed",
+    'scroll': "Scroll del feed",
+    'lectura_listado': "Lectura del listado",
+    'navegacion': "Navegación al lugar",
+    'espera_detalle': "Espera del detalle",
+    'extraccion': "Extracción de campos",
+    'guardado': "Guardado del lugar",
+    'cierre': "Cierre de archivos",
+}
+
+ORDEN_ETAPAS = {etapa: posicion for posicion, etapa in enumerate(ETAPAS)}
+
+# Cubetas geométricas desde 1 ms: cada una es un 19 % más ancha que la anterior,
+# así los percentiles salen con un error de ±10 % y memoria fija por etapa
+LATENCIA_MINIMA = 0.001
+FACTOR_CUBETA = 2 ** 0.25
+CUBETAS = 80
+
+
+def formatear_duracion(segundos):
+    """Duración corta para mostrar: '850 ms', '2.4 s' o '-' si no hay dato"""
+    if segundos is None:
+        return "-"
+    if segundos < 1:
+        return f"{segundos * 1000:.0f} ms"
+    return f"{segundos:.1f} s"
+
+
+class HistogramaLatencias:
+    """Cuenta duraciones por cubeta en O(1), sin guardar cada medición"""
+
+    def __init__(self):
+        self.cuentas = [0] * (CUBETAS + 1)
+        self.eventos = 0
+        self.total = 0.0
+        self.minimo = None
+        self.maximo = 0.0
+
+    def registrar(self, segundos):
+        if segundos <= LATENCIA_MINIMA:
+            cubeta = 0
+        else:
+            cubeta = min(CUBETAS, math.ceil(math.log(segundos / LATENCIA_MINIMA, FACTOR_CUBETA)))
+        self.cuentas[cubeta] += 1
+        self.eventos += 1
+        self.total += segundos
+        self.minimo = segundos if self.minimo is None else min(self.minimo, segundos)
+        self.maximo = max(self.maximo, segundos)
+
+    def percentil(self, porcentaje):
+        """Duración aproximada bajo la cual queda el `porcentaje` de los eventos, o None sin eventos"""
+        if not self.eventos:
+            return None
+        objetivo = max(1, math.ceil(porcentaje / 100 * self.eventos))
+        if objetivo >= self.eventos:
+            return self.maximo
+        acumulados = 0
+        for cubeta, cuenta in enumerate(self.cuentas):
+            acumulados += cuenta
+            if acumulados >= objetivo:
+                break
+        # Centro geométrico de la cubeta, sin salirse de lo realmente medido
+        estimado = LATENCIA_MINIMA * FACTOR_CUBETA ** (cubeta - 0.5)
+        return min(max(estimado, self.minimo), self.maximo)
+
+    def resumen(self):
+        return {
+            'eventos': self.eventos,
+            'total': round(self.total, 3),
+            'p50': round(self.percentil(50), 4),
+            'p95': round(self.percentil(95), 4),
+            'max': round(self.maximo, 4),
+        }
+
+
+class MetricasEtapas:
+    """Un histograma por etapa, seguro para varios hilos.
+
+    Con `padre`, cada medición se suma también a las métricas del padre: así una
+    búsqueda tiene las suyas y la sesión acumula las de todas.
+    """
+
+    def __init__(self, padre=None):
+        self.padre = padre
+        self._lock = threading.Lock()
+        self._histogramas = {}
+
+    def registrar(self, etapa, segundos):
+        with self._lock:
+            histograma = self._histogramas.get(etapa)
+            if histograma is None:
+                histograma = self._histogramas[etapa] = HistogramaLatencias()
+            histograma.registrar(segundos)
+        if self.padre is not None:
+            self.padre.registrar(etapa, segundos)
+
+    @contextmanager
+    def medir(self, etapa):
+        """Mide lo que tarda el bloque, termine bien o con error"""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(etapa, time.perf_counter() - inicio)
+
+    def reiniciar(self):
+        with self._lock:
+            self._histogramas = {}
+
+    def resumen(self):
+        """{etapa: {'eventos', 'total', 'p50', 'p95', 'max'}} en el orden de ETAPAS"""
+        with self._lock:
+            orden = sorted(self._histogramas, key=lambda etapa: ORDEN_ETAPAS.get(etapa, len(ORDEN_ETAPAS)))
+            return {etapa: self._histogramas[etapa].resumen() for etapa in orden}
+
+    def guardar(self, ruta, **datos):
+        """Escribe el resumen en un JSON junto con los `datos` de la corrida"""
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(dict(datos, etapas=self.resumen()), f, ensure_ascii=False, indent=2)
@@ -0,0 +1,1113 @@
+"""
+Motor de scraping de Google Maps, independiente de la interfaz gráfica
+
+Conduce el navegador, extrae los lugares y los guarda en disco. Informa lo que pasa
+mediante callbacks, así lo pueden usar tanto la app de Flet como la línea de comandos.
+"""
+
+import atexit
+import csv
+import time
+import threading
+import queue
+import os
+
+# Selenium y los módulos pesados se importan recién en la etapa que los usa,
+# así la app y la línea de comandos arrancan sin pagar su costo de carga
+
+from cache_lugares import CacheLugares, extraer_id_lugar
+from escritor_resultados import EscritorIncremental
+from lugar import Lugar
+from metricas import MetricasEtapas
+from ritmo_extraccion import RitmoExtraccion
+from punto_control import PuntoControl
+from estadisticas import EstadisticasIncrementales
+from sesiones_navegador import GestorSesiones
+from deduplicacion import IndiceDeduplicacion, RUTA_INDICE_LUGARES
+
+# Parámetros de scraping cuando no se indican otros; la app y la línea de comandos parten de estos
+CONFIG_POR_DEFECTO = {
+    'max_results': 25,
+    'wait_time': 3,
+    'espera_inactiva': 4,
+    'num_workers': 1,
+    'pestanas': 1,
+    'headless': True,
+    'red_liviana': False,
+    'reutilizar_navegador': True,
+    'perfil_navegador': "",
+    'solo_listado': False,
+    'completar_telefonos': True,
+    'cache_horas': 0,
+    'base_datos': "",
+    'deduplicar_global': False,
+    # Sitio de Maps a scrapear; el benchmark lo apunta a su sitio de prueba local
+    'url_base': "https://www.google.com/maps",
+}
+
+# Intervalo de sondeo de las esperas por eventos del DOM (segundos)
+INTERVALO_SONDEO = 0.1
+
+# Nombre del lugar visible en el panel de detalle y URL actual, en un solo viaje al navegador
+JS_ESTADO_DETALLE = """
+const h1 = document.querySelector('h1.DUwDvf');
+return [h1 ? h1.textContent.trim() : null, window.location.href];
+"""
+
+# Hace scroll del feed y devuelve [lugares cargados, ¿se llegó al final de la lista?]
+JS_SCROLL_FEED = """
+const feed = arguments[0];
+feed.scrollTop = feed.scrollHeight;
+return [
+    document.querySelectorAll("a[href*='/maps/place/']").length,
+    feed.querySelector('span.HlvSq') !== null
+];
+"""
+
+# Lee todos los campos del panel de detalle de una sola vez; los que faltan vuelven como null
+JS_EXTRAER_INFORMACION = """
+const texto = (selector) => {
+    const el = document.querySelector(selector);
+    return el ? el.innerText : null;
+};
+const tel = document.querySelector("button[data-item-id*='phone']");
+let telefono = null;
+if (tel) {
+    telefono = (tel.getAttribute('data-item-id') || '').replace('phone:tel:', '') || tel.innerText;
+}
+const web = document.querySelector("a[data-item-id='authority']");
+return {
+    'nombre': texto('h1.DUwDvf'),
+    'tipo': texto("button[jsaction*='category']"),
+    'direccion': texto("button[data-item-id='address']"),
+    'telefono': telefono,
+    'website': web ? web.href : null,
+    'rating': texto('span.ceNzKf'),
+    'cantidad_reseñas': texto('span.RDApEe'),
+};
+"""
+
+# Lee todas las tarjetas cargadas en el feed de una sola vez (modo solo listado)
+JS_EXTRAER_FEED = """
+const texto = (raiz, selector) => {
+    const el = raiz.querySelector(selector);
+    return el ? el.innerText.trim() : null;
+};
+const tarjetas = [];
+const vistos = new Set();
+document.querySelectorAll("div[role='feed'] a[href*='/maps/place/']").forEach((a) => {
+    if (vistos.has(a.href)) {
+        return;
+    }
+    vistos.add(a.href);
+    const tarjeta = a.closest('div.Nv2PK') || a.parentElement;
+    // Las líneas de detalle tienen la forma "Categoría · $$ · Dirección"
+    let tipo = null;
+    let direccion = null;
+    const linea = tarjeta.querySelector('div.W4Efsd div.W4Efsd');
+    if (linea) {
+        const partes = linea.innerText.split('·').map((p) => p.trim()).filter((p) => p);
+        if (partes.length > 0) {
+            tipo = partes[0];
+        }
+        if (partes.length > 1) {
+            direccion = partes[partes.length - 1];
+        }
+    }
+    const web = tarjeta.querySelector("a[data-value='Sitio web'], a[data-value='Website'], a.lcr4fd");
+    tarjetas.push({
+        'url': a.href,
+        'nombre': a.getAttribute('aria-label') || texto(tarjeta, 'div.qBF1Pd'),
+        'tipo': tipo,
+        'direccion': direccion,
+        'telefono': texto(tarjeta, 'span.UsdlK'),
+        'website': web ? web.href : null,
+        'rating': texto(tarjeta, 'span.MW4etd'),
+        'cantidad_reseñas': texto(tarjeta, 'span.UY7F9'),
+    });
+});
+return tarjetas;
+"""
+
+# Navega la pestaña actual sin esperar a que cargue (driver.get bloquearía hasta el final)
+JS_NAVEGAR = "window.location.href = arguments[0];"
+
+# URLs de todos los lugares cargados en la página, leídas de una sola vez
+JS_URLS_LUGARES = """
+return Array.from(document.querySelectorAll("a[href*='/maps/place/']"), (a) => a.href);
+"""
+
+# Recursos que el modo de red liviana no descarga: nunca se leen para extraer los datos
+URLS_BLOQUEADAS_RED_LIVIANA = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.ico", "*.svg",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+    "*googleusercontent.com*", "*ggpht.com*", "*streetviewpixels*",
+    "*/maps/vt*", "*/kh/v*", "*khms*.google.com*",
+]
+
+# Reintentos al visitar un lugar por URL antes de darlo por fallido
+REINTENTOS_POR_LUGAR = 1
+
+
+def parsear_lote(texto):
+    """Convierte el texto del lote (líneas 'qué | dónde' o ruta a un CSV) en pares (query, location)"""
+    texto = (texto or "").strip()
+    if not texto:
+        return []
+    
+    # Ruta a un CSV con columnas query/location (con o sin encabezado)
+    if texto.lower().endswith('.csv') and os.path.isfile(texto):
+        with open(texto, 'r', newline='', encoding='utf-8-sig') as f:
+            filas = [fila for fila in csv.reader(f) if fila]
+        if filas and filas[0][0].strip().lower() in ('query', 'busqueda', 'búsqueda', 'que', 'qué'):
+            filas = filas[1:]
+    else:
+        filas = []
+        for linea in texto.splitlines():
+            separador = '|' if '|' in linea else ';'
+            filas.append(linea.split(separador))
+    
+    trabajos = []
+    for fila in filas:
+        if len(fila) < 2:
+            continue
+        query, location = fila[0].strip(), fila[1].strip()
+        if query and location:
+            trabajos.append((query, location))
+    
+    return trabajos
+
+
+class MotorScraping:
+    """Scrapea búsquedas de Google Maps sin depender de ninguna interfaz.
+    
+    Todos los callbacks son opcionales y se llaman desde los hilos de trabajo:
+    - al_log(mensaje, nivel, icono): nivel es 'info', 'exito', 'aviso', 'error' o 'destacado'
+    - al_progreso(texto, valor): valor entre 0 y 1, o None si no cambia
+    - al_resultado(info): cada lugar extraído, en el orden en que se publica
+    - al_estadisticas(): cambiaron los contadores de `estadisticas` o de la caché
+    """
+    
+    def __init__(self, al_log=None, al_progreso=None, al_resultado=None, al_estadisticas=None):
+        self.al_log = al_log
+        self.al_progreso = al_progreso
+        self.al_resultado = al_resultado
+        self.al_estadisticas = al_estadisticas
+        
+        self.activo = False
+        # Lugares que dejó sin extraer la última búsqueda; con más de cero se puede reanudar
+        self.lugares_pendientes = 0
+        self.drivers_trabajo = []
+        self.sesiones = GestorSesiones(self._crear_driver)
+        # Lugares que abrió cada navegador en la búsqueda en curso, para reciclarlo a tiempo
+        self._visitas = {}
+        self.cache = CacheLugares()
+        self.cache_activa = False
+        self.estadisticas = EstadisticasIncrementales()
+        self.almacen = None
+        self.deduplicador = IndiceDeduplicacion()
+        self._indice_global = None
+        self.lock_publicacion = threading.Lock()
+        # Tiempos por etapa de toda la sesión; cada búsqueda lleva además los suyos
+        self.metricas = MetricasEtapas()
+        self._hilo = threading.local()
+        # Lugares por minuto y ETA de la ejecución en curso
+        self.ritmo = RitmoExtraccion()
+        
+        # Los navegadores que quedan abiertos entre búsquedas se cierran al salir
+        atexit.register(self.cerrar)
+    
+    def _log(self, mensaje, nivel=None, icono="•"):
+        if self.al_log:
+            self.al_log(mensaje, nivel, icono)
+    
+    def _progreso(self, texto, valor=None):
+        if self.al_progreso:
+            self.al_progreso(texto, valor)
+    
+    def _avisar_estadisticas(self):
+        if self.al_estadisticas:
+            self.al_estadisticas()
+    
+    def _metricas_en_curso(self):
+        """Métricas de la búsqueda que corre en este hilo, o las de la sesión fuera de una búsqueda"""
+        return getattr(self._hilo, 'metricas', None) or self.metricas
+    
+    def _etapa(self, nombre):
+        """Context manager que mide una etapa en las métricas de la búsqueda en curso"""
+        return self._metricas_en_curso().medir(nombre)
+    
+    def iniciar(self):
+        """Marca el motor como activo; `detener` corta lo que esté en curso"""
+        self.activo = True
+    
+    def detener(self):
+        """Detiene el scraping y cierra los navegadores que están trabajando"""
+        self.activo = False
+        
+        for driver in list(self.drivers_trabajo):
+            try:
+                driver.quit()
+            except:
+                pass
+    
+    def cerrar(self):
+        """Cierra todos los navegadores, incluidos los que esperan la próxima búsqueda, y la base"""
+        # Ya no hace falta cerrarlo al salir: así el motor no queda referenciado hasta entonces
+        atexit.unregister(self.cerrar)
+        self.sesiones.cerrar_todo()
+        if self.almacen:
+            self.almacen.cerrar()
+            self.almacen = None
+    
+    def abrir_almacen(self, ruta):
+        """Abre (o reutiliza) el almacén SQLite; con ruta vacía lo desactiva"""
+        if self.almacen and self.almacen.ruta != ruta:
+            self.almacen.cerrar()
+            self.almacen = None
+        if ruta and not self.almacen:
+            from almacen_lugares import AlmacenLugares
+            self.almacen = AlmacenLugares(ruta)
+            self._log(f"🗄️ Guardando también en la base {ruta}", 'info')
+        return self.almacen
+    
+    def _preparar_corrida(self, config):
+        """Configura caché, base y deduplicación para una búsqueda o un lote"""
+        self._configurar_cache(config)
+        self.abrir_almacen(config.get('base_datos'))
+        
+        # Sin la opción global, los duplicados se detectan solo dentro de esta corrida
+        if config.get('deduplicar_global'):
+            if self._indice_global is None:
+                self._indice_global = IndiceDeduplicacion(RUTA_INDICE_LUGARES)
+            self.deduplicador = self._indice_global
+            self._log(f"🧬 Se omiten los {len(self.deduplicador)} lugares ya extraídos antes", 'info')
+        else:
+            self.deduplicador = IndiceDeduplicacion()
+    
+    def buscar(self, query, location, config, punto_control=None):
+        """Scrapea una búsqueda (o retoma su punto de control) y devuelve cuántos lugares extrajo"""
+        self._preparar_corrida(config)
+        self.ritmo.reiniciar()
+        
+        self._log("🚀 Iniciando scraping...", 'exito', "▶️")
+        self._log(f"🔍 Búsqueda: {query}", 'destacado')
+        self._log(f"📍 Ubicación: {location}", 'destacado')
+        
+        # Los resultados se guardan a medida que se extraen
+        try:
+            total = self._scrapear_busqueda(query, location, config, punto_control=punto_control)
+        finally:
+            self.lugares_pendientes = getattr(self._hilo, 'pendientes', 0)
+        
+        self._progreso(f"✅ ¡Completado! {total} resultados", 1.0)
+        self._log(f"🎉 Scraping completado: {total} resultados", 'exito', "★")
+        return total
+    
+    def ejecutar_lote(self, trabajos, config, busquedas_simultaneas=1, reanudar=False):
+        """Ejecuta un lote de búsquedas con un número acotado de búsquedas simultáneas.
+        
+        Con `reanudar`, cada búsqueda que tiene punto de control sigue donde quedó; las
+        demás se corren completas. Devuelve un dict con las búsquedas terminadas, fallidas
+        e interrumpidas (con lugares pendientes en su punto de control) y el total de lugares.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        self._preparar_corrida(config)
+        self.ritmo.reiniciar()
+        busquedas_simultaneas = max(1, busquedas_simultaneas)
+        total = len(trabajos)
+        estado = {'terminados': 0, 'fallidos': 0, 'interrumpidos': 0, 'lugares': 0}
+        lock = threading.Lock()
+        inicio = time.time()
+        
+        self._log(f"📦 Iniciando lote de {total} búsquedas ({busquedas_simultaneas} simultáneas)", 'exito', "▶️")
+        self._progreso(f"📦 Lote: 0/{total} búsquedas", 0)
+        
+        def ejecutar_trabajo(numero, query, location):
+            if not self.activo:
+                return
+            
+            etiqueta = f"[{numero}/{total}] {query} en {location}"
+            self._log(f"▶️ {etiqueta}", 'destacado')
+            inicio_trabajo = time.time()
+            encontrados = 0
+            fallo = False
+            
+            try:
+                punto_control = PuntoControl.cargar(query, location) if reanudar else None
+                if punto_control:
+                    self._log(f"♻️ {etiqueta}: se retoma desde su punto de control", 'info')
+                encontrados = self._scrapear_busqueda(
+                    query, location, config, reportar_progreso=False, punto_control=punto_control
+                )
+                self._log(
+                    f"✅ {etiqueta}: {encontrados} resultados en {time.time() - inicio_trabajo:.0f} s",
+                    'exito', "✓"
+                )
+            except Exception as ex:
+                # Un trabajo fallido no detiene el resto del lote
+                fallo = True
+                self._log(f"❌ {etiqueta}: {str(ex)}", 'error', "✗")
+            
+            with lock:
+                estado['terminados'] += 1
+                estado['lugares'] += encontrados
+                if fallo:
+                    estado['fallidos'] += 1
+                if getattr(self._hilo, 'pendientes', 0):
+                    estado['interrumpidos'] += 1
+                minutos = max(time.time() - inicio, 1) / 60
+                self._progreso(
+                    f"📦 Lote: {estado['terminados']}/{total} búsquedas • "
+                    f"{estado['lugares']} lugares • {estado['lugares'] / minutos:.1f} lugares/min",
+                    estado['terminados'] / total
+                )
+        
+        with ThreadPoolExecutor(max_workers=busquedas_simultaneas) as executor:
+            for numero, (query, location) in enumerate(trabajos, 1):
+                executor.submit(ejecutar_trabajo, numero, query, location)
+        
+        minutos = max(time.time() - inicio, 1) / 60
+        self._progreso(
+            f"✅ ¡Lote completado! {estado['terminados']}/{total} búsquedas • "
+            f"{estado['lugares'] / minutos:.1f} lugares/min",
+            1.0
+        )
+        self._log(
+            f"🎉 Lote completado: {estado['lugares']} lugares, {estado['fallidos']} búsquedas fallidas",
+            'exito', "★"
+        )
+        return estado
+    
+    def _scrapear_busqueda(self, query, location, config, reportar_progreso=True, punto_control=None):
+        """Scrapea una búsqueda completa con su propio navegador y devuelve cuántos lugares extrajo.
+        
+        Cada lugar se escribe en disco apenas se extrae; si la búsqueda se corta, los archivos
+        quedan con todo lo obtenido hasta ese momento. Con un punto de control se retoman
+        solo los lugares pendientes, agregándolos a los mismos archivos.
+        """
+        self._hilo.pendientes = 0
+        max_results = config['max_results']
+        wait_time = config['wait_time']
+        num_workers = config['num_workers']
+        
+        # Escritor incremental con los resultados de esta búsqueda específica
+        escritor = EscritorIncremental(query, location, punto_control.timestamp if punto_control else None)
+        if self.almacen:
+            escritor.corrida_id = self.almacen.iniciar_corrida(query, location, escritor.timestamp)
+        metricas = MetricasEtapas(padre=self.metricas)
+        self._hilo.metricas = metricas
+        
+        def progreso(texto, valor=None):
+            if reportar_progreso:
+                self._progreso(texto, valor)
+        
+        driver = None
+        try:
+            # Configurar navegador
+            progreso("⚙️ Configurando navegador...")
+            
+            if config['headless']:
+                self._log("🕶️ Modo invisible activado", 'info')
+            if config.get('red_liviana'):
+                self._log("🪶 Red liviana: sin imágenes, fuentes ni mapa", 'info')
+            
+            driver = self._abrir_navegador(config)
+            self._log("✅ Navegador configurado", 'exito', "✓")
+            
+            if punto_control:
+                urls = punto_control.pendientes()
+                # Lo escrito después del último guardado del punto de control no figura como hecho:
+                # se lo reconoce como duplicado en lugar de escribirlo otra vez
+                for anterior in escritor.lugares_guardados():
+                    self.deduplicador.registrar(anterior)
+                self._log(
+                    f"♻️ Reanudando: {len(urls)} de {len(punto_control.urls)} lugares pendientes",
+                    'info', "★"
+                )
+            else:
+                self._abrir_busqueda(driver, query, location, config, progreso)
+                
+                if config['solo_listado']:
+                    return self._extraer_listado(driver, config, progreso, escritor)
+                
+                # Buscar lugares: se guardan las URLs una sola vez para no depender de elementos vivos
+                progreso("🔎 Buscando lugares...")
+                
+                urls = self._recolectar_urls(driver)
+                total_encontrados = len(urls)
+                
+                if total_encontrados == 0:
+                    self._log("❌ No se encontraron resultados", 'error', "✗")
+                    return 0
+                
+                self._log(f"✨ Se encontraron {total_encontrados} lugares", 'exito', "★")
+                
+                # Los lugares ya extraídos no se vuelven a abrir, pero siguen siendo parte de esta búsqueda
+                nuevas = []
+                for url in urls:
+                    canonica = self.deduplicador.canonica(url)
+                    if canonica is None:
+                        nuevas.append(url)
+                    else:
+                        self._vincular_a_corrida(escritor, canonica)
+                if len(nuevas) < total_encontrados:
+                    self._log(f"🔁 {total_encontrados - len(nuevas)} lugares ya extraídos se omiten", 'info')
+                    if not nuevas:
+                        return 0
+                
+                urls = nuevas[:max_results]
+                punto_control = PuntoControl(query, location, escritor.timestamp, urls)
+                # La carpeta la crea el escritor, así sabe que es nueva
+                escritor.crear_carpeta()
+                punto_control.guardar()
+            
+            # Extraer información
+            lugares_a_procesar = len(urls)
+            self.ritmo.agregar_pendientes(lugares_a_procesar)
+            progreso(f"📊 Extrayendo {lugares_a_procesar} lugares...")
+            
+            if num_workers > 1 or config.get('pestanas', 1) > 1:
+                return self._extraer_en_paralelo(
+                    urls, num_workers, config, escritor, punto_control, reportar_progreso, driver
+                )
+            
+            for i, url_lugar in enumerate(urls):
+                if not self.activo:
+                    self._registrar_omitidos(escritor, lugares_a_procesar - i)
+                    break
+                
+                # Actualizar progreso
+                progreso(f"📊 Extrayendo {i + 1}/{lugares_a_procesar}...", (i + 1) / lugares_a_procesar)
+                
+                try:
+                    info = self._buscar_en_cache(url_lugar) or self._visitar_lugar(driver, url_lugar, wait_time + 5)
+                except Exception as ex:
+                    self._log(f"✗ Error en lugar {i + 1}: {str(ex)}", 'error', "✗")
+                    self._registrar_fallo(escritor)
+                    continue
+                
+                self._publicar_resultado(info, escritor, url_lugar, punto_control)
+            
+            return escritor.total
+        
+        finally:
+            self._cerrar_escritor(escritor)
+            self._guardar_metricas(escritor, metricas)
+            self._hilo.metricas = None
+            self._hilo.pendientes = self._cerrar_punto_control(punto_control)
+            self._terminar_corrida(escritor)
+            
+            if driver:
+                self._liberar_navegador(driver, config)
+            
+            if self.cache_activa:
+                try:
+                    self.cache.persistir()
+                except Exception as ex:
+                    self._log(f"⚠️ No se pudo guardar la caché: {str(ex)}", 'aviso', "⚠️")
+            
+            try:
+                self.deduplicador.persistir()
+            except Exception as ex:
+                self._log(f"⚠️ No se pudo guardar el índice de lugares: {str(ex)}", 'aviso', "⚠️")
+    
+    def _abrir_busqueda(self, driver, query, location, config, progreso):
+        """Abre la búsqueda en Google Maps y carga el feed de resultados"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        
+        # Abrir Google Maps
+        progreso("🌍 Abriendo Google Maps...")
+        
+        search_query = f"{query} {location}"
+        url_base = config.get('url_base') or CONFIG_POR_DEFECTO['url_base']
+        url = f"{url_base.rstrip('/')}/search/{search_query.replace(' ', '+')}"
+        with self._etapa('carga_busqueda'):
+            driver.get(url)
+        
+        self._log("✅ Google Maps cargado", 'exito', "✓")
+        
+        # Esperar resultados (el tiempo de espera es solo el límite superior)
+        progreso("⏳ Esperando resultados...")
+        
+        try:
+            with self._etapa('espera_feed'):
+                WebDriverWait(driver, config['wait_time'] + 10, poll_frequency=INTERVALO_SONDEO).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "div[role='feed']"))
+                )
+            self._log("✅ Resultados encontrados", 'exito', "✓")
+        except:
+            self._log("⚠️ Panel de resultados no encontrado", 'aviso', "⚠️")
+        
+        # Scroll
+        progreso("📜 Cargando más resultados...")
+        
+        try:
+            with self._etapa('scroll'):
+                cargados, motivo = self._cargar_feed(driver, config['max_results'], config['espera_inactiva'], progreso)
+            self._log(f"✅ Scroll completado: {cargados} lugares cargados ({motivo})", 'exito', "✓")
+        except Exception as ex:
+            self._log(f"⚠️ Error en scroll: {str(ex)}", 'aviso', "⚠️")
+    
+    def _cerrar_punto_control(self, punto_control):
+        """Borra el punto de control si la búsqueda terminó, o lo deja listo para reanudar.
+        
+        Devuelve cuántos lugares quedaron pendientes (0 si no hay nada que reanudar).
+        """
+        if punto_control is None:
+            return 0
+        try:
+            pendientes = len(punto_control.pendientes())
+            if pendientes == 0:
+                punto_control.eliminar()
+            else:
+                punto_control.guardar()
+                self._log(f"♻️ Quedan {pendientes} lugares pendientes en el punto de control", 'aviso', "⚠️")
+            return pendientes
+        except Exception as ex:
+            self._log(f"⚠️ No se pudo guardar el punto de control: {str(ex)}", 'aviso', "⚠️")
+            return 0
+    
+    def _cargar_feed(self, driver, max_results, espera_inactiva, progreso):
+        """Hace scroll del feed hasta tener max_results lugares, llegar al final o dejar de crecer.
+        
+        Devuelve la cantidad de lugares cargados y el motivo de la parada.
+        """
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import TimeoutException
+        
+        feed = driver.find_element(By.CSS_SELECTOR, "div[role='feed']")
+        cargados, fin = driver.execute_script(JS_SCROLL_FEED, feed)
+        
+        while True:
+            progreso(
+                f"📜 Cargando resultados {min(cargados, max_results)}/{max_results}...",
+                min(cargados / max_results, 1.0)
+            )
+            
+            if not self.activo:
+                return cargados, "detenido"
+            if cargados >= max_results:
+                return cargados, "objetivo alcanzado"
+            if fin:
+                return cargados, "fin de la lista"
+            
+            def feed_crecio(d, anteriores=cargados):
+                actuales, al_final = d.execute_script(JS_SCROLL_FEED, feed)
+                if actuales > anteriores or al_final:
+                    return actuales, al_final
+                return False
+            
+            # Si el feed no crece durante la ventana de inactividad, se da por agotado
+            try:
+                cargados, fin = WebDriverWait(driver, espera_inactiva, poll_frequency=INTERVALO_SONDEO).until(feed_crecio)
+            except TimeoutException:
+                return cargados, f"sin cambios en {espera_inactiva} s"
+    
+    def _publicar_resultado(self, info, escritor, url=None, punto_control=None):
+        """Agrega un `Lugar` extraído a las estadísticas y a los archivos de su búsqueda y lo informa.
+        
+        Si el lugar ya se había extraído (mismo ID, teléfono o nombre + dirección) solo se
+        actualizan sus datos en el índice y en la base, y se asocia a la corrida, sin guardarlo
+        ni mostrarlo de nuevo.
+        """
+        self.ritmo.registrar()
+        with self.lock_publicacion:
+            canonica, es_nuevo = self.deduplicador.registrar(info, url)
+            if not es_nuevo:
+                try:
+                    if self.almacen:
+                        self.almacen.actualizar_lugar(canonica, self.deduplicador.registro(canonica))
+                    self._vincular_a_corrida(escritor, canonica)
+                    if punto_control and url:
+                        punto_control.marcar_hecha(url)
+                except Exception as ex:
+                    self._log(f"⚠️ No se pudo actualizar {info.nombre}: {str(ex)}", 'aviso', "⚠️")
+                self._log(f"🔁 Duplicado: {info.nombre}", 'info', "•")
+                return
+            
+            self.estadisticas.registrar(info)
+            try:
+                with self._etapa('guardado'):
+                    sincronizado = escritor.agregar(info)
+                    if self.almacen and escritor.corrida_id is not None:
+                        self.almacen.guardar_lugar(escritor.corrida_id, info, url, canonica)
+                    if punto_control and url:
+                        punto_control.marcar_hecha(url)
+                        # El punto de control se persiste solo cuando lo marcado ya está en disco
+                        if sincronizado:
+                            punto_control.guardar()
+            except Exception as ex:
+                self._log(f"❌ Error al guardar {info.nombre}: {str(ex)}", 'error', "✗")
+            
+            # Dentro del lock, para que quien escucha reciba los lugares en el mismo orden que los archivos
+            if self.al_resultado:
+                self.al_resultado(info)
+        
+        self._avisar_estadisticas()
+        
+        self._log(f"✓ Extraído: {info.nombre}", 'exito', "•")
+    
+    def _vincular_a_corrida(self, escritor, canonica):
+        """Asocia a la corrida en la base un lugar ya guardado que esta búsqueda también trajo"""
+        if not self.almacen or escritor.corrida_id is None:
+            return
+        try:
+            self.almacen.vincular_lugar(escritor.corrida_id, canonica)
+        except Exception as ex:
+            self._log(f"⚠️ No se pudo asociar el lugar a la corrida: {str(ex)}", 'aviso', "⚠️")
+    
+    def _registrar_fallo(self, escritor):
+        """Cuenta un lugar que no se pudo extraer en las estadísticas generales y de la búsqueda"""
+        self.ritmo.registrar()
+        self.estadisticas.registrar_fallo()
+        escritor.estadisticas.registrar_fallo()
+        self._avisar_estadisticas()
+    
+    def _registrar_omitidos(self, escritor, cantidad):
+        """Cuenta lugares que quedaron sin procesar al detener la búsqueda"""
+        self.ritmo.agregar_pendientes(-cantidad)
+        self.estadisticas.registrar_omitidos(cantidad)
+        escritor.estadisticas.registrar_omitidos(cantidad)
+        self._avisar_estadisticas()
+    
+    def _abrir_navegador(self, config):
+        """Toma un navegador abierto de una búsqueda anterior o crea uno nuevo"""
+        driver = self.sesiones.obtener(config)
+        self.drivers_trabajo.append(driver)
+        self._visitas[driver] = 0
+        return driver
+    
+    def _contar_visita(self, driver):
+        """Suma un lugar abierto por este navegador (cada navegador lo usa un solo hilo a la vez)"""
+        self._visitas[driver] = self._visitas.get(driver, 0) + 1
+    
+    def _liberar_navegador(self, driver, config, avisar=True):
+        """Deja el navegador abierto para la próxima búsqueda o lo cierra, según la configuración.
+        
+        A su ciclo de vida se suman solo los lugares que abrió él, no los de la caché,
+        los de otros navegadores ni las tarjetas leídas del listado.
+        """
+        if driver in self.drivers_trabajo:
+            self.drivers_trabajo.remove(driver)
+        lugares = self._visitas.pop(driver, 0)
+        
+        if config.get('reutilizar_navegador') and self.activo:
+            self.sesiones.devolver(driver, lugares)
+            if avisar:
+                self._log(f"♻️ Navegador listo para la próxima búsqueda ({self.sesiones.libres} abiertos)", 'info', "•")
+        else:
+            self.sesiones.descartar(driver)
+            if avisar:
+                self._log("🔒 Navegador cerrado", 'info', "•")
+    
+    def _crear_driver(self, config, directorio_perfil=None):
+        """Crea una instancia de Chrome con las opciones del scraper"""
+        from selenium import webdriver
+        
+        options = webdriver.ChromeOptions()
+        options.add_argument('--start-maximized')
+        options.add_argument('--disable-blink-features=AutomationControlled')
+        
+        if directorio_perfil:
+            # Perfil persistente: cookies, consentimientos y caché sobreviven entre ejecuciones
+            options.add_argument(f'--user-data-dir={directorio_perfil}')
+        
+        if config['headless']:
+            options.add_argument('--headless')
+        
+        if config.get('red_liviana'):
+            # Las preferencias cortan imágenes en todo el perfil; el resto se bloquea por URL
+            options.add_experimental_option('prefs', {
+                'profile.managed_default_content_settings.images': 2,
+            })
+            options.add_argument('--blink-settings=imagesEnabled=false')
+        
+        with self._etapa('navegador'):
+            driver = webdriver.Chrome(options=options)
+        
+        if config.get('red_liviana'):
+            self._bloquear_recursos(driver)
+        
+        return driver
+    
+    def _bloquear_recursos(self, driver):
+        """Bloquea fuentes, fotos y mapa en la pestaña actual (cada pestaña tiene su propio DevTools)"""
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': URLS_BLOQUEADAS_RED_LIVIANA})
+        except Exception as ex:
+            # Sin DevTools (p. ej. otro navegador) se sigue solo con las preferencias
+            self._log(f"⚠️ No se pudieron bloquear fuentes y mapa: {str(ex)}", 'aviso', "⚠️")
+    
+    def _extraer_en_paralelo(self, urls, num_workers, config, escritor, punto_control=None, reportar_progreso=True, driver=None):
+        """Reparte las URLs de lugares entre varios navegadores y publica los resultados en orden.
+        
+        Si se pasa `driver`, el primer trabajador lo usa en lugar de abrir otro navegador.
+        """
+        pendientes = {}
+        
+        # Los lugares en caché se resuelven sin abrir ningún navegador
+        cola = queue.Queue()
+        for indice, url in enumerate(urls):
+            info = self._buscar_en_cache(url)
+            if info is not None:
+                pendientes[indice] = info
+            else:
+                cola.put((indice, url))
+        
+        num_workers = min(num_workers, cola.qsize())
+        pestanas = config.get('pestanas', 1)
+        if num_workers > 0:
+            detalle = f" con {pestanas} pestañas cada uno" if pestanas > 1 else ""
+            self._log(f"👷 Extrayendo con {num_workers} navegadores en paralelo{detalle}", 'info')
+        
+        estado = {'siguiente': 0}
+        lock = threading.Lock()
+        
+        def publicar_en_orden():
+            # Solo se publica el prefijo contiguo para mantener el orden del feed
+            while estado['siguiente'] in pendientes:
+                url = urls[estado['siguiente']]
+                info = pendientes.pop(estado['siguiente'])
+                estado['siguiente'] += 1
+                
+                if reportar_progreso:
+                    self._progreso(f"📊 Extrayendo {estado['siguiente']}/{len(urls)}...", estado['siguiente'] / len(urls))
+                
+                if info is not None:
+                    self._publicar_resultado(info, escritor, url, punto_control)
+        
+        def al_terminar(indice, info):
+            if info is None:
+                self._registrar_fallo(escritor)
+            with lock:
+                pendientes[indice] = info
+                publicar_en_orden()
+        
+        hilos = [
+            threading.Thread(
+                target=self._trabajador_extraccion,
+                args=(cola, config, al_terminar, driver if numero == 0 else None, self._metricas_en_curso()),
+                daemon=True
+            )
+            for numero in range(num_workers)
+        ]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        
+        # Si algún navegador murió, se descartan sus huecos y se publica el resto
+        with lock:
+            omitidos = 0
+            for indice in range(estado['siguiente'], len(urls)):
+                if indice not in pendientes:
+                    pendientes[indice] = None
+                    omitidos += 1
+            publicar_en_orden()
+        if omitidos:
+            self._registrar_omitidos(escritor, omitidos)
+        
+        return escritor.total
+    
+    def _trabajador_extraccion(self, cola, config, al_terminar, driver=None, metricas=None):
+        """Toma URLs de la cola compartida y extrae cada lugar con su propio navegador"""
+        propio = driver is None
+        # Lo que mide este hilo va a las métricas de la búsqueda que lo lanzó
+        self._hilo.metricas = metricas
+        try:
+            if propio:
+                driver = self._abrir_navegador(config)
+            
+            if config.get('pestanas', 1) > 1:
+                self._extraer_con_pestanas(driver, cola, config, al_terminar)
+            else:
+                while self.activo:
+                    try:
+                        indice, url = cola.get_nowait()
+                    except queue.Empty:
+                        break
+                    
+                    info = None
+                    try:
+                        info = self._visitar_lugar(driver, url, config['wait_time'] + 5)
+                    except Exception as ex:
+                        self._log(f"✗ Error en lugar {indice + 1}: {str(ex)}", 'error', "✗")
+                    
+                    al_terminar(indice, info)
+        
+        except Exception as ex:
+            self._log(f"❌ Error en navegador paralelo: {str(ex)}", 'error', "✗")
+        
+        finally:
+            if propio and driver:
+                self._liberar_navegador(driver, config, avisar=False)
+            self._hilo.metricas = None
+    
+    def _extraer_con_pestanas(self, driver, cola, config, al_terminar):
+        """Carga varios lugares a la vez en pestañas de un mismo navegador.
+        
+        Cada pestaña navega sin bloquear y se recorren por turnos: se extrae la que ya muestra
+        su lugar y se le asigna el siguiente, así las cargas se solapan en lugar de esperarse.
+        """
+        timeout = config['wait_time'] + 5
+        principal = driver.current_window_handle
+        pestanas = [{'handle': principal, 'indice': None}]
+        
+        def navegar(pestana, indice, url, intento=0):
+            driver.switch_to.window(pestana['handle'])
+            try:
+                anterior = driver.execute_script(JS_ESTADO_DETALLE)
+            except Exception:
+                anterior = (None, None)
+            with self._etapa('navegacion'):
+                driver.execute_script(JS_NAVEGAR, url)
+            pestana.update(
+                indice=indice, url=url, intento=intento, anterior=anterior,
+                inicio=time.perf_counter(), limite=time.time() + timeout
+            )
+        
+        def asignar(pestana):
+            pestana['indice'] = None
+            if not self.activo:
+                return
+            try:
+                indice, url = cola.get_nowait()
+            except queue.Empty:
+                return
+            navegar(pestana, indice, url)
+        
+        def terminar(pestana, info):
+            self._contar_visita(driver)
+            al_terminar(pestana['indice'], info)
+            asignar(pestana)
+        
+        try:
+            for _ in range(config['pestanas'] - 1):
+                driver.switch_to.new_window('tab')
+                if config.get('red_liviana'):
+                    self._bloquear_recursos(driver)
+                pestanas.append({'handle': driver.current_window_handle, 'indice': None})
+            for pestana in pestanas:
+                asignar(pestana)
+            
+            while self.activo and any(pestana['indice'] is not None for pestana in pestanas):
+                avanzo = False
+                for pestana in pestanas:
+                    if pestana['indice'] is None:
+                        continue
+                    driver.switch_to.window(pestana['handle'])
+                    
+                    try:
+                        nombre, url_actual = driver.execute_script(JS_ESTADO_DETALLE)
+                    except Exception:
+                        # La página todavía está cambiando de documento
+                        nombre, url_actual = None, None
+                    nombre_anterior, url_anterior = pestana['anterior']
+                    
+                    if nombre and (nombre != nombre_anterior or (url_anterior and url_actual != url_anterior)):
+                        self._metricas_en_curso().registrar('espera_detalle', time.perf_counter() - pestana['inicio'])
+                        info = self._extraer_informacion(driver)
+                        self.ritmo.registrar_latencia(time.perf_counter() - pestana['inicio'])
+                        if self.cache_activa:
+                            self.cache.guardar(extraer_id_lugar(pestana['url']), info.a_dict())
+                        terminar(pestana, info)
+                        avanzo = True
+                    elif time.time() > pestana['limite']:
+                        if pestana['intento'] < REINTENTOS_POR_LUGAR:
+                            navegar(pestana, pestana['indice'], pestana['url'], pestana['intento'] + 1)
+                        else:
+                            self._log(f"✗ Error en lugar {pestana['indice'] + 1}: sin respuesta en {timeout} s", 'error', "✗")
+                            terminar(pestana, None)
+                        avanzo = True
+                
+                if not avanzo:
+                    time.sleep(INTERVALO_SONDEO)
+        
+        finally:
+            # El navegador vuelve con una sola pestaña, listo para reutilizarse
+            try:
+                for pestana in pestanas[1:]:
+                    driver.switch_to.window(pestana['handle'])
+                    driver.close()
+                driver.switch_to.window(principal)
+            except Exception:
+                pass
+    
+    def _extraer_listado(self, driver, config, progreso, escritor):
+        """Arma los resultados desde las tarjetas del feed, sin abrir cada lugar.
+        
+        Opcionalmente abre solo los lugares cuya tarjeta no trae teléfono.
+        """
+        progreso("⚡ Leyendo tarjetas del listado...")
+        with self._etapa('lectura_listado'):
+            tarjetas = []
+            for tarjeta in driver.execute_script(JS_EXTRAER_FEED) or []:
+                canonica = self.deduplicador.canonica(tarjeta.get('url'))
+                if canonica is None:
+                    tarjetas.append(tarjeta)
+                else:
+                    self._vincular_a_corrida(escritor, canonica)
+            tarjetas = tarjetas[:config['max_results']]
+        
+        if not tarjetas:
+            self._log("❌ No se encontraron resultados", 'error', "✗")
+            return 0
+        
+        self._log(f"⚡ {len(tarjetas)} lugares leídos del listado", 'exito', "★")
+        self.ritmo.agregar_pendientes(len(tarjetas))
+        
+        for i, tarjeta in enumerate(tarjetas):
+            if not self.activo:
+                self._registrar_omitidos(escritor, len(tarjetas) - i)
+                break
+            
+            info = Lugar.desde_dict(tarjeta)
+            
+            if config['completar_telefonos'] and info.telefono is None and tarjeta.get('url'):
+                progreso(f"📞 Completando {i + 1}/{len(tarjetas)}...", (i + 1) / len(tarjetas))
+                try:
+                    detalle = (
+                        self._buscar_en_cache(tarjeta['url'])
+                        or self._visitar_lugar(driver, tarjeta['url'], config['wait_time'] + 5)
+                    )
+                    # El panel de detalle es la fuente más completa: pisa lo leído de la tarjeta
+                    info.fusionar(detalle)
+                except Exception as ex:
+                    self._log(f"⚠️ Sin detalle para {info.nombre}: {str(ex)}", 'aviso', "⚠️")
+            
+            self._publicar_resultado(info, escritor, tarjeta.get('url'))
+        
+        return escritor.total
+    
+    def _configurar_cache(self, config):
+        """Activa la caché de lugares según la configuración y reinicia sus contadores"""
+        self.cache_activa = config['cache_horas'] > 0
+        self.cache.ttl = config['cache_horas'] * 3600
+        self.cache.reiniciar_contadores()
+        if self.cache_activa:
+            self._log(f"🗃️ Caché activa: lugares de menos de {config['cache_horas']:g} h", 'info')
+    
+    def _buscar_en_cache(self, url):
+        """Devuelve el `Lugar` desde la caché si está vigente, o None"""
+        if not self.cache_activa:
+            return None
+        datos = self.cache.obtener(extraer_id_lugar(url))
+        return Lugar.desde_dict(datos) if datos else None
+    
+    def _recolectar_urls(self, driver):
+        """Devuelve las URLs de los lugares cargados en el feed, sin duplicados y en orden"""
+        urls = []
+        vistas = set()
+        for url in driver.execute_script(JS_URLS_LUGARES) or []:
+            clave = extraer_id_lugar(url)
+            if clave not in vistas:
+                vistas.add(clave)
+                urls.append(url)
+        return urls
+    
+    def _visitar_lugar(self, driver, url, timeout):
+        """Abre la página de un lugar por URL y extrae su información, reintentando si falla"""
+        self._contar_visita(driver)
+        for intento in range(REINTENTOS_POR_LUGAR + 1):
+            try:
+                inicio = time.perf_counter()
+                with self._etapa('navegacion'):
+                    driver.get(url)
+                with self._etapa('espera_detalle'):
+                    self._esperar_detalle(driver, None, None, timeout)
+                info = self._extraer_informacion(driver)
+                self.ritmo.registrar_latencia(time.perf_counter() - inicio)
+                if self.cache_activa:
+                    self.cache.guardar(extraer_id_lugar(url), info.a_dict())
+                return info
+            except Exception:
+                if intento == REINTENTOS_POR_LUGAR or not self.activo:
+                    raise
+    
+    def _esperar_detalle(self, driver, nombre_anterior, url_anterior, timeout):
+        """Espera a que el panel de detalle muestre un lugar distinto al anterior.
+        
+        Retorna apenas cambia el nombre del h1 o la URL; el timeout es solo el límite superior.
+        Devuelve el (nombre, url) del lugar mostrado.
+        """
+        from selenium.webdriver.support.ui import WebDriverWait
+        
+        def detalle_cambio(d):
+            nombre, url = d.execute_script(JS_ESTADO_DETALLE)
+            if not nombre:
+                return False
+            if nombre != nombre_anterior or (url_anterior and url != url_anterior):
+                return nombre, url
+            return False
+        
+        return WebDriverWait(driver, timeout, poll_frequency=INTERVALO_SONDEO).until(detalle_cambio)
+    
+    def _extraer_informacion(self, driver):
+        """Extrae el `Lugar` actual en un solo viaje al navegador"""
+        with self._etapa('extraccion'):
+            datos = driver.execute_script(JS_EXTRAER_INFORMACION) or {}
+        
+        # Se limpia y tipa una sola vez: el resto del programa ya no vuelve a interpretar textos
+        return Lugar.desde_dict(datos)
+    
+    def guardar_resultados(self, query, location, resultados):
+        """💾 Guarda una lista de lugares en una carpeta nueva de la búsqueda"""
+        if not resultados:
+            return
+        
+        escritor = EscritorIncremental(query, location)
+        try:
+            for info in resultados:
+                escritor.agregar(info)
+        except Exception as ex:
+            self._log(f"❌ Error al guardar: {str(ex)}", 'error', "✗")
+        
+        self._cerrar_escritor(escritor)
+    
+    def _terminar_corrida(self, escritor):
+        """Cierra la corrida de la búsqueda en el almacén SQLite, si está activo"""
+        if not self.almacen or escritor.corrida_id is None:
+            return
+        try:
+            self.almacen.terminar_corrida(escritor.corrida_id)
+        except Exception as ex:
+            self._log(f"⚠️ No se pudo cerrar la corrida en la base: {str(ex)}", 'aviso', "⚠️")
+    
+    def _guardar_metricas(self, escritor, metricas):
+        """Escribe los tiempos por etapa de la búsqueda junto a sus JSON/CSV"""
+        if not os.path.isdir(escritor.carpeta):
+            return
+        try:
+            metricas.guardar(
+                escritor.ruta_metricas,
+                query=escritor.query, location=escritor.location,
+                timestamp=escritor.timestamp, lugares=escritor.total
+            )
+            self._log(f"⏱️ Tiempos por etapa: {os.path.basename(escritor.ruta_metricas)}", 'info', "•")
+        except Exception as ex:
+            self._log(f"⚠️ No se pudieron guardar las métricas: {str(ex)}", 'aviso', "⚠️")
+    
+    def _cerrar_escritor(self, escritor):
+        """Cierra el escritor de una búsqueda, genera el JSON y el reporte finales y lo informa"""
+        try:
+            with self._etapa('cierre'):
+                resumen = escritor.cerrar()
+            if resumen is None:
+                return
+            
+            if escritor.carpeta_creada:
+                self._log(f"📁 Carpeta creada: {escritor.carpeta}", 'exito', "✓")
+            self._log(f"💾 Guardado automático: {resumen.total} resultados en '{escritor.carpeta}/'", 'exito', "✓")
+            self._log(f"📄 Archivos guardados: JSON, JSONL, CSV, TXT", 'exito', "✓")
+            if resumen.con_telefono:
+                self._log(f"📞 Archivo con teléfonos: resultados_CON_TELEFONO_{escritor.timestamp}.csv", 'exito', "✓")
+            
+        except Exception as ex:
+            self._log(f"❌ Error al guardar automáticamente: {str(ex)}", 'error', "✗")
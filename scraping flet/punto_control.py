@@ -0,0 +1,73 @@
+"""
+Puntos de control en disco para reanudar búsquedas interrumpidas
+"""
+
+import json
+import os
+from datetime import datetime
+
+from escritor_resultados import nombre_carpeta_busqueda
+
+ARCHIVO_PUNTO_CONTROL = "checkpoint.json"
+
+
+class PuntoControl:
+    """Guarda las URLs recolectadas de una búsqueda y cuáles ya se extrajeron.
+
+    Vive en la carpeta de la búsqueda y se borra cuando todos los lugares están hechos.
+    """
+
+    def __init__(self, query, location, timestamp, urls, hechas=None):
+        self.query = query
+        self.location = location
+        self.timestamp = timestamp
+        self.urls = list(urls)
+        self.hechas = set(hechas or [])
+        self.ruta = self.ruta_para(query, location)
+
+    @staticmethod
+    def ruta_para(query, location):
+        """Ruta del punto de control de una búsqueda"""
+        return os.path.join(nombre_carpeta_busqueda(query, location), ARCHIVO_PUNTO_CONTROL)
+
+    @classmethod
+    def cargar(cls, query, location):
+        """Lee el punto de control de una búsqueda, o devuelve None si no hay"""
+        ruta = cls.ruta_para(query, location)
+        if not os.path.exists(ruta):
+            return None
+        with open(ruta, 'r', encoding='utf-8') as f:
+            datos = json.load(f)
+        return cls(datos['query'], datos['location'], datos['timestamp'], datos['urls'], datos['hechas'])
+
+    def pendientes(self):
+        """URLs que todavía no se extrajeron, en el orden original"""
+        return [url for url in self.urls if url not in self.hechas]
+
+    def marcar_hecha(self, url):
+        """Registra un lugar como extraído (se persiste en el próximo guardar)"""
+        self.hechas.add(url)
+
+    def guardar(self):
+        """Escribe el punto de control de forma atómica"""
+        carpeta = os.path.dirname(self.ruta)
+        if not os.path.exists(carpeta):
+            os.makedirs(carpeta)
+
+        datos = {
+            'query': self.query,
+            'location': self.location,
+            'timestamp': self.timestamp,
+            'actualizado': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'urls': self.urls,
+            'hechas': [url for url in self.urls if url in self.hechas],
+        }
+        temporal = f"{self.ruta}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(datos, f, ensure_ascii=False, indent=2)
+        os.replace(temporal, self.ruta)
+
+    def eliminar(self):
+        """Borra el punto de control una vez terminada la búsqueda"""
+        if os.path.exists(self.ruta):
+            os.remove(self.ruta)
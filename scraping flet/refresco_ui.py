@@ -0,0 +1,79 @@
+"""
+Refresco agrupado de la interfaz, con una frecuencia máxima fija
+"""
+
+import threading
+import time
+
+
+class ProgramadorRefresco:
+    """Junta los cambios de UI pedidos por los hilos de trabajo y los aplica en lotes.
+
+    Los hilos solo encolan cambios o piden un refresco; un único hilo actualizador aplica
+    los cambios pendientes y llama a `actualizar` a lo sumo `hz` veces por segundo.
+    """
+
+    def __init__(self, actualizar, hz=8):
+        self._actualizar = actualizar
+        self._intervalo = 1.0 / hz
+        self._cambios = []
+        self._unicos = {}
+        self._lock = threading.Lock()
+        self._pendiente = threading.Event()
+        self._activo = True
+        self.refrescos = 0
+
+        self._hilo = threading.Thread(target=self._bucle, daemon=True)
+        self._hilo.start()
+
+    def solicitar(self):
+        """Marca que hay algo para mostrar; no bloquea al que llama"""
+        self._pendiente.set()
+
+    def encolar(self, cambio):
+        """Agrega una función que modifica controles para aplicarla en el próximo refresco"""
+        with self._lock:
+            self._cambios.append(cambio)
+        self._pendiente.set()
+
+    def encolar_unico(self, clave, cambio):
+        """Como encolar, pero si ya había un cambio pendiente con la misma clave lo reemplaza"""
+        with self._lock:
+            self._unicos[clave] = cambio
+        self._pendiente.set()
+
+    def detener(self):
+        """Aplica lo pendiente y termina el hilo actualizador"""
+        self._activo = False
+        self._pendiente.set()
+        self._hilo.join(timeout=2)
+
+    def _bucle(self):
+        while self._activo:
+            self._pendiente.wait()
+            inicio = time.time()
+            self._pendiente.clear()
+            self._aplicar()
+            # Lo que llegue mientras tanto se agrupa en el siguiente refresco
+            restante = self._intervalo - (time.time() - inicio)
+            if restante > 0:
+                time.sleep(restante)
+        self._aplicar()
+
+    def _aplicar(self):
+        with self._lock:
+            cambios, self._cambios = self._cambios, []
+            cambios.extend(self._unicos.values())
+            self._unicos = {}
+
+        for cambio in cambios:
+            try:
+                cambio()
+            except Exception as e:
+                print(f"Error aplicando cambio de UI: {e}")
+
+        try:
+            self._actualizar()
+            self.refrescos += 1
+        except Exception as e:
+            print(f"Error actualizando UI: {e}")
@@ -0,0 +1,115 @@
+"""
+Ritmo de extracción en vivo: lugares por minuto, ETA y si el ritmo viene cayendo
+"""
+
+import threading
+import time
+from collections import deque
+
+# Lugares recientes con los que se calcula el ritmo actual
+VENTANA_RITMO = 20
+
+# Latencias de los últimos lugares visitados que dibuja el sparkline
+LUGARES_SPARKLINE = 30
+
+# El ritmo se considera degradado si cae por debajo de esta fracción del ritmo inicial
+UMBRAL_DEGRADACION = 0.75
+
+BARRAS = "▁▂▃▄▅▆▇█"
+
+
+def sparkline(valores):
+    """Una barra por valor, escalada entre el mínimo y el máximo"""
+    if not valores:
+        return ""
+    minimo, maximo = min(valores), max(valores)
+    rango = maximo - minimo
+    if not rango:
+        return BARRAS[0] * len(valores)
+    return "".join(BARRAS[min(len(BARRAS) - 1, int((valor - minimo) / rango * len(BARRAS)))] for valor in valores)
+
+
+def formatear_eta(segundos):
+    """Tiempo restante legible: '35 s', '4 min 20 s' o '1 h 05 min'"""
+    if segundos is None:
+        return "-"
+    segundos = int(segundos)
+    if segundos < 60:
+        return f"{segundos} s"
+    if segundos < 3600:
+        return f"{segundos // 60} min {segundos % 60:02d} s"
+    return f"{segundos // 3600} h {segundos % 3600 // 60:02d} min"
+
+
+class RitmoExtraccion:
+    """Marca la hora de cada lugar procesado y resume el ritmo cuando se lo piden.
+
+    Las marcas de `registrar` (al publicar cada lugar) dan el ritmo y la ETA. El sparkline
+    usa en cambio lo que tardó cada visita, anotado con `registrar_latencia` apenas termina:
+    la publicación en orden suelta los lugares en ráfagas y no refleja esa latencia.
+    Registrar es O(1) y solo toca colas acotadas, así no frena al hilo de scraping;
+    los cálculos se hacen en `resumen`, que la interfaz llama a su propio ritmo.
+    En un lote, los pendientes son los de las búsquedas ya iniciadas.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reiniciar()
+
+    def reiniciar(self):
+        with self._lock:
+            self.inicio = None
+            self.procesados = 0
+            self.pendientes = 0
+            self.ritmo_inicial = None
+            self._marcas = deque(maxlen=VENTANA_RITMO + 1)
+            self._latencias = deque(maxlen=LUGARES_SPARKLINE)
+
+    def agregar_pendientes(self, cantidad):
+        """Suma (o resta, si es negativa) lugares que faltan procesar"""
+        with self._lock:
+            if self.inicio is None:
+                self.inicio = time.monotonic()
+            self.pendientes = max(0, self.pendientes + cantidad)
+
+    def registrar(self):
+        """Cuenta un lugar procesado, extraído o fallido"""
+        ahora = time.monotonic()
+        with self._lock:
+            if self.inicio is None:
+                self.inicio = ahora
+            self._marcas.append(ahora)
+            self.procesados += 1
+            self.pendientes = max(0, self.pendientes - 1)
+            if self.ritmo_inicial is None and len(self._marcas) == self._marcas.maxlen:
+                self.ritmo_inicial = self._ritmo_ventana()
+
+    def registrar_latencia(self, segundos):
+        """Anota lo que tardó en extraerse un lugar visitado (los de la caché no cuentan)"""
+        with self._lock:
+            self._latencias.append(segundos)
+
+    def _ritmo_ventana(self):
+        if len(self._marcas) < 2:
+            return None
+        duracion = self._marcas[-1] - self._marcas[0]
+        return (len(self._marcas) - 1) / duracion * 60 if duracion > 0 else None
+
+    def resumen(self):
+        """Ritmo actual y promedio (lugares/min), ETA en segundos, degradación y sparkline"""
+        with self._lock:
+            actual = self._ritmo_ventana()
+            transcurrido = time.monotonic() - self.inicio if self.inicio is not None else 0
+            promedio = self.procesados / transcurrido * 60 if transcurrido > 0 and self.procesados else None
+            ritmo_eta = actual or promedio
+            relacion = actual / self.ritmo_inicial if actual and self.ritmo_inicial else None
+            return {
+                'procesados': self.procesados,
+                'pendientes': self.pendientes,
+                'actual': actual,
+                'promedio': promedio,
+                'eta': self.pendientes / ritmo_eta * 60 if ritmo_eta and self.pendientes else None,
+                'relacion_inicial': relacion,
+                'degradado': relacion is not None and relacion < UMBRAL_DEGRADACION,
+                'sparkline': sparkline(list(self._latencias)),
+            }
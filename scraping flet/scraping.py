@@ -1,14 +1,12 @@
 import flet as ft
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import time
-import json
-import csv
-from datetime import datetime
 import threading
-import os
+
+from motor_scraping import CONFIG_POR_DEFECTO, MotorScraping, parsear_lote
+from punto_control import PuntoControl
+from refresco_ui import ProgramadorRefresco
+from indice_resultados import IndiceResultados
+from metricas import ETAPAS, formatear_duracion
+from ritmo_extraccion import formatear_eta
 
 # 🎨 PALETA DE COLORES VIBRANTES
 COLORS = {
@@ -24,6 +22,23 @@ COLORS = {
     'card': '#16213E',         # Card
 }
 
+# Frecuencia máxima de refresco de la UI (la tasa de scraping no depende de Flet)
+REFRESCOS_POR_SEGUNDO = 8
+
+# Tarjetas por página en el panel de resultados
+TAMANO_PAGINA = 20
+
+# Opción de los filtros que no restringe nada
+FILTRO_TODOS = "Todos"
+
+# Color del log para cada nivel de mensaje del motor
+COLORES_NIVEL = {
+    'info': COLORS['info'],
+    'exito': COLORS['success'],
+    'aviso': COLORS['warning'],
+    'error': COLORS['primary'],
+    'destacado': COLORS['secondary'],
+}
 
 class GoogleMapsScraperUI:
     """🗺️ Scraper de Google Maps con UI en Flet"""
@@ -31,8 +46,16 @@ class GoogleMapsScraperUI:
     def __init__(self, page: ft.Page):
         self.page = page
         self.resultados = []
-        self.driver = None
-        self.scraping_activo = False
+        self.lock_resultados = threading.Lock()
+        self.refresco = ProgramadorRefresco(self.page.update, hz=REFRESCOS_POR_SEGUNDO)
+        
+        # Toda la lógica de scraping vive en el motor; la app solo muestra lo que informa
+        self.motor = MotorScraping(
+            al_log=self._log_motor,
+            al_progreso=self._mostrar_progreso,
+            al_resultado=self._agregar_resultado,
+            al_estadisticas=self._actualizar_stats,
+        )
         
         # Configurar página
         self.page.title = "🗺️ Google Maps Scraper Pro"
@@ -48,14 +71,49 @@ class GoogleMapsScraperUI:
         self.location_input = None
         self.max_results_input = None
         self.wait_time_input = None
+        self.idle_input = None
+        self.cache_input = None
+        self.workers_input = None
+        self.pestanas_input = None
         self.headless_switch = None
+        self.red_liviana_switch = None
+        self.reutilizar_switch = None
+        self.deduplicar_switch = None
+        self.perfil_input = None
+        self.base_datos_input = None
+        self.solo_listado_switch = None
+        self.completar_telefonos_switch = None
         self.log_area = None
         self.progress_bar = None
         self.progress_text = None
         self.stats_container = None
+        self.stat_valores = {}
+        self.tipos_texto = None
         self.btn_iniciar = None
         self.btn_detener = None
+        self.btn_reanudar = None
+        self.btn_lote = None
+        self.lote_input = None
+        self.lote_workers_input = None
         self.resultados_lista = None
+        self.paginador_texto = None
+        self.btn_pagina_anterior = None
+        self.btn_pagina_siguiente = None
+        
+        # Paginación del panel de resultados: solo se construyen las tarjetas visibles
+        self.pagina_actual = 0
+        self.seguir_ultima_pagina = True
+        
+        # Filtros sobre los resultados: la vista son las posiciones que pasan los filtros
+        self.indice = IndiceResultados()
+        self.filtros = {}
+        self.vista = []
+        self.vista_revisados = 0
+        self.filtro_nombre = None
+        self.filtro_tipo = None
+        self.filtro_telefono = None
+        self.filtro_website = None
+        self.filtro_rating = None
         
         self.crear_ui()
     
@@ -99,9 +157,15 @@ class GoogleMapsScraperUI:
         # Panel de control
         control_panel = self._crear_panel_control()
         
+        # Panel de lote
+        lote_panel = self._crear_panel_lote()
+        
         # Panel de progreso
         progress_panel = self._crear_panel_progreso()
         
+        # Panel de tiempos por etapa
+        metricas_panel = self._crear_panel_metricas()
+        
         # Panel de resultados
         resultados_panel = self._crear_panel_resultados()
         
@@ -113,6 +177,8 @@ class GoogleMapsScraperUI:
                     config_panel,
                     ft.Container(height=20),
                     control_panel,
+                    ft.Container(height=20),
+                    lote_panel,
                 ], scroll=ft.ScrollMode.AUTO),
                 width=500,
                 padding=20,
@@ -121,7 +187,10 @@ class GoogleMapsScraperUI:
             # Columna derecha (Progreso + Resultados)
             ft.Container(
                 content=ft.Column([
-                    progress_panel,
+                    ft.Row([
+                        ft.Container(content=progress_panel, expand=True),
+                        metricas_panel,
+                    ], spacing=20, vertical_alignment=ft.CrossAxisAlignment.START),
                     ft.Container(height=20),
                     resultados_panel,
                 ], scroll=ft.ScrollMode.AUTO, expand=True),
@@ -163,7 +232,7 @@ class GoogleMapsScraperUI:
         
         self.max_results_input = ft.TextField(
             label="📊 Máximo de resultados",
-            value="25",
+            value=str(CONFIG_POR_DEFECTO['max_results']),
             keyboard_type=ft.KeyboardType.NUMBER,
             width=200,
             border_color=COLORS['secondary'],
@@ -173,7 +242,37 @@ class GoogleMapsScraperUI:
         
         self.wait_time_input = ft.TextField(
             label="⏱️ Tiempo de espera (seg)",
-            value="3",
+            value=str(CONFIG_POR_DEFECTO['wait_time']),
+            keyboard_type=ft.KeyboardType.NUMBER,
+            width=200,
+            border_color=COLORS['secondary'],
+            focused_border_color=COLORS['primary'],
+            color=COLORS['light']
+        )
+        
+        self.workers_input = ft.TextField(
+            label="👷 Navegadores paralelos",
+            value=str(CONFIG_POR_DEFECTO['num_workers']),
+            keyboard_type=ft.KeyboardType.NUMBER,
+            width=200,
+            border_color=COLORS['secondary'],
+            focused_border_color=COLORS['primary'],
+            color=COLORS['light']
+        )
+        
+        self.pestanas_input = ft.TextField(
+            label="🗂️ Pestañas por navegador",
+            value=str(CONFIG_POR_DEFECTO['pestanas']),
+            keyboard_type=ft.KeyboardType.NUMBER,
+            width=200,
+            border_color=COLORS['secondary'],
+            focused_border_color=COLORS['primary'],
+            color=COLORS['light']
+        )
+        
+        self.idle_input = ft.TextField(
+            label="💤 Fin de scroll sin cambios (seg)",
+            value=f"{CONFIG_POR_DEFECTO['espera_inactiva']:g}",
             keyboard_type=ft.KeyboardType.NUMBER,
             width=200,
             border_color=COLORS['secondary'],
@@ -181,9 +280,67 @@ class GoogleMapsScraperUI:
             color=COLORS['light']
         )
         
+        self.cache_input = ft.TextField(
+            label="🗃️ Caché de lugares (horas, 0 = sin caché)",
+            value=f"{CONFIG_POR_DEFECTO['cache_horas']:g}",
+            keyboard_type=ft.KeyboardType.NUMBER,
+            width=420,
+            border_color=COLORS['secondary'],
+            focused_border_color=COLORS['primary'],
+            color=COLORS['light']
+        )
+        
         self.headless_switch = ft.Switch(
             label="🕶️ Modo invisible",
-            value=False,
+            value=CONFIG_POR_DEFECTO['headless'],
+            active_color=COLORS['success'],
+        )
+        
+        self.red_liviana_switch = ft.Switch(
+            label="🪶 Red liviana (sin imágenes, fuentes ni mapa)",
+            value=CONFIG_POR_DEFECTO['red_liviana'],
+            active_color=COLORS['success'],
+        )
+        
+        self.base_datos_input = ft.TextField(
+            label="🗄️ Base SQLite de resultados (archivo, vacío = desactivada)",
+            value=CONFIG_POR_DEFECTO['base_datos'],
+            width=420,
+            border_color=COLORS['secondary'],
+            focused_border_color=COLORS['primary'],
+            color=COLORS['light']
+        )
+        
+        self.reutilizar_switch = ft.Switch(
+            label="♻️ Mantener el navegador abierto entre búsquedas",
+            value=CONFIG_POR_DEFECTO['reutilizar_navegador'],
+            active_color=COLORS['success'],
+        )
+        
+        self.perfil_input = ft.TextField(
+            label="📂 Perfil persistente del navegador (carpeta, vacío = temporal)",
+            value=CONFIG_POR_DEFECTO['perfil_navegador'],
+            width=420,
+            border_color=COLORS['secondary'],
+            focused_border_color=COLORS['primary'],
+            color=COLORS['light']
+        )
+        
+        self.deduplicar_switch = ft.Switch(
+            label="🧬 Omitir lugares ya extraídos en corridas anteriores",
+            value=CONFIG_POR_DEFECTO['deduplicar_global'],
+            active_color=COLORS['success'],
+        )
+        
+        self.solo_listado_switch = ft.Switch(
+            label="⚡ Solo listado (sin abrir cada lugar)",
+            value=CONFIG_POR_DEFECTO['solo_listado'],
+            active_color=COLORS['success'],
+        )
+        
+        self.completar_telefonos_switch = ft.Switch(
+            label="📞 Abrir solo los lugares sin teléfono",
+            value=CONFIG_POR_DEFECTO['completar_telefonos'],
             active_color=COLORS['success'],
         )
         
@@ -208,7 +365,25 @@ class GoogleMapsScraperUI:
                     self.wait_time_input,
                 ], spacing=20),
                 ft.Container(height=10),
+                ft.Row([
+                    self.workers_input,
+                    self.pestanas_input,
+                ], spacing=20),
+                ft.Container(height=10),
+                self.idle_input,
+                ft.Container(height=10),
+                self.cache_input,
+                ft.Container(height=10),
+                self.perfil_input,
+                ft.Container(height=10),
+                self.base_datos_input,
+                ft.Container(height=10),
                 self.headless_switch,
+                self.red_liviana_switch,
+                self.reutilizar_switch,
+                self.deduplicar_switch,
+                self.solo_listado_switch,
+                self.completar_telefonos_switch,
             ]),
             bgcolor=COLORS['card'],
             padding=25,
@@ -258,6 +433,22 @@ class GoogleMapsScraperUI:
             disabled=True,
         )
         
+        self.btn_reanudar = ft.ElevatedButton(
+            content=ft.Row([
+                ft.Icon(ft.Icons.RESTORE, size=24),
+                ft.Text("REANUDAR", size=16, weight=ft.FontWeight.BOLD),
+            ], tight=True),
+            on_click=self._reanudar_scraping,
+            style=ft.ButtonStyle(
+                bgcolor=COLORS['secondary'],
+                color=COLORS['dark'],
+                padding=20,
+                shape=ft.RoundedRectangleBorder(radius=10),
+            ),
+            width=220,
+            height=60,
+        )
+        
         btn_guardar = ft.ElevatedButton(
             content=ft.Row([
                 ft.Icon(ft.Icons.SAVE, size=24),
@@ -306,6 +497,8 @@ class GoogleMapsScraperUI:
                 ft.Container(height=10),
                 self.btn_detener,
                 ft.Container(height=10),
+                self.btn_reanudar,
+                ft.Container(height=10),
                 btn_guardar,
                 ft.Container(height=10),
                 btn_limpiar,
@@ -322,6 +515,77 @@ class GoogleMapsScraperUI:
             )
         )
     
+    def _crear_panel_lote(self):
+        """📦 Panel de búsquedas por lote"""
+        
+        self.lote_input = ft.TextField(
+            label="📦 Búsquedas (una por línea: qué | dónde) o ruta a un CSV",
+            hint_text="restaurantes | Córdoba, Argentina\nhoteles | Caracas, Venezuela",
+            multiline=True,
+            min_lines=4,
+            max_lines=8,
+            border_color=COLORS['info'],
+            focused_border_color=COLORS['primary'],
+            text_style=ft.TextStyle(size=13),
+            color=COLORS['light']
+        )
+        
+        self.lote_workers_input = ft.TextField(
+            label="🔀 Búsquedas simultáneas",
+            value="2",
+            keyboard_type=ft.KeyboardType.NUMBER,
+            width=200,
+            border_color=COLORS['info'],
+            focused_border_color=COLORS['primary'],
+            color=COLORS['light']
+        )
+        
+        self.btn_lote = ft.ElevatedButton(
+            content=ft.Row([
+                ft.Icon(ft.Icons.PLAYLIST_PLAY, size=24),
+                ft.Text("INICIAR LOTE", size=16, weight=ft.FontWeight.BOLD),
+            ], tight=True),
+            on_click=self._iniciar_lote,
+            style=ft.ButtonStyle(
+                bgcolor=COLORS['info'],
+                color=COLORS['light'],
+                padding=20,
+                shape=ft.RoundedRectangleBorder(radius=10),
+            ),
+            width=220,
+            height=60,
+        )
+        
+        return ft.Container(
+            content=ft.Column([
+                ft.Row([
+                    ft.Icon(ft.Icons.PLAYLIST_ADD_CHECK, color=COLORS['info'], size=30),
+                    ft.Text(
+                        "LOTE DE BÚSQUEDAS",
+                        size=24,
+                        weight=ft.FontWeight.BOLD,
+                        color=COLORS['info']
+                    ),
+                ]),
+                ft.Divider(color=COLORS['info'], height=20),
+                self.lote_input,
+                ft.Container(height=10),
+                self.lote_workers_input,
+                ft.Container(height=10),
+                self.btn_lote,
+            ]),
+            bgcolor=COLORS['card'],
+            padding=25,
+            border_radius=15,
+            border=ft.border.all(2, COLORS['info']),
+            shadow=ft.BoxShadow(
+                spread_radius=1,
+                blur_radius=15,
+                color=ft.Colors.with_opacity(0.3, COLORS['info']),
+                offset=ft.Offset(0, 4),
+            )
+        )
+    
     def _crear_panel_progreso(self):
         """📊 Panel de progreso"""
         
@@ -341,10 +605,37 @@ class GoogleMapsScraperUI:
             weight=ft.FontWeight.BOLD
         )
         
+        self.ritmo_texto = ft.Text(
+            "⚡ Ritmo: -",
+            size=13,
+            color=COLORS['light'],
+        )
+        
+        # Lo que tardó cada uno de los últimos lugares visitados, como barras de texto (sin gráficos)
+        self.ritmo_sparkline = ft.Text(
+            "",
+            size=16,
+            color=COLORS['secondary'],
+            font_family="monospace",
+            tooltip="Latencia de los últimos lugares visitados (más alto = más lento)",
+        )
+        
+        self.tipos_texto = ft.Text(
+            "🏷️ Categorías: -",
+            size=13,
+            color=COLORS['light'],
+        )
+        
         self.stats_container = ft.Row([
             self._crear_stat_card("Total", "0", ft.Icons.ANALYTICS, COLORS['info']),
             self._crear_stat_card("Con Tel", "0", ft.Icons.PHONE, COLORS['success']),
             self._crear_stat_card("Sin Tel", "0", ft.Icons.PHONE_DISABLED, COLORS['primary']),
+            self._crear_stat_card("Con Web", "0", ft.Icons.LANGUAGE, COLORS['secondary']),
+            self._crear_stat_card("Rating", "-", ft.Icons.STAR, COLORS['warning']),
+            self._crear_stat_card("Fallidos", "0", ft.Icons.ERROR_OUTLINE, COLORS['primary']),
+            self._crear_stat_card("Omitidos", "0", ft.Icons.SKIP_NEXT, COLORS['warning']),
+            self._crear_stat_card("Caché ✓", "0", ft.Icons.CACHED, COLORS['secondary']),
+            self._crear_stat_card("Caché ✗", "0", ft.Icons.CLOUD_DOWNLOAD, COLORS['accent']),
         ], spacing=15, wrap=True)
         
         self.log_area = ft.ListView(
@@ -369,8 +660,12 @@ class GoogleMapsScraperUI:
                 self.progress_text,
                 ft.Container(height=10),
                 self.progress_bar,
-                ft.Container(height=20),
+                ft.Container(height=10),
+                ft.Row([self.ritmo_texto, self.ritmo_sparkline], spacing=15, wrap=True),
+                ft.Container(height=10),
                 self.stats_container,
+                ft.Container(height=10),
+                self.tipos_texto,
                 ft.Container(height=20),
                 ft.Text("📋 Log de Actividad:", size=16, color=COLORS['light'], weight=ft.FontWeight.BOLD),
                 ft.Container(height=10),
@@ -393,13 +688,56 @@ class GoogleMapsScraperUI:
             )
         )
     
+    def _crear_panel_metricas(self):
+        """⏱️ Panel de tiempos por etapa"""
+        
+        self.metricas_lista = ft.Column(
+            [ft.Text("Sin mediciones todavía", size=13, color=COLORS['light'])],
+            spacing=8,
+        )
+        
+        return ft.Container(
+            content=ft.Column([
+                ft.Row([
+                    ft.Icon(ft.Icons.TIMER, color=COLORS['secondary'], size=30),
+                    ft.Text(
+                        "TIEMPOS POR ETAPA",
+                        size=24,
+                        weight=ft.FontWeight.BOLD,
+                        color=COLORS['secondary']
+                    ),
+                ]),
+                ft.Divider(color=COLORS['secondary'], height=20),
+                ft.Row([
+                    ft.Text("Etapa", size=12, color=COLORS['secondary'], weight=ft.FontWeight.BOLD, expand=True),
+                    ft.Text("p50", size=12, color=COLORS['secondary'], weight=ft.FontWeight.BOLD, width=60),
+                    ft.Text("p95", size=12, color=COLORS['secondary'], weight=ft.FontWeight.BOLD, width=60),
+                    ft.Text("máx", size=12, color=COLORS['secondary'], weight=ft.FontWeight.BOLD, width=60),
+                ]),
+                self.metricas_lista,
+            ]),
+            width=420,
+            bgcolor=COLORS['card'],
+            padding=25,
+            border_radius=15,
+            border=ft.border.all(2, COLORS['secondary']),
+            shadow=ft.BoxShadow(
+                spread_radius=1,
+                blur_radius=15,
+                color=ft.Colors.with_opacity(0.3, COLORS['secondary']),
+                offset=ft.Offset(0, 4),
+            )
+        )
+    
     def _crear_stat_card(self, titulo, valor, icono, color):
         """Crea una tarjeta de estadística"""
+        # Se guarda el texto del valor para actualizarlo por título
+        self.stat_valores[titulo] = ft.Text(valor, size=28, weight=ft.FontWeight.BOLD, color=color)
         return ft.Container(
             content=ft.Column([
                 ft.Icon(icono, color=color, size=40),
                 ft.Text(titulo, size=14, color=COLORS['light']),
-                ft.Text(valor, size=28, weight=ft.FontWeight.BOLD, color=color),
+                self.stat_valores[titulo],
             ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=5),
             bgcolor=COLORS['dark'],
             padding=20,
@@ -418,6 +756,72 @@ class GoogleMapsScraperUI:
             auto_scroll=False,
         )
         
+        self.btn_pagina_anterior = ft.IconButton(
+            icon=ft.Icons.CHEVRON_LEFT,
+            icon_color=COLORS['success'],
+            on_click=lambda e: self._cambiar_pagina(-1),
+            disabled=True,
+        )
+        
+        self.btn_pagina_siguiente = ft.IconButton(
+            icon=ft.Icons.CHEVRON_RIGHT,
+            icon_color=COLORS['success'],
+            on_click=lambda e: self._cambiar_pagina(1),
+            disabled=True,
+        )
+        
+        self.paginador_texto = ft.Text(
+            "Página 1/1 • 0 resultados",
+            size=14,
+            color=COLORS['light'],
+        )
+        
+        self.filtro_nombre = ft.TextField(
+            label="🔎 Nombre",
+            on_change=self._aplicar_filtros,
+            width=200,
+            dense=True,
+            border_color=COLORS['success'],
+            focused_border_color=COLORS['primary'],
+            color=COLORS['light']
+        )
+        
+        self.filtro_tipo = ft.Dropdown(
+            label="🏷️ Tipo",
+            value=FILTRO_TODOS,
+            options=[ft.dropdown.Option(FILTRO_TODOS)],
+            on_change=self._aplicar_filtros,
+            width=200,
+            dense=True,
+            border_color=COLORS['success'],
+            color=COLORS['light']
+        )
+        
+        self.filtro_rating = ft.Dropdown(
+            label="⭐ Rating mínimo",
+            value=FILTRO_TODOS,
+            options=[ft.dropdown.Option(valor) for valor in (FILTRO_TODOS, "3", "3.5", "4", "4.5")],
+            on_change=self._aplicar_filtros,
+            width=150,
+            dense=True,
+            border_color=COLORS['success'],
+            color=COLORS['light']
+        )
+        
+        self.filtro_telefono = ft.Checkbox(
+            label="📞 Con teléfono",
+            value=False,
+            on_change=self._aplicar_filtros,
+            active_color=COLORS['success'],
+        )
+        
+        self.filtro_website = ft.Checkbox(
+            label="🌐 Con website",
+            value=False,
+            on_change=self._aplicar_filtros,
+            active_color=COLORS['success'],
+        )
+        
         return ft.Container(
             content=ft.Column([
                 ft.Row([
@@ -430,6 +834,19 @@ class GoogleMapsScraperUI:
                     ),
                 ]),
                 ft.Divider(color=COLORS['success'], height=20),
+                ft.Row([
+                    self.filtro_nombre,
+                    self.filtro_tipo,
+                    self.filtro_rating,
+                    self.filtro_telefono,
+                    self.filtro_website,
+                ], spacing=10, wrap=True),
+                ft.Container(height=10),
+                ft.Row([
+                    self.btn_pagina_anterior,
+                    self.paginador_texto,
+                    self.btn_pagina_siguiente,
+                ], alignment=ft.MainAxisAlignment.CENTER),
                 ft.Container(
                     content=self.resultados_lista,
                     bgcolor=COLORS['dark'],
@@ -454,7 +871,7 @@ class GoogleMapsScraperUI:
         """Agrega un mensaje al log (seguro para threading)"""
         color = color or COLORS['light']
         
-        try:
+        def agregar_entrada():
             log_entry = ft.Container(
                 content=ft.Row([
                     ft.Text(icono, size=16, color=color),
@@ -463,51 +880,255 @@ class GoogleMapsScraperUI:
                 padding=5,
             )
             
-            # Agregar al log y actualizar UI directamente
             self.log_area.controls.append(log_entry)
             
             # Limitar a 100 mensajes para no sobrecargar
             if len(self.log_area.controls) > 100:
                 self.log_area.controls.pop(0)
-            
-            try:
-                self.page.update()
-            except Exception as e:
-                print(f"Error actualizando UI en _log: {e}")
-                
+        
+        try:
+            # El control se crea y agrega en el próximo refresco, no en el hilo de trabajo
+            self.refresco.encolar(agregar_entrada)
         except Exception as e:
             # Si falla el log en UI, al menos lo imprimimos
             print(f"{icono} {mensaje}")
             print(f"Error en _log: {e}")
     
+    def _log_motor(self, mensaje, nivel, icono):
+        """Muestra en el log un mensaje del motor con el color de su nivel"""
+        self._log(mensaje, COLORES_NIVEL.get(nivel), icono)
+    
+    def _mostrar_progreso(self, texto, valor=None):
+        """Muestra el avance informado por el motor"""
+        self.progress_text.value = texto
+        if valor is not None:
+            self.progress_bar.value = valor
+        self._actualizar_ritmo()
+        self._actualizar_progress_ui()
+    
+    def _actualizar_ritmo(self):
+        """Muestra lugares/min, ETA y el sparkline de latencia (seguro para threading)"""
+        def mostrar():
+            ritmo = self.motor.ritmo.resumen()
+            if not ritmo['procesados']:
+                self.ritmo_texto.value = "⚡ Ritmo: -"
+                self.ritmo_texto.color = COLORS['light']
+                self.ritmo_sparkline.value = ""
+                return
+            
+            partes = []
+            if ritmo['actual'] is not None:
+                partes.append(f"⚡ {ritmo['actual']:.1f} lugares/min")
+            if ritmo['promedio'] is not None:
+                partes.append(f"promedio {ritmo['promedio']:.1f}")
+            if ritmo['eta'] is not None:
+                partes.append(f"⏳ ETA {formatear_eta(ritmo['eta'])}")
+            if ritmo['degradado']:
+                partes.append(f"📉 {(1 - ritmo['relacion_inicial']) * 100:.0f}% más lento que al inicio")
+            
+            self.ritmo_texto.value = " • ".join(partes) or "⚡ Ritmo: -"
+            self.ritmo_texto.color = COLORS['warning'] if ritmo['degradado'] else COLORS['light']
+            self.ritmo_sparkline.value = ritmo['sparkline']
+        
+        # Se calcula en el hilo de refresco y a lo sumo una vez por refresco
+        self.refresco.encolar_unico('ritmo', mostrar)
+    
+    def _agregar_resultado(self, info):
+        """Agrega a los resultados y al índice un lugar publicado por el motor"""
+        with self.lock_resultados:
+            self.resultados.append(info)
+            self.indice.agregar(info)
+        self._agregar_resultado_ui()
+    
     def _actualizar_stats(self):
         """Actualiza las estadísticas (seguro para threading)"""
-        try:
-            total = len(self.resultados)
-            con_tel = sum(1 for r in self.resultados if r.get('telefono') != "N/A")
-            sin_tel = total - con_tel
+        def mostrar():
+            stats = self.motor.estadisticas
+            rating = stats.rating_promedio
+            valores = {
+                "Total": stats.total,
+                "Con Tel": stats.con_telefono,
+                "Sin Tel": stats.sin_telefono,
+                "Con Web": stats.con_website,
+                "Rating": f"{rating:.2f}" if rating is not None else "-",
+                "Fallidos": stats.fallidos,
+                "Omitidos": stats.omitidos,
+                "Caché ✓": self.motor.cache.aciertos,
+                "Caché ✗": self.motor.cache.fallos,
+            }
+            for titulo, valor in valores.items():
+                self.stat_valores[titulo].value = str(valor)
             
-            # Actualizar estadísticas directamente
-            if hasattr(self, 'stats_container') and self.stats_container.controls:
-                self.stats_container.controls[0].content.controls[2].value = str(total)
-                self.stats_container.controls[1].content.controls[2].value = str(con_tel)
-                self.stats_container.controls[2].content.controls[2].value = str(sin_tel)
-                self._actualizar_progress_ui()
-                
-        except Exception as e:
-            print(f"Error actualizando stats: {e}")
+            tipos = stats.tipos_frecuentes(5)
+            self.tipos_texto.value = "🏷️ Categorías: " + (
+                " • ".join(f"{tipo} ({cantidad})" for tipo, cantidad in tipos) if tipos else "-"
+            )
+        
+        # Los contadores son O(1); se muestran una sola vez por refresco aunque lleguen muchos lugares
+        self.refresco.encolar_unico('stats', mostrar)
+        self._actualizar_metricas()
+    
+    def _actualizar_metricas(self):
+        """Muestra los percentiles de cada etapa (seguro para threading)"""
+        def mostrar():
+            resumen = self.motor.metricas.resumen()
+            if not resumen:
+                self.metricas_lista.controls = [
+                    ft.Text("Sin mediciones todavía", size=13, color=COLORS['light'])
+                ]
+                return
+            self.metricas_lista.controls = [
+                ft.Row([
+                    ft.Text(
+                        f"{ETAPAS.get(etapa, etapa)} ({medida['eventos']})",
+                        size=13, color=COLORS['light'], expand=True
+                    ),
+                    ft.Text(formatear_duracion(medida['p50']), size=13, color=COLORS['success'], width=60),
+                    ft.Text(formatear_duracion(medida['p95']), size=13, color=COLORS['warning'], width=60),
+                    ft.Text(formatear_duracion(medida['max']), size=13, color=COLORS['primary'], width=60),
+                ])
+                for etapa, medida in resumen.items()
+            ]
+        
+        # El resumen se arma a lo sumo una vez por refresco, nunca en el hilo de scraping
+        self.refresco.encolar_unico('metricas', mostrar)
+    
+    def _agregar_resultado_ui(self):
+        """Muestra los resultados nuevos en el panel (seguro para threading)"""
+        self.refresco.encolar(self._mostrar_resultados_nuevos)
+    
+    def _total_paginas(self):
+        """Cantidad de páginas del panel de resultados"""
+        return max(1, -(-len(self.vista) // TAMANO_PAGINA))
+    
+    def _mostrar_resultados_nuevos(self):
+        """Completa la página visible con los resultados que todavía no tienen tarjeta"""
+        # El motor agrega resultados y un reinicio puede cambiar la lista: lo que se muestra
+        # se copia con el lock tomado y las tarjetas se arman después, desde la copia
+        with self.lock_resultados:
+            # Solo se revisan contra los filtros los resultados que llegaron desde la última vez
+            indexados = len(self.indice)
+            if indexados < self.vista_revisados:
+                # Los resultados se reiniciaron y el panel todavía no: lo resuelve el reinicio encolado
+                return
+            for posicion in range(self.vista_revisados, indexados):
+                if self.indice.coincide(posicion, **self.filtros):
+                    self.vista.append(posicion)
+            self.vista_revisados = indexados
+            
+            ultima = self._total_paginas() - 1
+            if self.seguir_ultima_pagina and self.pagina_actual != ultima:
+                self.pagina_actual = ultima
+                self.resultados_lista.controls = []
+            
+            inicio = self.pagina_actual * TAMANO_PAGINA
+            mostrados = len(self.resultados_lista.controls)
+            nuevos = [
+                (self.resultados[posicion], posicion + 1)
+                for posicion in self.vista[inicio + mostrados:inicio + TAMANO_PAGINA]
+            ]
+            
+            # Las categorías nuevas se agregan al filtro por tipo
+            tipos = None
+            if len(self.filtro_tipo.options) - 1 != len(self.indice.por_tipo):
+                tipos = self.indice.tipos()
+        
+        for info, numero in nuevos:
+            self.resultados_lista.controls.append(self._crear_card_resultado(info, numero))
+        
+        if tipos is not None:
+            self.filtro_tipo.options = [ft.dropdown.Option(FILTRO_TODOS)] + [
+                ft.dropdown.Option(tipo) for tipo in tipos
+            ]
+        
+        self._actualizar_paginador()
     
-    def _agregar_resultado_ui(self, info, indice):
-        """Agrega un resultado a la UI (seguro para threading)"""
+    def _actualizar_paginador(self):
+        """Actualiza el texto y los botones de la paginación"""
+        total_paginas = self._total_paginas()
+        filtrados = f"{len(self.vista)} de " if self.filtros else ""
+        self.paginador_texto.value = (
+            f"Página {self.pagina_actual + 1}/{total_paginas} • {filtrados}{len(self.resultados)} resultados"
+        )
+        self.btn_pagina_anterior.disabled = self.pagina_actual == 0
+        self.btn_pagina_siguiente.disabled = self.pagina_actual >= total_paginas - 1
+    
+    def _cambiar_pagina(self, delta):
+        """◀ ▶ Cambia la página visible del panel de resultados"""
+        def cambiar():
+            ultima = self._total_paginas() - 1
+            self.pagina_actual = min(max(self.pagina_actual + delta, 0), ultima)
+            # En la última página se siguen mostrando los resultados nuevos a medida que llegan
+            self.seguir_ultima_pagina = self.pagina_actual == ultima
+            self.resultados_lista.controls = []
+            self._mostrar_resultados_nuevos()
+        
+        self.refresco.encolar(cambiar)
+    
+    def _aplicar_filtros(self, e=None):
+        """🔎 Filtra los resultados con el índice en memoria, sin reconstruir todas las tarjetas"""
+        filtros = {}
+        if self.filtro_nombre.value:
+            filtros['texto'] = self.filtro_nombre.value.strip()
+        if self.filtro_tipo.value and self.filtro_tipo.value != FILTRO_TODOS:
+            filtros['tipo'] = self.filtro_tipo.value
+        if self.filtro_telefono.value:
+            filtros['con_telefono'] = True
+        if self.filtro_website.value:
+            filtros['con_website'] = True
+        if self.filtro_rating.value and self.filtro_rating.value != FILTRO_TODOS:
+            filtros['rating_minimo'] = float(self.filtro_rating.value)
+        
+        def filtrar():
+            self.filtros = filtros
+            with self.lock_resultados:
+                self.vista = self.indice.filtrar(**filtros)
+                self.vista_revisados = len(self.indice)
+            self.pagina_actual = 0
+            self.seguir_ultima_pagina = self._total_paginas() == 1
+            self.resultados_lista.controls = []
+            self._mostrar_resultados_nuevos()
+        
+        self.refresco.encolar(filtrar)
+    
+    def _reiniciar_panel_resultados(self):
+        """Vacía el panel de resultados, quita los filtros y vuelve a la primera página"""
+        with self.lock_resultados:
+            self.resultados = []
+            self.indice.reiniciar()
+            self.motor.estadisticas.reiniciar()
+            self.motor.metricas.reiniciar()
+        
+        def reiniciar():
+            self.vista = []
+            self.vista_revisados = 0
+            self.pagina_actual = 0
+            self.seguir_ultima_pagina = True
+            self.resultados_lista.controls = []
+            # Las categorías de la corrida anterior ya no existen: ningún filtro queda aplicado
+            self.filtros = {}
+            self.filtro_nombre.value = ""
+            self.filtro_tipo.options = [ft.dropdown.Option(FILTRO_TODOS)]
+            self.filtro_tipo.value = FILTRO_TODOS
+            self.filtro_rating.value = FILTRO_TODOS
+            self.filtro_telefono.value = False
+            self.filtro_website.value = False
+            self._actualizar_paginador()
+        
+        self.refresco.encolar(reiniciar)
+    
+    def _crear_card_resultado(self, info, indice):
+        """Crea la tarjeta de un resultado"""
         try:
             # Color del borde según tenga teléfono o no
-            border_color = COLORS['success'] if info.get('telefono') != "N/A" else COLORS['primary']
+            tiene_telefono = info.telefono is not None
+            border_color = COLORS['success'] if tiene_telefono else COLORS['primary']
             
-            resultado_card = ft.Container(
+            return ft.Container(
                 content=ft.Column([
                     ft.Row([
                         ft.Icon(
-                            ft.Icons.PLACE if info.get('telefono') != "N/A" else ft.Icons.PLACE_OUTLINED,
+                            ft.Icons.PLACE if tiene_telefono else ft.Icons.PLACE_OUTLINED,
                             color=border_color,
                             size=24
                         ),
@@ -518,7 +1139,7 @@ class GoogleMapsScraperUI:
                             color=border_color
                         ),
                         ft.Text(
-                            info.get('nombre', 'N/A'),
+                            info.nombre or 'N/A',
                             size=16,
                             weight=ft.FontWeight.BOLD,
                             color=COLORS['light'],
@@ -528,12 +1149,12 @@ class GoogleMapsScraperUI:
                     ft.Divider(height=5, color=border_color),
                     ft.Row([
                         ft.Icon(ft.Icons.CATEGORY, size=16, color=COLORS['secondary']),
-                        ft.Text(info.get('tipo', 'N/A'), size=12, color=COLORS['light']),
+                        ft.Text(info.tipo or 'N/A', size=12, color=COLORS['light']),
                     ]),
                     ft.Row([
                         ft.Icon(ft.Icons.LOCATION_ON, size=16, color=COLORS['secondary']),
                         ft.Text(
-                            info.get('direccion', 'N/A'),
+                            info.direccion or 'N/A',
                             size=12,
                             color=COLORS['light'],
                             expand=True,
@@ -542,50 +1163,43 @@ class GoogleMapsScraperUI:
                     ]),
                     ft.Row([
                         ft.Icon(
-                            ft.Icons.PHONE if info.get('telefono') != "N/A" else ft.Icons.PHONE_DISABLED,
+                            ft.Icons.PHONE if tiene_telefono else ft.Icons.PHONE_DISABLED,
                             size=16,
-                            color=COLORS['success'] if info.get('telefono') != "N/A" else COLORS['primary']
+                            color=COLORS['success'] if tiene_telefono else COLORS['primary']
                         ),
                         ft.Text(
-                            info.get('telefono', 'N/A'),
+                            info.telefono or 'N/A',
                             size=12,
-                            color=COLORS['success'] if info.get('telefono') != "N/A" else COLORS['primary'],
+                            color=COLORS['success'] if tiene_telefono else COLORS['primary'],
                             weight=ft.FontWeight.BOLD
                         ),
                     ]),
                     ft.Row([
                         ft.Icon(ft.Icons.STAR, size=16, color=COLORS['warning']),
                         ft.Text(
-                            f"{info.get('rating', 'N/A')} ({info.get('cantidad_reseñas', 'N/A')})",
+                            f"{info.rating:g} ({info.cantidad_reseñas or 0})",
                             size=12,
                             color=COLORS['warning']
                         ),
-                    ]) if info.get('rating') != "N/A" else ft.Container(),
+                    ]) if info.rating is not None else ft.Container(),
                 ], spacing=8),
                 bgcolor=COLORS['dark'],
                 padding=15,
                 border_radius=10,
                 border=ft.border.all(2, border_color),
             )
-            
-            # Agregar resultado directamente
-            self.resultados_lista.controls.append(resultado_card)
-            self._actualizar_progress_ui()
                 
         except Exception as e:
             print(f"Error agregando resultado a UI: {e}")
+            return ft.Container()
 
     def _actualizar_progress_ui(self):
-        """Actualiza la UI del progreso de forma segura"""
-        try:
-            # En Flet, page.update() es seguro desde cualquier hilo
-            self.page.update()
-        except Exception as e:
-            print(f"Error actualizando UI: {e}")
+        """Pide un refresco de la UI; se agrupa con los demás y no bloquea al hilo que llama"""
+        self.refresco.solicitar()
     
     def _iniciar_scraping(self, e):
         """🚀 Inicia el proceso de scraping"""
-        if self.scraping_activo:
+        if self.motor.activo:
             return
         
         # Validar inputs
@@ -593,175 +1207,126 @@ class GoogleMapsScraperUI:
             self._mostrar_alerta("⚠️ Error", "Debes completar la búsqueda y ubicación", COLORS['warning'])
             return
         
+        self._preparar_ejecucion()
+        
+        # Ejecutar en thread separado
+        thread = threading.Thread(target=self._ejecutar_scraping, daemon=True)
+        thread.start()
+    
+    def _reanudar_scraping(self, e):
+        """♻️ Reanuda una búsqueda interrumpida desde su punto de control"""
+        if self.motor.activo:
+            return
+        
+        query = self.query_input.value
+        location = self.location_input.value
+        if not query or not location:
+            self._mostrar_alerta("⚠️ Error", "Debes completar la búsqueda y ubicación", COLORS['warning'])
+            return
+        
+        try:
+            punto_control = PuntoControl.cargar(query, location)
+        except Exception as ex:
+            self._mostrar_alerta("⚠️ Error", f"No se pudo leer el punto de control: {str(ex)}", COLORS['warning'])
+            return
+        
+        if not punto_control or not punto_control.pendientes():
+            self._mostrar_alerta("ℹ️ Nada que reanudar", f"No hay una búsqueda interrumpida de '{query}' en '{location}'", COLORS['info'])
+            return
+        
+        self._preparar_ejecucion()
+        
+        thread = threading.Thread(target=self._ejecutar_scraping, args=(punto_control,), daemon=True)
+        thread.start()
+    
+    def _iniciar_lote(self, e):
+        """📦 Inicia un lote de búsquedas"""
+        if self.motor.activo:
+            return
+        
+        try:
+            trabajos = parsear_lote(self.lote_input.value)
+        except Exception as ex:
+            self._mostrar_alerta("⚠️ Error", f"No se pudo leer el lote: {str(ex)}", COLORS['warning'])
+            return
+        
+        if not trabajos:
+            self._mostrar_alerta("⚠️ Error", "El lote no contiene búsquedas válidas (qué | dónde)", COLORS['warning'])
+            return
+        
+        self._preparar_ejecucion()
+        
+        thread = threading.Thread(target=self._ejecutar_lote, args=(trabajos,), daemon=True)
+        thread.start()
+    
+    def _preparar_ejecucion(self):
+        """Deshabilita los controles y limpia los resultados antes de ejecutar"""
         # Cambiar estado de botones
         self.btn_iniciar.disabled = True
+        self.btn_reanudar.disabled = True
+        self.btn_lote.disabled = True
         self.btn_detener.disabled = False
-        self.scraping_activo = True
+        self.motor.iniciar()
         self._actualizar_progress_ui()
         
         # Limpiar resultados anteriores
-        self.resultados = []
-        self.resultados_lista.controls.clear()
+        self._reiniciar_panel_resultados()
+    
+    def _finalizar_ejecucion(self):
+        """Restaura los controles al terminar una ejecución"""
+        self.motor.activo = False
+        self.btn_iniciar.disabled = False
+        self.btn_reanudar.disabled = False
+        self.btn_lote.disabled = False
+        self.btn_detener.disabled = True
         
-        # Ejecutar en thread separado
-        thread = threading.Thread(target=self._ejecutar_scraping, daemon=True)
-        thread.start()
+        # Con los tiempos de cierre de archivos ya medidos
+        self._actualizar_metricas()
+        self._actualizar_progress_ui()
     
     def _detener_scraping(self, e):
         """🛑 Detiene el scraping"""
-        self.scraping_activo = False
         self._log("🛑 Deteniendo scraping...", COLORS['warning'], "⚠️")
-        
-        if self.driver:
-            try:
-                self.driver.quit()
-            except:
-                pass
+        self.motor.detener()
         
         self.btn_iniciar.disabled = False
+        self.btn_reanudar.disabled = False
+        self.btn_lote.disabled = False
         self.btn_detener.disabled = True
         self._actualizar_progress_ui()
     
-    def _ejecutar_scraping(self):
+    def _leer_configuracion(self):
+        """Lee los parámetros de scraping desde el panel de configuración; un campo vacío toma el valor por defecto"""
+        defecto = CONFIG_POR_DEFECTO
+        return {
+            'max_results': int(self.max_results_input.value or defecto['max_results']),
+            'wait_time': int(self.wait_time_input.value or defecto['wait_time']),
+            'espera_inactiva': float(self.idle_input.value or defecto['espera_inactiva']),
+            'num_workers': max(1, int(self.workers_input.value or defecto['num_workers'])),
+            'pestanas': max(1, int(self.pestanas_input.value or defecto['pestanas'])),
+            'headless': self.headless_switch.value,
+            'red_liviana': self.red_liviana_switch.value,
+            'reutilizar_navegador': self.reutilizar_switch.value,
+            'perfil_navegador': (self.perfil_input.value or "").strip(),
+            'solo_listado': self.solo_listado_switch.value,
+            'completar_telefonos': self.completar_telefonos_switch.value,
+            'cache_horas': float(self.cache_input.value or defecto['cache_horas']),
+            'base_datos': (self.base_datos_input.value or "").strip(),
+            'deduplicar_global': self.deduplicar_switch.value,
+        }
+    
+    def _ejecutar_scraping(self, punto_control=None):
         """Ejecuta el scraping (en thread separado)"""
         try:
-            # Obtener parámetros
-            query = self.query_input.value
-            location = self.location_input.value
-            max_results = int(self.max_results_input.value or 25)
-            wait_time = int(self.wait_time_input.value or 3)
-            headless = self.headless_switch.value
-
-            self._log(f"🚀 Iniciando scraping...", COLORS['success'], "▶️")
-            self._log(f"🔍 Búsqueda: {query}", COLORS['secondary'])
-            self._log(f"📍 Ubicación: {location}", COLORS['secondary'])
-
-            # Configurar navegador
-            self.progress_text.value = "⚙️ Configurando navegador..."
-            self._actualizar_progress_ui()
-            
-            options = webdriver.ChromeOptions()
-            options.add_argument('--start-maximized')
-            options.add_argument('--disable-blink-features=AutomationControlled')
-            
-            if headless:
-                options.add_argument('--headless')
-                self._log("🕶️ Modo invisible activado", COLORS['info'])
-            
-            self.driver = webdriver.Chrome(options=options)
-            self._log("✅ Navegador configurado", COLORS['success'], "✓")
-            
-            # Abrir Google Maps
-            self.progress_text.value = "🌍 Abriendo Google Maps..."
-            self._actualizar_progress_ui()
-            
-            search_query = f"{query} {location}"
-            url = f"https://www.google.com/maps/search/{search_query.replace(' ', '+')}"
-            self.driver.get(url)
-            time.sleep(wait_time + 2)
-            
-            self._log("✅ Google Maps cargado", COLORS['success'], "✓")
-            
-            # Esperar resultados
-            self.progress_text.value = "⏳ Esperando resultados..."
-            self._actualizar_progress_ui()
-            
-            try:
-                WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "div[role='feed']"))
+            self.motor.buscar(
+                self.query_input.value, self.location_input.value,
+                self._leer_configuracion(), punto_control=punto_control
+            )
+            if self.motor.lugares_pendientes:
+                self._log(
+                    f"♻️ Quedan {self.motor.lugares_pendientes} lugares pendientes: usa REANUDAR para continuar",
+                    COLORS['warning'], "⚠️"
                 )
-                self._log("✅ Resultados encontrados", COLORS['success'], "✓")
-            except:
-                self._log("⚠️ Panel de resultados no encontrado", COLORS['warning'], "⚠️")
-            
-            # Scroll
-            self.progress_text.value = "📜 Cargando más resultados..."
-            self._actualizar_progress_ui()
-            
-            try:
-                scrollable_div = self.driver.find_element(By.CSS_SELECTOR, "div[role='feed']")
-                for i in range(6):
-                    if not self.scraping_activo:
-                        break
-                    self.driver.execute_script(
-                        'arguments[0].scrollTop = arguments[0].scrollHeight',
-                        scrollable_div
-                    )
-                    self.progress_bar.value = (i + 1) / 6
-                    self._actualizar_progress_ui()
-                    time.sleep(2)
-                
-                self._log("✅ Scroll completado", COLORS['success'], "✓")
-            except Exception as ex:
-                self._log(f"⚠️ Error en scroll: {str(ex)}", COLORS['warning'], "⚠️")
-            
-            # Buscar lugares
-            self.progress_text.value = "🔎 Buscando lugares..."
-            self._actualizar_progress_ui()
-            
-            lugares = self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/maps/place/']")
-            total_encontrados = len(lugares)
-            
-            if total_encontrados == 0:
-                self._log("❌ No se encontraron resultados", COLORS['primary'], "✗")
-                return
-            
-            self._log(f"✨ Se encontraron {total_encontrados} lugares", COLORS['success'], "★")
-            
-            # Extraer información
-            lugares_a_procesar = min(max_results, total_encontrados)
-            self.progress_text.value = f"📊 Extrayendo {lugares_a_procesar} lugares..."
-            self._actualizar_progress_ui()
-            
-            # Lista para almacenar resultados de esta búsqueda específica
-            resultados_busqueda_actual = []
-            
-            for i, lugar in enumerate(lugares[:max_results]):
-                if not self.scraping_activo:
-                    break
-                
-                try:
-                    # Actualizar progreso
-                    progreso = (i + 1) / lugares_a_procesar
-                    self.progress_bar.value = progreso
-                    self.progress_text.value = f"📊 Extrayendo {i + 1}/{lugares_a_procesar}..."
-                    self._actualizar_progress_ui()
-                    
-                    # Click
-                    self.driver.execute_script("arguments[0].click();", lugar)
-                    time.sleep(wait_time)
-                    
-                    # Esperar carga
-                    try:
-                        WebDriverWait(self.driver, 5).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, "h1.DUwDvf"))
-                        )
-                    except:
-                        continue
-                    
-                    # Extraer info
-                    info = self._extraer_informacion()
-                    self.resultados.append(info)
-                    resultados_busqueda_actual.append(info)
-                    
-                    # Agregar a UI
-                    self._agregar_resultado_ui(info, len(self.resultados))
-                    self._actualizar_stats()
-                    
-                    self._log(f"✓ Extraído: {info.get('nombre', 'N/A')}", COLORS['success'], "•")
-                    
-                except Exception as ex:
-                    self._log(f"✗ Error en lugar {i + 1}: {str(ex)}", COLORS['primary'], "✗")
-                    continue
-            
-            # Guardar resultados automáticamente después de cada búsqueda
-            if resultados_busqueda_actual:
-                self._guardar_resultados_automatico(query, location, resultados_busqueda_actual)
-            
-            # Finalizar
-            self.progress_bar.value = 1.0
-            self.progress_text.value = f"✅ ¡Completado! {len(self.resultados)} resultados"
-            self._log(f"🎉 Scraping completado: {len(self.resultados)} resultados", COLORS['success'], "★")
             
         except Exception as e:
             try:
@@ -770,142 +1335,26 @@ class GoogleMapsScraperUI:
                 print(f"❌ Error crítico: {str(e)}")
         
         finally:
-            if self.driver:
-                try:
-                    self.driver.quit()
-                    try:
-                        self._log("🔒 Navegador cerrado", COLORS['info'], "•")
-                    except:
-                        print("🔒 Navegador cerrado")
-                except:
-                    pass
-            
-            self.scraping_activo = False
-            self.btn_iniciar.disabled = False
-            self.btn_detener.disabled = True
-            
-            self._actualizar_progress_ui()
+            self._finalizar_ejecucion()
     
-    def _extraer_informacion(self):
-        """Extrae información del lugar actual"""
-        info = {}
-        
-        try:
-            info['nombre'] = self.driver.find_element(By.CSS_SELECTOR, "h1.DUwDvf").text
-        except:
-            info['nombre'] = "N/A"
-        
-        try:
-            info['tipo'] = self.driver.find_element(By.CSS_SELECTOR, "button[jsaction*='category']").text
-        except:
-            info['tipo'] = "N/A"
-        
-        try:
-            info['direccion'] = self.driver.find_element(By.CSS_SELECTOR, "button[data-item-id='address']").text
-        except:
-            info['direccion'] = "N/A"
-        
-        try:
-            tel_elem = self.driver.find_element(By.CSS_SELECTOR, "button[data-item-id*='phone']")
-            info['telefono'] = tel_elem.get_attribute('data-item-id').replace('phone:tel:', '')
-            if not info['telefono']:
-                info['telefono'] = tel_elem.text
-        except:
-            info['telefono'] = "N/A"
-        
+    def _ejecutar_lote(self, trabajos):
+        """Ejecuta un lote de búsquedas con un número acotado de búsquedas simultáneas (en thread separado)"""
         try:
-            info['website'] = self.driver.find_element(By.CSS_SELECTOR, "a[data-item-id='authority']").get_attribute('href')
-        except:
-            info['website'] = "N/A"
-        
-        try:
-            info['rating'] = self.driver.find_element(By.CSS_SELECTOR, "span.ceNzKf").text
-        except:
-            info['rating'] = "N/A"
+            busquedas_simultaneas = int(self.lote_workers_input.value or 1)
+            resumen = self.motor.ejecutar_lote(trabajos, self._leer_configuracion(), busquedas_simultaneas)
+            if resumen['interrumpidos']:
+                self._log(
+                    f"♻️ {resumen['interrumpidos']} búsquedas quedaron a medias: "
+                    "cárgalas en la búsqueda y usa REANUDAR para continuar cada una",
+                    COLORS['warning'], "⚠️"
+                )
         
-        try:
-            info['cantidad_reseñas'] = self.driver.find_element(By.CSS_SELECTOR, "span.RDApEe").text
-        except:
-            info['cantidad_reseñas'] = "N/A"
+        except Exception as e:
+            self._log(f"❌ Error crítico en lote: {str(e)}", COLORS['primary'], "✗")
         
-        return info
+        finally:
+            self._finalizar_ejecucion()
     
-    def _guardar_resultados_automatico(self, query, location, resultados_busqueda=None):
-        """💾 Guarda los resultados automáticamente después de cada búsqueda en una carpeta"""
-        if not resultados_busqueda and not self.resultados:
-            return
-        
-        # Usar resultados específicos de la búsqueda o todos los resultados
-        resultados_a_guardar = resultados_busqueda if resultados_busqueda else self.resultados
-        
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Crear nombre de carpeta con la búsqueda del usuario
-        nombre_carpeta = f"{query} en {location}"
-        # Limpiar el nombre de la carpeta para que sea válido en el sistema de archivos
-        nombre_carpeta = "".join(c for c in nombre_carpeta if c.isalnum() or c in (' ', '_', '-', ',')).rstrip()
-        nombre_carpeta = nombre_carpeta.replace("  ", " ").strip()
-        
-        try:
-            # Crear la carpeta si no existe
-            if not os.path.exists(nombre_carpeta):
-                os.makedirs(nombre_carpeta)
-                self._log(f"📁 Carpeta creada: {nombre_carpeta}", COLORS['success'], "✓")
-            
-            con_telefono = [r for r in resultados_a_guardar if r.get('telefono') != "N/A"]
-            
-            # JSON - Uno por cada búsqueda
-            json_file = os.path.join(nombre_carpeta, f"resultados_{timestamp}.json")
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(resultados_a_guardar, f, ensure_ascii=False, indent=2)
-            
-            # CSV completo
-            csv_file = os.path.join(nombre_carpeta, f"resultados_{timestamp}.csv")
-            with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-                if resultados_a_guardar:
-                    writer = csv.DictWriter(f, fieldnames=resultados_a_guardar[0].keys())
-                    writer.writeheader()
-                    writer.writerows(resultados_a_guardar)
-            
-            # CSV con teléfono
-            if con_telefono:
-                csv_tel = os.path.join(nombre_carpeta, f"resultados_CON_TELEFONO_{timestamp}.csv")
-                with open(csv_tel, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=con_telefono[0].keys())
-                    writer.writeheader()
-                    writer.writerows(con_telefono)
-            
-            # TXT Reporte
-            txt_file = os.path.join(nombre_carpeta, f"REPORTE_{timestamp}.txt")
-            with open(txt_file, 'w', encoding='utf-8') as f:
-                f.write("=" * 80 + "\n")
-                f.write(f"🗺️  REPORTE: {query.upper()}\n")
-                f.write(f"📍 UBICACIÓN: {location}\n")
-                f.write(f"📅 FECHA: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write("=" * 80 + "\n\n")
-                f.write(f"Total: {len(resultados_a_guardar)}\n")
-                f.write(f"Con teléfono: {len(con_telefono)}\n\n")
-                f.write("=" * 80 + "\n")
-                f.write("LISTADO COMPLETO\n")
-                f.write("=" * 80 + "\n\n")
-                
-                for i, item in enumerate(resultados_a_guardar, 1):
-                    f.write(f"{i}. {item['nombre']}\n")
-                    f.write(f"   Tipo: {item['tipo']}\n")
-                    f.write(f"   Dirección: {item['direccion']}\n")
-                    f.write(f"   Teléfono: {item['telefono']}\n")
-                    f.write(f"   Website: {item['website']}\n")
-                    f.write(f"   Rating: {item['rating']} ({item['cantidad_reseñas']})\n")
-                    f.write("\n" + "-" * 80 + "\n\n")
-            
-            self._log(f"💾 Guardado automático: {len(resultados_a_guardar)} resultados en '{nombre_carpeta}/'", COLORS['success'], "✓")
-            self._log(f"📄 Archivos guardados: JSON, CSV, TXT", COLORS['success'], "✓")
-            if con_telefono:
-                self._log(f"📞 Archivo con teléfonos: resultados_CON_TELEFONO_{timestamp}.csv", COLORS['success'], "✓")
-            
-        except Exception as ex:
-            self._log(f"❌ Error al guardar automáticamente: {str(ex)}", COLORS['primary'], "✗")
-
     def _guardar_resultados(self, e):
         """💾 Guarda los resultados manualmente"""
         if not self.resultados:
@@ -914,7 +1363,9 @@ class GoogleMapsScraperUI:
         
         query = self.query_input.value
         location = self.location_input.value
-        self._guardar_resultados_automatico(query, location, self.resultados)
+        with self.lock_resultados:
+            resultados = list(self.resultados)
+        self.motor.guardar_resultados(query, location, resultados)
         
         self._mostrar_alerta(
             "✅ Guardado",
@@ -924,16 +1375,16 @@ class GoogleMapsScraperUI:
     
     def _limpiar_todo(self, e):
         """🧹 Limpia todos los resultados"""
-        self.resultados = []
-        self.resultados_lista.controls.clear()
-        self.log_area.controls.clear()
+        self._reiniciar_panel_resultados()
+        self.refresco.encolar(self.log_area.controls.clear)
         self.progress_bar.value = 0
         self.progress_text.value = "Esperando inicio..."
         
         # Reset stats
-        self.stats_container.controls[0].content.controls[2].value = "0"
-        self.stats_container.controls[1].content.controls[2].value = "0"
-        self.stats_container.controls[2].content.controls[2].value = "0"
+        self.motor.ritmo.reiniciar()
+        self._actualizar_ritmo()
+        self.motor.cache.reiniciar_contadores()
+        self._actualizar_stats()
         
         self._log("🧹 Todo limpiado", COLORS['info'], "•")
         self._actualizar_progress_ui()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Scraper de Google Maps por línea de comandos, sin abrir ninguna ventana
+
+Ejemplos:
+    python scraping_cli.py "hoteles" "Caracas, Venezuela" --max-resultados 50 --navegadores 3
+    python scraping_cli.py --lote busquedas.csv --busquedas-simultaneas 2
+    python scraping_cli.py "hoteles" "Caracas, Venezuela" --reanudar
+    python scraping_cli.py --lote busquedas.csv --reanudar
+    python scraping_cli.py --base-datos resultados.db --consultar --ubicacion Córdoba --con-telefono
+"""
+
+import argparse
+import csv
+import sys
+import threading
+
+from lugar import CAMPOS_LUGAR
+from motor_scraping import CONFIG_POR_DEFECTO, MotorScraping, parsear_lote
+from punto_control import PuntoControl
+
+
+def crear_parser():
+    """Argumentos de la línea de comandos; los valores por defecto son los de la app (CONFIG_POR_DEFECTO)"""
+    parser = argparse.ArgumentParser(description="🗺️ Scraper de Google Maps sin interfaz gráfica")
+    parser.add_argument('query', nargs='?', help="Qué buscar (ej: hoteles)")
+    parser.add_argument('location', nargs='?', help="Dónde buscar (ej: 'Caracas, Venezuela')")
+    parser.add_argument('--lote', help="CSV con columnas query,location o texto con líneas 'qué | dónde'")
+    parser.add_argument('--busquedas-simultaneas', type=int, default=1, help="Búsquedas del lote en paralelo")
+    parser.add_argument('--reanudar', action='store_true',
+                        help="Retoma la búsqueda (o cada búsqueda del lote) desde su punto de control")
+    parser.add_argument('--max-resultados', type=int, default=CONFIG_POR_DEFECTO['max_results'])
+    parser.add_argument('--espera', type=int, default=CONFIG_POR_DEFECTO['wait_time'], help="Espera máxima (s)")
+    parser.add_argument('--inactividad', type=float, default=CONFIG_POR_DEFECTO['espera_inactiva'],
+                        help="Segundos sin lugares nuevos para dar el feed por agotado")
+    parser.add_argument('--navegadores', type=int, default=CONFIG_POR_DEFECTO['num_workers'],
+                        help="Navegadores en paralelo por búsqueda")
+    parser.add_argument('--pestanas', type=int, default=CONFIG_POR_DEFECTO['pestanas'],
+                        help="Lugares cargados a la vez en pestañas de cada navegador")
+    parser.add_argument('--visible', action='store_true', default=not CONFIG_POR_DEFECTO['headless'],
+                        help="Muestra el navegador (por defecto es invisible)")
+    parser.add_argument('--red-liviana', action='store_true',
+                        help="No descarga imágenes, fuentes ni el mapa (menos datos por lugar)")
+    parser.add_argument('--perfil', default=CONFIG_POR_DEFECTO['perfil_navegador'],
+                        help="Carpeta de perfil persistente del navegador (cookies y caché entre ejecuciones)")
+    parser.add_argument('--navegador-nuevo', action='store_true',
+                        help="Cierra el navegador después de cada búsqueda en lugar de reutilizarlo")
+    parser.add_argument('--solo-listado', action='store_true', help="Lee solo las tarjetas del feed")
+    parser.add_argument('--completar-telefonos', action=argparse.BooleanOptionalAction,
+                        default=CONFIG_POR_DEFECTO['completar_telefonos'],
+                        help="En modo solo listado, abre los lugares sin teléfono")
+    parser.add_argument('--cache-horas', type=float, default=CONFIG_POR_DEFECTO['cache_horas'],
+                        help="Reutiliza lugares extraídos hace menos de estas horas (0 = sin caché)")
+    parser.add_argument('--omitir-vistos', action='store_true',
+                        help="No abre ni guarda lugares ya extraídos en corridas anteriores")
+    parser.add_argument('--base-datos', default=CONFIG_POR_DEFECTO['base_datos'],
+                        help="Guarda también los lugares en esta base SQLite")
+    parser.add_argument('--url-base', default=CONFIG_POR_DEFECTO['url_base'],
+                        help="Sitio de Maps a scrapear (p. ej. el sitio de prueba de benchmark_scraping.py)")
+
+    consultas = parser.add_argument_group("consultas sobre la base (sin scrapear)")
+    consultas.add_argument('--consultar', action='store_true', help="Lista como CSV los lugares de la base")
+    consultas.add_argument('--ubicacion', help="Solo búsquedas cuya ubicación contenga este texto")
+    consultas.add_argument('--busqueda', help="Solo búsquedas cuyo query contenga este texto")
+    consultas.add_argument('--categoria', help="Solo lugares de esta categoría")
+    consultas.add_argument('--con-telefono', action='store_true', help="Solo lugares con teléfono")
+    consultas.add_argument('--exportar-corrida', type=int, metavar='ID',
+                           help="Vuelve a generar los JSON/CSV/TXT de una corrida desde la base")
+
+    parser.add_argument('--silencioso', action='store_true', help="Muestra solo errores y el resumen")
+    return parser
+
+
+def configuracion_desde_args(args):
+    """Arma el dict de configuración del motor a partir de los argumentos"""
+    return {
+        'max_results': args.max_resultados,
+        'wait_time': args.espera,
+        'espera_inactiva': args.inactividad,
+        'num_workers': max(1, args.navegadores),
+        'pestanas': max(1, args.pestanas),
+        'headless': not args.visible,
+        'red_liviana': args.red_liviana,
+        'reutilizar_navegador': not args.navegador_nuevo,
+        'perfil_navegador': args.perfil,
+        'solo_listado': args.solo_listado,
+        'completar_telefonos': args.completar_telefonos,
+        'cache_horas': args.cache_horas,
+        'base_datos': args.base_datos,
+        'deduplicar_global': args.omitir_vistos,
+        'url_base': args.url_base,
+    }
+
+
+def consultar_base(args):
+    """Responde --consultar y --exportar-corrida leyendo solo la base SQLite"""
+    from almacen_lugares import AlmacenLugares, RUTA_BASE_DATOS
+
+    almacen = AlmacenLugares(args.base_datos or RUTA_BASE_DATOS)
+    try:
+        if args.exportar_corrida is not None:
+            escritor = almacen.exportar(args.exportar_corrida)
+            print(f"💾 Corrida {args.exportar_corrida} exportada en '{escritor.carpeta}/'")
+            return 0
+
+        lugares = almacen.consultar(args.ubicacion, args.busqueda, args.categoria, args.con_telefono)
+        escritor = csv.DictWriter(sys.stdout, fieldnames=CAMPOS_LUGAR)
+        escritor.writeheader()
+        escritor.writerows(lugar.a_dict() for lugar in lugares)
+        print(f"📊 {len(lugares)} lugares", file=sys.stderr)
+        return 0
+    finally:
+        almacen.cerrar()
+
+
+def main(argv=None):
+    """🚀 Punto de entrada; devuelve el código de salida"""
+    parser = crear_parser()
+    args = parser.parse_args(argv)
+
+    if args.consultar or args.exportar_corrida is not None:
+        return consultar_base(args)
+
+    if args.lote:
+        trabajos = parsear_lote(args.lote)
+        if not trabajos:
+            parser.error("el lote no contiene búsquedas válidas (qué | dónde)")
+    elif not args.query or not args.location:
+        parser.error("indica qué y dónde buscar, o un --lote")
+
+    punto_control = None
+    if args.reanudar and not args.lote:
+        punto_control = PuntoControl.cargar(args.query, args.location)
+        if not punto_control or not punto_control.pendientes():
+            print(f"ℹ️ No hay una búsqueda interrumpida de '{args.query}' en '{args.location}'")
+            return 0
+
+    def al_log(mensaje, nivel, icono):
+        if args.silencioso and nivel != 'error':
+            return
+        print(f"{icono} {mensaje}", file=sys.stderr if nivel == 'error' else sys.stdout, flush=True)
+
+    motor = MotorScraping(al_log=al_log)
+    config = configuracion_desde_args(args)
+    estado = {'error': None, 'interrumpidos': 0}
+
+    def ejecutar():
+        try:
+            if args.lote:
+                resumen = motor.ejecutar_lote(trabajos, config, args.busquedas_simultaneas, reanudar=args.reanudar)
+                estado['interrumpidos'] = resumen['interrumpidos']
+                if resumen['fallidos']:
+                    estado['error'] = f"{resumen['fallidos']} búsquedas fallidas"
+            else:
+                motor.buscar(args.query, args.location, config, punto_control=punto_control)
+        except Exception as e:
+            estado['error'] = str(e)
+
+    # El motor corre en un hilo aparte para que Ctrl+C lo detenga ordenadamente
+    motor.iniciar()
+    hilo = threading.Thread(target=ejecutar, daemon=True)
+    hilo.start()
+    try:
+        while hilo.is_alive():
+            hilo.join(0.5)
+    except KeyboardInterrupt:
+        print("🛑 Deteniendo scraping...", flush=True)
+        motor.detener()
+        hilo.join()
+    finally:
+        motor.cerrar()
+
+    stats = motor.estadisticas
+    ritmo = motor.ritmo.resumen()['promedio']
+    print(f"📊 Total: {stats.total} • Con teléfono: {stats.con_telefono} • "
+          f"Fallidos: {stats.fallidos} • Omitidos: {stats.omitidos}"
+          + (f" • {ritmo:.1f} lugares/min" if ritmo else ""))
+    if motor.lugares_pendientes:
+        print(f"♻️ Quedan {motor.lugares_pendientes} lugares pendientes: repite el comando con --reanudar para continuar")
+    if estado['interrumpidos']:
+        print(f"♻️ {estado['interrumpidos']} búsquedas quedaron a medias: repite el lote con --reanudar para continuar")
+
+    if estado['error']:
+        print(f"❌ Error crítico: {estado['error']}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
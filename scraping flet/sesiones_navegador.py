@@ -0,0 +1,214 @@
+"""
+Sesiones de navegador reutilizables entre búsquedas
+"""
+
+import os
+import threading
+
+# Lugares que visita un navegador antes de cerrarlo y abrir uno nuevo
+LUGARES_POR_SESION = 300
+
+# Memoria residente de todo Chrome (todos sus procesos) a partir de la cual se recicla el navegador (MB)
+MEMORIA_MAXIMA_MB = 2048
+
+
+def _arbol_procesos_proc(pid):
+    """Pids del proceso y sus descendientes leyendo /proc (Linux), o None si no se puede"""
+    if not os.path.isdir(f'/proc/{pid}'):
+        return None
+    hijos = {}
+    for entrada in os.listdir('/proc'):
+        if not entrada.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entrada}/stat', 'r') as f:
+                # El nombre va entre paréntesis y puede tener espacios: el ppid es el 2.º campo tras él
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        hijos.setdefault(ppid, []).append(int(entrada))
+    pids = [pid]
+    for actual in pids:
+        pids.extend(hijos.get(actual, []))
+    return pids
+
+
+def memoria_arbol_mb(pid):
+    """Memoria residente sumada de un proceso y todos sus descendientes (MB), o None si no se puede medir.
+
+    Usa psutil si está instalado y, si no, /proc en Linux.
+    """
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    if psutil is not None:
+        try:
+            proceso = psutil.Process(pid)
+            procesos = [proceso] + proceso.children(recursive=True)
+        except psutil.Error:
+            return None
+        total = 0
+        for proceso in procesos:
+            try:
+                total += proceso.memory_info().rss
+            except psutil.Error:
+                pass
+        return total / (1024 * 1024)
+
+    pids = _arbol_procesos_proc(pid)
+    if pids is None:
+        return None
+    pagina = os.sysconf('SC_PAGE_SIZE')
+    total = 0
+    for actual in pids:
+        try:
+            with open(f'/proc/{actual}/statm', 'r') as f:
+                total += int(f.read().split()[1]) * pagina
+        except (OSError, IndexError, ValueError):
+            pass
+    return total / (1024 * 1024)
+
+
+class GestorSesiones:
+    """Mantiene navegadores abiertos entre búsquedas para no pagar el arranque de Chrome cada vez.
+
+    `crear(config, directorio_perfil)` abre un navegador nuevo. Los navegadores libres se
+    verifican antes de entregarlos y se reciclan al superar `lugares_por_sesion` lugares
+    o `memoria_maxima_mb` de memoria residente entre chromedriver, Chrome y sus procesos
+    hijos (donde no se puede medir, solo cuenta el límite de lugares). Con un perfil persistente, cada navegador usa su propia
+    subcarpeta (Chrome no comparte un perfil entre procesos) y las cookies y la caché
+    sobreviven entre ejecuciones.
+    """
+
+    def __init__(self, crear, lugares_por_sesion=LUGARES_POR_SESION, memoria_maxima_mb=MEMORIA_MAXIMA_MB):
+        self._crear = crear
+        self.lugares_por_sesion = lugares_por_sesion
+        self.memoria_maxima_mb = memoria_maxima_mb
+        self._lock = threading.Lock()
+        self._libres = []
+        self._sesiones = {}
+        self._reservadas = set()
+        self.creados = 0
+        self.reutilizados = 0
+
+    @staticmethod
+    def _clave(config):
+        """Opciones que exigen un navegador distinto si cambian"""
+        return (config['headless'], config.get('red_liviana', False), config.get('perfil_navegador') or None)
+
+    def obtener(self, config):
+        """Devuelve un navegador sano con las opciones de `config`, reutilizando uno libre si hay"""
+        clave = self._clave(config)
+        descartados = []
+        driver = None
+
+        with self._lock:
+            while self._libres:
+                candidato = self._libres.pop()
+                if self._sesiones[candidato]['clave'] == clave:
+                    driver = candidato
+                    break
+                # Con otras opciones ya no sirve: se cierra para no acumular navegadores
+                descartados.append(candidato)
+
+        for candidato in descartados:
+            self.descartar(candidato)
+
+        while driver is not None:
+            if self._esta_sano(driver):
+                self.reutilizados += 1
+                return driver
+            self.descartar(driver)
+            with self._lock:
+                driver = next((d for d in self._libres if self._sesiones[d]['clave'] == clave), None)
+                if driver is not None:
+                    self._libres.remove(driver)
+
+        return self._abrir(config, clave)
+
+    def _abrir(self, config, clave):
+        with self._lock:
+            ocupadas = {sesion['ranura'] for sesion in self._sesiones.values() if sesion['clave'] == clave}
+            ocupadas |= {ranura for otra, ranura in self._reservadas if otra == clave}
+            ranura = 0
+            while ranura in ocupadas:
+                ranura += 1
+            # La ranura queda reservada mientras Chrome arranca
+            self._reservadas.add((clave, ranura))
+
+        directorio_perfil = None
+        if config.get('perfil_navegador'):
+            directorio_perfil = os.path.abspath(os.path.join(config['perfil_navegador'], f"sesion_{ranura}"))
+
+        try:
+            driver = self._crear(config, directorio_perfil)
+            with self._lock:
+                self._sesiones[driver] = {'clave': clave, 'ranura': ranura, 'lugares': 0}
+                self.creados += 1
+        finally:
+            with self._lock:
+                self._reservadas.discard((clave, ranura))
+        return driver
+
+    def devolver(self, driver, lugares=0):
+        """Deja el navegador libre para la próxima búsqueda, o lo cierra si ya cumplió su ciclo"""
+        with self._lock:
+            sesion = self._sesiones.get(driver)
+            if sesion is None:
+                return
+            sesion['lugares'] += lugares
+            agotado = sesion['lugares'] >= self.lugares_por_sesion
+
+        memoria = self._memoria_mb(driver)
+        if agotado or (memoria is not None and memoria >= self.memoria_maxima_mb):
+            self.descartar(driver)
+            return
+
+        with self._lock:
+            self._libres.append(driver)
+
+    def descartar(self, driver):
+        """Cierra un navegador y lo olvida"""
+        with self._lock:
+            self._sesiones.pop(driver, None)
+            if driver in self._libres:
+                self._libres.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def cerrar_todo(self):
+        """Cierra todos los navegadores, libres o en uso"""
+        with self._lock:
+            drivers = list(self._sesiones)
+        for driver in drivers:
+            self.descartar(driver)
+
+    @property
+    def libres(self):
+        return len(self._libres)
+
+    def memoria_total_mb(self):
+        """Memoria residente sumada de todos los navegadores abiertos (MB), sin contar los que no se pueden medir"""
+        with self._lock:
+            drivers = list(self._sesiones)
+        medidas = [self._memoria_mb(driver) for driver in drivers]
+        return sum(memoria for memoria in medidas if memoria is not None)
+
+    def _esta_sano(self, driver):
+        """Un navegador sigue sirviendo si responde y tiene al menos una pestaña"""
+        try:
+            return bool(driver.window_handles) and driver.execute_script("return 1;") == 1
+        except Exception:
+            return False
+
+    def _memoria_mb(self, driver):
+        """Memoria del chromedriver de este navegador y todo lo que lanzó (Chrome y sus procesos)"""
+        try:
+            pid = driver.service.process.pid
+        except AttributeError:
+            return None
+        return memoria_arbol_mb(pid)
@@ -0,0 +1,257 @@
+"""
+Sitio local que imita el HTML de Google Maps, para medir el scraper sin salir a internet
+
+Sirve una búsqueda con su feed paginado por scroll y una página de detalle por lugar,
+con los mismos selectores que lee el motor y una latencia artificial configurable.
+"""
+
+import html
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote_plus, unquote_plus, urlsplit
+
+from lugar import Lugar
+
+# Lugares que agrega el feed cada vez que se llega al final del scroll
+LUGARES_POR_TANDA = 20
+
+TIPOS_SINTETICOS = ["Restaurante", "Hotel", "Cafetería", "Farmacia", "Panadería", "Gimnasio"]
+CALLES_SINTETICAS = ["Av. Principal", "Calle Real", "Av. Libertador", "Calle Sucre", "Av. Bolívar"]
+
+# Glifo del ícono que Maps antepone al texto de sus botones (carácter de uso privado)
+ICONO = "\ue0c8"
+
+PAGINA_BUSQUEDA = """<!DOCTYPE html>
+<html lang="es"><head><meta charset="utf-8"><title>{titulo} - Google Maps</title>
+<style>
+div[role='feed'] {{ height: 600px; overflow-y: auto; }}
+div.Nv2PK {{ min-height: 110px; border-bottom: 1px solid #ddd; }}
+</style></head>
+<body>
+<div role="feed" aria-label="Resultados de {titulo}">{tarjetas}</div>
+<script>
+const feed = document.querySelector("div[role='feed']");
+let cargando = false;
+feed.addEventListener('scroll', async () => {{
+    if (cargando || feed.querySelector('span.HlvSq')) {{
+        return;
+    }}
+    if (feed.scrollTop + feed.clientHeight < feed.scrollHeight - 10) {{
+        return;
+    }}
+    cargando = true;
+    const desde = feed.querySelectorAll("a[href*='/maps/place/']").length;
+    const respuesta = await fetch('/maps/feed?desde=' + desde);
+    feed.insertAdjacentHTML('beforeend', await respuesta.text());
+    cargando = false;
+}});
+</script>
+</body></html>
+"""
+
+TARJETA = """
+<div class="Nv2PK">
+  <a href="{url}" aria-label="{nombre}"></a>
+  <div class="qBF1Pd">{nombre}</div>
+  <div class="W4Efsd"><span class="MW4etd">{rating}</span><span class="UY7F9">({resenas})</span>
+    <div class="W4Efsd">{tipo} · $$ · {direccion}</div>
+  </div>
+  {telefono}
+  {website}
+</div>"""
+
+FIN_DEL_FEED = '<span class="HlvSq">Llegaste al final de la lista.</span>'
+
+PAGINA_LUGAR = """<!DOCTYPE html>
+<html lang="es"><head><meta charset="utf-8"><title>{nombre} - Google Maps</title></head>
+<body><div role="main">
+  <h1 class="DUwDvf">{nombre}</h1>
+  <div class="F7nice"><span class="ceNzKf">{rating}</span> <span class="RDApEe">({resenas})</span></div>
+  <button jsaction="pane.rating.category">{tipo}</button>
+  <button data-item-id="address"><span>{icono}</span>
+{direccion}</button>
+  {telefono}
+  {website}
+</div></body></html>
+"""
+
+
+def lugares_sinteticos(cantidad, semilla=0):
+    """Lugares inventados pero verosímiles, siempre los mismos para la misma semilla"""
+    azar = random.Random(semilla)
+    lugares = []
+    for numero in range(1, cantidad + 1):
+        tipo = TIPOS_SINTETICOS[numero % len(TIPOS_SINTETICOS)]
+        lugares.append(Lugar(
+            nombre=f"{tipo} de prueba {numero}",
+            tipo=tipo,
+            direccion=f"{azar.choice(CALLES_SINTETICAS)} {azar.randint(1, 999)}, Ciudad de prueba",
+            # Un tercio sin teléfono y la mitad sin web, como en una búsqueda real
+            telefono=f"+58212{azar.randint(1000000, 9999999)}" if numero % 3 else None,
+            website=f"https://lugar{numero}.example.com/" if numero % 2 else None,
+            rating=round(azar.uniform(3.0, 5.0), 1),
+            cantidad_reseñas=azar.randint(1, 5000),
+        ))
+    return lugares
+
+
+def id_maps(numero):
+    """Identificador con la forma de los de Maps para que la caché y la deduplicación lo reconozcan"""
+    return f"0x{numero:016x}:0x{(numero * 2654435761) % 2 ** 64:016x}"
+
+
+def _numero(valor):
+    """Rating y reseñas con el formato es-AR que muestra Maps: '4,5' y '1.234'"""
+    if isinstance(valor, float):
+        return f"{valor:.1f}".replace('.', ',')
+    return f"{valor:,}".replace(',', '.')
+
+
+class SitioPrueba:
+    """Servidor HTTP en un hilo aparte con una búsqueda de Maps simulada.
+
+    - /maps/search/<texto>: feed con la primera tanda de tarjetas; al hacer scroll
+      hasta el final pide la siguiente a /maps/feed y marca el fin de la lista.
+    - /maps/place/<nombre>/data=!...!1s<id>!...: panel de detalle del lugar.
+
+    Cada respuesta se demora `latencia` segundos, ± `variacion` (fracción de la latencia).
+    Los lugares pueden ser sintéticos o grabados de una corrida real (`desde_json`).
+    Se usa como context manager o con `iniciar` y `detener`.
+    """
+
+    def __init__(self, lugares=None, latencia=0.0, variacion=0.0, lugares_por_tanda=LUGARES_POR_TANDA, puerto=0):
+        self.lugares = lugares if lugares is not None else lugares_sinteticos(100)
+        self.latencia = latencia
+        self.variacion = variacion
+        self.lugares_por_tanda = lugares_por_tanda
+        self.puerto = puerto
+        self.peticiones = 0
+        self._por_id = {id_maps(numero): lugar for numero, lugar in enumerate(self.lugares, 1)}
+        self._servidor = None
+        self._hilo = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def desde_json(cls, ruta, **opciones):
+        """Sitio con los lugares grabados en el JSON de una corrida anterior"""
+        with open(ruta, 'r', encoding='utf-8') as f:
+            return cls([Lugar.desde_dict(datos) for datos in json.load(f)], **opciones)
+
+    @property
+    def url_base(self):
+        """Valor de `url_base` para la configuración del motor"""
+        return f"http://127.0.0.1:{self.puerto}/maps"
+
+    def iniciar(self):
+        """Levanta el servidor; con puerto 0 el sistema elige uno libre"""
+        sitio = self
+
+        class Manejador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                sitio._responder(self)
+
+            def log_message(self, formato, *args):
+                pass
+
+        self._servidor = ThreadingHTTPServer(("127.0.0.1", self.puerto), Manejador)
+        self._servidor.daemon_threads = True
+        self.puerto = self._servidor.server_address[1]
+        self._hilo = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._hilo.start()
+        return self
+
+    def detener(self):
+        """Apaga el servidor y libera el puerto"""
+        if self._servidor:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+            self._servidor = None
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *excepcion):
+        self.detener()
+
+    def _esperar(self):
+        with self._lock:
+            self.peticiones += 1
+        if self.latencia > 0:
+            demora = self.latencia * (1 + random.uniform(-self.variacion, self.variacion))
+            time.sleep(max(demora, 0))
+
+    def _responder(self, peticion):
+        self._esperar()
+        partes = urlsplit(peticion.path)
+
+        if partes.path.startswith('/maps/search/'):
+            titulo = html.escape(unquote_plus(partes.path[len("/maps/search/"):]))
+            cuerpo = PAGINA_BUSQUEDA.format(titulo=titulo, tarjetas=self._tanda(0))
+        elif partes.path == '/maps/feed':
+            desde = int(parse_qs(partes.query).get('desde', ['0'])[0])
+            cuerpo = self._tanda(desde)
+        elif partes.path.startswith('/maps/place/'):
+            coincidencia = re.search(r'!1s([^!]+)', partes.path)
+            lugar = self._por_id.get(coincidencia.group(1)) if coincidencia else None
+            if lugar is None:
+                peticion.send_error(404)
+                return
+            cuerpo = self._pagina_lugar(lugar)
+        else:
+            peticion.send_error(404)
+            return
+
+        datos = cuerpo.encode('utf-8')
+        peticion.send_response(200)
+        peticion.send_header('Content-Type', 'text/html; charset=utf-8')
+        peticion.send_header('Content-Length', str(len(datos)))
+        peticion.end_headers()
+        peticion.wfile.write(datos)
+
+    def _url_lugar(self, numero, lugar):
+        return f"/maps/place/{quote_plus(lugar.nombre or str(numero))}/data=!4m7!3m6!1s{id_maps(numero)}!8m2"
+
+    def _tanda(self, desde):
+        """HTML de las tarjetas a partir de la posición `desde`, con la marca de fin si no hay más"""
+        hasta = min(desde + self.lugares_por_tanda, len(self.lugares))
+        tarjetas = []
+        for numero in range(desde + 1, hasta + 1):
+            lugar = self.lugares[numero - 1]
+            tarjetas.append(TARJETA.format(
+                url=self._url_lugar(numero, lugar),
+                nombre=html.escape(lugar.nombre or ""),
+                rating=_numero(lugar.rating) if lugar.rating is not None else "",
+                resenas=_numero(lugar.cantidad_reseñas or 0),
+                tipo=html.escape(lugar.tipo or ""),
+                direccion=html.escape(lugar.direccion or ""),
+                telefono=f'<span class="UsdlK">{html.escape(lugar.telefono)}</span>' if lugar.telefono else "",
+                website=f'<a class="lcr4fd" href="{html.escape(lugar.website)}">Sitio web</a>' if lugar.website else "",
+            ))
+        if hasta >= len(self.lugares):
+            tarjetas.append(FIN_DEL_FEED)
+        return "".join(tarjetas)
+
+    def _pagina_lugar(self, lugar):
+        telefono = ""
+        if lugar.telefono:
+            telefono = (
+                f'<button data-item-id="phone:tel:{html.escape(lugar.telefono)}">'
+                f'<span>{ICONO}</span>\n{html.escape(lugar.telefono)}</button>'
+            )
+        website = ""
+        if lugar.website:
+            website = f'<a data-item-id="authority" href="{html.escape(lugar.website)}">{html.escape(lugar.website)}</a>'
+        return PAGINA_LUGAR.format(
+            nombre=html.escape(lugar.nombre or ""),
+            rating=_numero(lugar.rating) if lugar.rating is not None else "",
+            resenas=_numero(lugar.cantidad_reseñas or 0),
+            tipo=html.escape(lugar.tipo or ""),
+            icono=ICONO,
+            direccion=html.escape(lugar.direccion or ""),
+            telefono=telefono,
+            website=website,
+        )
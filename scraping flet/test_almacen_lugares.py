@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Pruebas del almacén SQLite de lugares
+"""
+
+import sqlite3
+
+from almacen_lugares import LUGARES_POR_COMMIT, AlmacenLugares
+from cache_lugares import extraer_id_lugar
+from lugar import Lugar
+
+URL_A = "https://www.google.com/maps/place/A/data=!4m7!3m6!1s0x1:0xa!8m2"
+URL_B = "https://www.google.com/maps/place/B/data=!4m7!3m6!1s0x2:0xb!8m2"
+
+
+def lugar(nombre, telefono=None, rating=4.5):
+    return Lugar(nombre, "Restaurante", "Calle 1", telefono, None, rating, 1234)
+
+
+def test_upsert_y_consultas_entre_corridas(tmp_path):
+    """Un lugar repetido en dos corridas se guarda una vez y conserva los datos más completos"""
+    almacen = AlmacenLugares(str(tmp_path / "resultados.db"))
+
+    primera = almacen.iniciar_corrida("restaurantes", "Córdoba, Argentina", "20250101_000000")
+    almacen.guardar_lugar(primera, lugar("A", "+543510000000"), URL_A)
+    almacen.guardar_lugar(primera, lugar("B"), URL_B)
+    almacen.terminar_corrida(primera)
+
+    segunda = almacen.iniciar_corrida("restaurantes veganos", "Nueva Córdoba, Córdoba", "20250102_000000")
+    # Sin teléfono esta vez: no debe borrar el que ya se conocía
+    almacen.guardar_lugar(segunda, lugar("A", rating=4.7), URL_A)
+    almacen.terminar_corrida(segunda)
+
+    con_telefono = almacen.consultar(location="Córdoba", con_telefono=True)
+    assert con_telefono == [lugar("A", "+543510000000", rating=4.7)]
+    assert len(almacen.consultar(location="Córdoba")) == 2
+    assert [info.nombre for info in almacen.lugares_de_corrida(segunda)] == ["A"]
+
+    almacen.cerrar()
+
+
+def test_vincular_y_actualizar_confirman_por_tandas(tmp_path):
+    """Los duplicados vinculados o actualizados también se confirman cada LUGARES_POR_COMMIT escrituras"""
+    ruta = str(tmp_path / "resultados.db")
+    almacen = AlmacenLugares(ruta)
+
+    primera = almacen.iniciar_corrida("restaurantes", "Córdoba, Argentina", "20250101_000000")
+    almacen.guardar_lugar(primera, lugar("A"), URL_A)
+    almacen.terminar_corrida(primera)
+
+    segunda = almacen.iniciar_corrida("restaurantes", "Córdoba, Argentina", "20250102_000000")
+    almacen.vincular_lugar(segunda, extraer_id_lugar(URL_A))
+    for _ in range(LUGARES_POR_COMMIT - 1):
+        almacen.actualizar_lugar(extraer_id_lugar(URL_A), lugar("A", rating=4.9))
+
+    # Otra conexión ve lo escrito antes de terminar la corrida
+    otra = sqlite3.connect(ruta)
+    assert otra.execute("SELECT rating FROM lugares").fetchall() == [(4.9,)]
+    assert otra.execute("SELECT COUNT(*) FROM corrida_lugares WHERE corrida_id = ?", (segunda,)).fetchone() == (1,)
+    otra.close()
+
+    almacen.terminar_corrida(segunda)
+    almacen.cerrar()
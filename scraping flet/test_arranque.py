@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Pruebas del tiempo de arranque: el motor y la línea de comandos cargan sin Selenium ni Flet
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+# Tiempo máximo para importar el motor y la línea de comandos en un intérprete nuevo (segundos)
+TIEMPO_ARRANQUE_MAXIMO = 0.5
+
+MEDIR_ARRANQUE = """
+import json, sys, time
+inicio = time.perf_counter()
+import motor_scraping, scraping_cli
+segundos = time.perf_counter() - inicio
+pesados = sorted({m.split('.')[0] for m in sys.modules} & {'selenium', 'flet', 'concurrent'})
+print(json.dumps({'segundos': segundos, 'pesados': pesados}))
+"""
+
+
+def test_arranque_rapido_sin_modulos_pesados():
+    """Importar el motor no carga Selenium, Flet ni el pool de hilos y queda bajo el objetivo"""
+    salida = subprocess.run(
+        [sys.executable, "-c", MEDIR_ARRANQUE],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True,
+    )
+    medicion = json.loads(salida.stdout)
+
+    assert medicion['pesados'] == []
+    assert medicion['segundos'] < TIEMPO_ARRANQUE_MAXIMO
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la caché persistente de lugares
+"""
+
+import time
+
+from cache_lugares import CacheLugares, extraer_id_lugar
+
+URL_LUGAR = (
+    "https://www.google.com/maps/place/Hotel+Tamanaco/data=!4m7!3m6"
+    "!1s0x8c2a58e3a4a0b0b1:0x6d1f3a2b4c5d6e7f!8m2!3d10.48!4d-66.85?authuser=0&hl=es"
+)
+
+
+def test_extraer_id_lugar():
+    """El identificador sale del segmento data; sin él se usa la URL sin parámetros"""
+    assert extraer_id_lugar(URL_LUGAR) == "0x8c2a58e3a4a0b0b1:0x6d1f3a2b4c5d6e7f"
+    assert extraer_id_lugar("https://www.google.com/maps/place/Foo/?hl=es") == "https://www.google.com/maps/place/Foo"
+
+
+def test_cache_ttl_y_persistencia(tmp_path):
+    """Los lugares vigentes se sirven desde disco y los vencidos cuentan como fallo"""
+    ruta = str(tmp_path / "cache.json")
+    cache = CacheLugares(ruta, ttl_horas=1)
+    cache.guardar("a", {'nombre': "Lugar A"})
+    cache.persistir()
+
+    recargada = CacheLugares(ruta, ttl_horas=1)
+    assert recargada.obtener("a") == {'nombre': "Lugar A"}
+    assert recargada.obtener("b") is None
+    assert (recargada.aciertos, recargada.fallos) == (1, 1)
+
+    recargada._entradas["a"]['ts'] = time.time() - 7200
+    assert recargada.obtener("a") is None
+
+
+def test_cache_limite_de_entradas(tmp_path):
+    """Al superar el tamaño máximo se descartan las entradas más antiguas"""
+    cache = CacheLugares(str(tmp_path / "cache.json"), max_entradas=2)
+    for id_lugar in ("a", "b", "c"):
+        cache.guardar(id_lugar, {'nombre': id_lugar})
+        time.sleep(0.01)
+    cache.purgar()
+
+    assert cache.obtener("a") is None
+    assert cache.obtener("c") == {'nombre': "c"}
+
+
+def test_ttl_corto_no_borra_entradas_de_disco(tmp_path):
+    """Una corrida con TTL corto no sirve lo viejo, pero tampoco lo borra para las siguientes"""
+    ruta = str(tmp_path / "cache.json")
+    cache = CacheLugares(ruta, ttl_horas=1)
+    cache.guardar("semana", {'nombre': "De hace días"})
+    cache.guardar("trimestre", {'nombre': "De hace meses"})
+    cache._entradas["semana"]['ts'] = time.time() - 3 * 24 * 3600
+    cache._entradas["trimestre"]['ts'] = time.time() - 100 * 24 * 3600
+    assert cache.obtener("semana") is None
+    cache.persistir()
+
+    semanal = CacheLugares(ruta, ttl_horas=168)
+    assert semanal.obtener("semana") == {'nombre': "De hace días"}
+    # Lo que supera la edad máxima sí se borra del disco
+    assert list(semanal._entradas) == ["semana"]
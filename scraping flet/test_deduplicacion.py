@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Pruebas del índice de deduplicación de lugares
+"""
+
+from deduplicacion import IndiceDeduplicacion, normalizar_texto
+from lugar import Lugar
+
+URL_A = "https://www.google.com/maps/place/A/data=!4m7!3m6!1s0x1:0xa!8m2"
+URL_A2 = "https://www.google.com/maps/place/A/data=!4m7!3m6!1s0x1:0xa!8m2?hl=es"
+URL_B = "https://www.google.com/maps/place/B/data=!4m7!3m6!1s0x2:0xb!8m2"
+
+
+def lugar(nombre, telefono=None, direccion="Av. Colón 1234", website=None):
+    return Lugar.desde_dict({
+        'nombre': nombre, 'tipo': "Restaurante", 'direccion': direccion, 'telefono': telefono,
+        'website': website, 'rating': "4,5", 'cantidad_reseñas': "(10)",
+    })
+
+
+def test_claves_y_fusion(tmp_path):
+    """Se reconoce el mismo lugar por ID, teléfono o nombre + dirección y se fusionan sus datos"""
+    ruta = str(tmp_path / "indice.json")
+    indice = IndiceDeduplicacion(ruta)
+
+    canonica, nuevo = indice.registrar(lugar("Café Colón", "+54 351 422-0000"), URL_A)
+    assert nuevo and indice.ya_visto(URL_A2)
+
+    # Mismo teléfono con otro formato y sin URL: es el mismo lugar y aporta el website
+    assert indice.registrar(lugar("Cafe Colon", "+543514220000", website="cafe.com")) == (canonica, False)
+    fusionado = indice.registro(canonica)
+    assert (fusionado.nombre, fusionado.website) == ("Cafe Colon", "cafe.com")
+
+    # Mismo nombre y dirección salvo acentos y mayúsculas
+    assert indice.registrar(lugar("CAFÉ COLÓN", direccion="av colon 1234")) == (canonica, False)
+
+    # Otro ID de Maps con el mismo teléfono es otra sucursal
+    assert indice.registrar(lugar("Café Colón II", "+54 351 422-0000"), URL_B)[1]
+
+    indice.persistir()
+    assert IndiceDeduplicacion(ruta).ya_visto(URL_B)
+    assert normalizar_texto("  Av. Colón, 1234 ") == "av colon 1234"
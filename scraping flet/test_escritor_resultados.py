@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Pruebas del escritor incremental de resultados
+"""
+
+import json
+
+from escritor_resultados import EscritorIncremental
+from lugar import Lugar
+
+
+def lugar(nombre, telefono=None):
+    return Lugar(nombre, "Hotel", "Calle 1", telefono, None, 4.5, 10)
+
+
+def test_escritura_incremental(tmp_path, monkeypatch):
+    """Cada lugar queda en disco al agregarse y al cerrar se generan JSON y TXT"""
+    monkeypatch.chdir(tmp_path)
+    escritor = EscritorIncremental("hoteles", "Caracas, Venezuela", "20250101_000000", registros_por_sync=1)
+    escritor.agregar(lugar("Hotel A", "+582129097111"))
+    escritor.agregar(lugar("Hotel B"))
+
+    # Antes de cerrar, el JSONL y los CSV ya tienen lo extraído
+    with open(escritor.ruta_jsonl, encoding='utf-8') as f:
+        assert [json.loads(linea)['nombre'] for linea in f] == ["Hotel A", "Hotel B"]
+    with open(escritor.ruta_csv_tel, encoding='utf-8') as f:
+        assert len(f.readlines()) == 2
+
+    estadisticas = escritor.cerrar()
+    assert (estadisticas.total, estadisticas.con_telefono) == (2, 1)
+    with open(escritor.ruta_json, encoding='utf-8') as f:
+        # Tipos de JSON reales: números para rating y reseñas, null para lo que falta
+        assert json.load(f) == [lugar("Hotel A", "+582129097111").a_dict(), lugar("Hotel B").a_dict()]
+    with open(escritor.ruta_csv, encoding='utf-8') as f:
+        assert f.readlines()[2].strip() == "Hotel B,Hotel,Calle 1,,,4.5,10"
+    with open(escritor.ruta_txt, encoding='utf-8') as f:
+        reporte = f.read()
+    assert "Con teléfono: 1" in reporte and "Teléfono: N/A" in reporte
+
+
+def test_sin_lugares_no_crea_archivos(tmp_path, monkeypatch):
+    """Una búsqueda sin resultados no deja carpeta"""
+    monkeypatch.chdir(tmp_path)
+    escritor = EscritorIncremental("nada", "Ningún lugar")
+    assert escritor.cerrar() is None
+    assert not (tmp_path / escritor.carpeta).exists()
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Pruebas de las estadísticas incrementales
+"""
+
+from estadisticas import EstadisticasIncrementales
+from lugar import Lugar
+
+
+def test_contadores_incrementales():
+    """Cada lugar suma a los contadores sin recorrer los anteriores"""
+    stats = EstadisticasIncrementales()
+    stats.registrar(Lugar(tipo="Hotel", telefono="+58212", rating=4.5))
+    stats.registrar(Lugar(tipo="Hotel", website="hotel.com"))
+    stats.registrar(Lugar(tipo="Posada", rating=3.5))
+    stats.registrar_fallo()
+    stats.registrar_omitidos(2)
+
+    assert (stats.total, stats.con_telefono, stats.sin_telefono, stats.con_website) == (3, 1, 2, 1)
+    assert stats.rating_promedio == 4.0
+    assert stats.tipos_frecuentes(1) == [("Hotel", 2)]
+    assert (stats.fallidos, stats.omitidos) == (1, 2)
+
+    stats.reiniciar()
+    assert stats.total == 0 and stats.rating_promedio is None
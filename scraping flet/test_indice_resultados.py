@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Pruebas del índice de filtrado de resultados
+"""
+
+from indice_resultados import IndiceResultados
+from lugar import Lugar
+
+
+def lugar(nombre, tipo="Hotel", telefono="N/A", website="N/A", rating="N/A"):
+    return Lugar.desde_dict({'nombre': nombre, 'tipo': tipo, 'telefono': telefono, 'website': website, 'rating': rating})
+
+
+def test_filtros_combinados():
+    """Cada filtro restringe y los resultados vuelven en el orden de llegada"""
+    indice = IndiceResultados()
+    indice.agregar(lugar("Hotel Tamanaco", telefono="+582129097111", rating="4,5"))
+    indice.agregar(lugar("Pizzería Roma", tipo="Pizzería", rating="3.9"))
+    indice.agregar(lugar("Hotel Eurobuilding", website="http://www.hoteleuro.com/", rating=""))
+    indice.agregar(lugar("Meliá Caracas", telefono="+582126283111", website="https://www.melia.com/", rating="4,7"))
+
+    assert indice.filtrar() == [0, 1, 2, 3]
+    assert indice.filtrar(texto="HOTEL") == [0, 2]
+    assert indice.filtrar(tipo="Pizzería") == [1]
+    assert indice.filtrar(con_telefono=True) == [0, 3]
+    assert indice.filtrar(con_telefono=True, con_website=True) == [3]
+    assert indice.filtrar(rating_minimo=4) == [0, 3]
+    assert indice.filtrar(tipo="Hotel", texto="meliá") == [3]
+    assert indice.tipos() == ["Hotel", "Pizzería"]
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Pruebas del registro tipado de lugares
+"""
+
+import pytest
+
+from lugar import Lugar, a_entero, telefono_e164
+
+
+def test_desde_dict_limpia_y_tipa():
+    """Lo leído de la página queda tipado, sin íconos ni saltos de línea y con None para lo que falta"""
+    lugar = Lugar.desde_dict({
+        'nombre': "Hotel Tamanaco ",
+        'tipo': "Hotel",
+        'direccion': "\nAv. Principal de Las Mercedes,\nCaracas 1060",
+        'telefono': "phone:tel:+582129097111",
+        'website': "N/A",
+        'rating': "4,5",
+        'cantidad_reseñas': "(1.234)",
+    })
+
+    assert lugar.a_dict() == {
+        'nombre': "Hotel Tamanaco", 'tipo': "Hotel", 'direccion': "Av. Principal de Las Mercedes, Caracas 1060",
+        'telefono': "+582129097111", 'website': None, 'rating': 4.5, 'cantidad_reseñas': 1234,
+    }
+    # Releer lo exportado da el mismo lugar
+    assert Lugar.desde_dict(lugar.a_dict()) == lugar
+    # Sin dict por instancia
+    with pytest.raises(AttributeError):
+        lugar.otro_campo = 1
+
+
+def test_telefono_e164_y_fusion():
+    """El teléfono con país queda en E.164 y la fusión no pisa con datos vacíos"""
+    assert telefono_e164("+58 212-909.7111") == "+582129097111"
+    assert telefono_e164("0058 212 9097111") == "+582129097111"
+    assert telefono_e164("(0212) 909-7111") == "02129097111"
+    assert telefono_e164("N/A") is None
+
+    tarjeta = Lugar(nombre="Hotel A", tipo="Hotel", rating=4.0)
+    tarjeta.fusionar(Lugar(nombre="Hotel A", telefono="+58212", rating=4.2))
+    assert (tarjeta.tipo, tarjeta.telefono, tarjeta.rating) == ("Hotel", "+58212", 4.2)
+
+
+def test_a_entero_con_cantidades_abreviadas():
+    """Las reseñas abreviadas se expanden en lugar de perder el separador decimal"""
+    assert a_entero("(1.234)") == 1234
+    assert a_entero("(1,2 mil)") == 1200
+    assert a_entero("(2.3K)") == 2300
+    assert a_entero("(15 mil)") == 15000
+    assert a_entero("1,5 M") == 1500000
+    assert a_entero("(1 mill.)") == 1000000
+    assert a_entero("N/A") is None
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Pruebas de las métricas por etapa
+"""
+
+import json
+
+import pytest
+
+from metricas import HistogramaLatencias, MetricasEtapas, formatear_duracion
+
+
+def test_percentiles_aproximados():
+    """Los percentiles salen de las cubetas con un error acotado y sin pasarse del máximo"""
+    histograma = HistogramaLatencias()
+    for milisegundos in range(1, 1001):
+        histograma.registrar(milisegundos / 1000)
+
+    assert histograma.percentil(50) == pytest.approx(0.5, rel=0.1)
+    assert histograma.percentil(95) == pytest.approx(0.95, rel=0.1)
+    assert histograma.percentil(100) == 1.0
+    assert HistogramaLatencias().percentil(50) is None
+
+
+def test_busqueda_suma_a_la_sesion(tmp_path):
+    """Lo que mide una búsqueda se acumula en la sesión y se guarda en orden de etapas"""
+    sesion = MetricasEtapas()
+    busqueda = MetricasEtapas(padre=sesion)
+    busqueda.registrar('guardado', 0.01)
+    busqueda.registrar('navegador', 2.0)
+    with pytest.raises(ValueError):
+        with busqueda.medir('extraccion'):
+            raise ValueError("la etapa falló igual")
+    sesion.registrar('navegador', 1.0)
+
+    assert list(busqueda.resumen()) == ['navegador', 'extraccion', 'guardado']
+    assert sesion.resumen()['navegador']['eventos'] == 2
+
+    ruta = tmp_path / "METRICAS.json"
+    busqueda.guardar(str(ruta), query="hoteles", lugares=1)
+    guardado = json.loads(ruta.read_text(encoding='utf-8'))
+    assert guardado['query'] == "hoteles" and guardado['etapas']['navegador']['max'] == 2.0
+
+    assert (formatear_duracion(0.85), formatear_duracion(2.44), formatear_duracion(None)) == ("850 ms", "2.4 s", "-")
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Pruebas del motor de scraping sin interfaz gráfica
+"""
+
+import time
+
+import pytest
+
+from escritor_resultados import EscritorIncremental
+from lugar import Lugar
+from motor_scraping import CONFIG_POR_DEFECTO, JS_ESTADO_DETALLE, JS_NAVEGAR, MotorScraping, parsear_lote
+from punto_control import PuntoControl
+
+
+class DriverFalso:
+    """Devuelve siempre las mismas tarjetas del feed, sin abrir ningún navegador"""
+
+    def __init__(self, tarjetas):
+        self.tarjetas = tarjetas
+
+    def execute_script(self, script, *args):
+        return self.tarjetas
+
+
+def test_listado_informa_por_callbacks(tmp_path, monkeypatch):
+    """El motor publica cada lugar por callback, lo escribe en disco y actualiza las estadísticas"""
+    monkeypatch.chdir(tmp_path)
+    recibidos = []
+    motor = MotorScraping(al_resultado=recibidos.append)
+    motor.iniciar()
+
+    tarjetas = [
+        {'url': "https://maps/a", 'nombre': "Hotel A", 'tipo': "Hotel", 'telefono': "+58212", 'rating': "4,5"},
+        {'url': "https://maps/b", 'nombre': "Hotel B", 'tipo': "Hotel"},
+    ]
+    config = {'max_results': 10, 'completar_telefonos': False}
+    escritor = EscritorIncremental("hoteles", "Caracas", "20250101_000000")
+
+    assert motor._extraer_listado(DriverFalso(tarjetas), config, lambda *a: None, escritor) == 2
+    assert [info.nombre for info in recibidos] == ["Hotel A", "Hotel B"]
+    assert recibidos[0].rating == 4.5 and recibidos[1].telefono is None
+    assert (motor.estadisticas.total, motor.estadisticas.con_telefono) == (2, 1)
+
+    assert escritor.cerrar().total == 2
+
+
+def test_listado_detenido_cuenta_omitidos(tmp_path, monkeypatch):
+    """Al detener la lectura del listado, las tarjetas sin procesar quedan como omitidas"""
+    monkeypatch.chdir(tmp_path)
+    motor = MotorScraping(al_resultado=lambda info: motor.detener())
+    motor.iniciar()
+
+    tarjetas = [{'url': f"https://maps/{letra}", 'nombre': f"Hotel {letra}"} for letra in "abcd"]
+    config = {'max_results': 10, 'completar_telefonos': False}
+    escritor = EscritorIncremental("hoteles", "Caracas", "20250101_000000")
+
+    assert motor._extraer_listado(DriverFalso(tarjetas), config, lambda *a: None, escritor) == 1
+    assert motor.estadisticas.omitidos == 3
+    assert escritor.estadisticas.omitidos == 3
+    assert motor.ritmo.pendientes == 0
+    escritor.cerrar()
+
+
+def test_parsear_lote():
+    """Las líneas del lote aceptan '|' o ';' y se ignoran las incompletas"""
+    texto = "hoteles | Caracas, Venezuela\nrestaurantes; Córdoba\nsolo query\n"
+    assert parsear_lote(texto) == [("hoteles", "Caracas, Venezuela"), ("restaurantes", "Córdoba")]
+
+
+class NavegadorConPestanas:
+    """Simula un Chrome con pestañas donde cada lugar tarda algunas consultas en cargar"""
+
+    def __init__(self, consultas_por_carga=3):
+        self.consultas_por_carga = consultas_por_carga
+        self.pestanas = {"principal": {'url': "about:blank", 'faltan': 0}}
+        self.actual = "principal"
+        self.abiertas_a_la_vez = 0
+        self.switch_to = self
+
+    @property
+    def current_window_handle(self):
+        return self.actual
+
+    def window(self, handle):
+        self.actual = handle
+
+    def new_window(self, tipo):
+        self.actual = f"pestaña {len(self.pestanas)}"
+        self.pestanas[self.actual] = {'url': "about:blank", 'faltan': 0}
+
+    def close(self):
+        del self.pestanas[self.actual]
+
+    def execute_cdp_cmd(self, comando, parametros):
+        self.pestanas[self.actual].setdefault('cdp', []).append(comando)
+
+    def execute_script(self, script, *args):
+        pestana = self.pestanas[self.actual]
+        if script == JS_NAVEGAR:
+            pestana.update(url=args[0], faltan=self.consultas_por_carga)
+            cargando = sum(1 for p in self.pestanas.values() if p['faltan'])
+            self.abiertas_a_la_vez = max(self.abiertas_a_la_vez, cargando)
+            return None
+        if pestana['faltan']:
+            pestana['faltan'] -= 1
+            return [None, pestana['url']]
+        nombre = pestana['url'].rsplit('/', 1)[-1] if pestana['url'] != "about:blank" else None
+        if script == JS_ESTADO_DETALLE:
+            return [nombre, pestana['url']]
+        return {'nombre': nombre}
+
+
+def test_pestanas_solapan_cargas_y_mantienen_el_orden(tmp_path, monkeypatch):
+    """Con varias pestañas los lugares cargan a la vez y se publican en el orden del feed"""
+    monkeypatch.chdir(tmp_path)
+    recibidos = []
+    motor = MotorScraping(al_resultado=recibidos.append)
+    motor.iniciar()
+
+    driver = NavegadorConPestanas()
+    urls = [f"https://maps/place/lugar{i}" for i in range(7)]
+    config = dict(CONFIG_POR_DEFECTO, pestanas=3)
+    escritor = EscritorIncremental("bares", "Lima", "20250101_000000")
+
+    motor._extraer_en_paralelo(urls, 1, config, escritor, driver=driver)
+
+    assert [info.nombre for info in recibidos] == [f"lugar{i}" for i in range(7)]
+    assert isinstance(recibidos[0], Lugar) and recibidos[0].telefono is None
+    assert driver.abiertas_a_la_vez == 3
+    # Al terminar el navegador queda con una sola pestaña para reutilizarse
+    assert list(driver.pestanas) == ["principal"]
+    # Cada etapa del lugar quedó medida una vez por lugar
+    etapas = motor.metricas.resumen()
+    assert {etapa: etapas[etapa]['eventos'] for etapa in ('navegacion', 'espera_detalle', 'extraccion', 'guardado')} == {
+        'navegacion': 7, 'espera_detalle': 7, 'extraccion': 7, 'guardado': 7,
+    }
+    # El sparkline tiene una barra por lugar visitado
+    assert len(motor.ritmo.resumen()['sparkline']) == 7
+    # Al devolverlo, el navegador suma solo los lugares que abrió él
+    devueltos = []
+    motor.sesiones.devolver = lambda navegador, lugares: devueltos.append(lugares)
+    motor._liberar_navegador(driver, config, avisar=False)
+    assert devueltos == [7]
+    escritor.cerrar()
+
+
+def test_duplicados_y_omitidos_quedan_en_su_corrida(tmp_path, monkeypatch):
+    """Un lugar repetido u omitido por ya extraído sigue contando como resultado de cada búsqueda en la base"""
+    monkeypatch.chdir(tmp_path)
+    motor = MotorScraping()
+    motor.iniciar()
+    motor._preparar_corrida(dict(CONFIG_POR_DEFECTO, base_datos=str(tmp_path / "resultados.db")))
+
+    url = "https://www.google.com/maps/place/A/data=!4m7!3m6!1s0x1:0xa!8m2"
+    corridas = []
+    for query, location in [("restaurantes", "Córdoba"), ("restaurantes veganos", "Palermo"), ("bares", "Recoleta")]:
+        escritor = EscritorIncremental(query, location, f"2025010{len(corridas) + 1}_000000")
+        escritor.corrida_id = motor.almacen.iniciar_corrida(query, location, escritor.timestamp)
+        corridas.append(escritor.corrida_id)
+        if query == "bares":
+            # El listado omite antes de leerlo el lugar que ya se extrajo
+            assert motor._extraer_listado(DriverFalso([{'url': url, 'nombre': "A"}]), CONFIG_POR_DEFECTO,
+                                          lambda *a: None, escritor) == 0
+        else:
+            motor._publicar_resultado(Lugar(nombre="A", direccion="Calle 1"), escritor, url)
+        escritor.cerrar()
+        motor.almacen.terminar_corrida(escritor.corrida_id)
+
+    assert [info.nombre for info in motor.almacen.consultar(location="Palermo")] == ["A"]
+    assert [len(motor.almacen.lugares_de_corrida(corrida)) for corrida in corridas] == [1, 1, 1]
+    motor.cerrar()
+
+
+def test_lote_reanuda_cada_busqueda_con_punto_de_control(tmp_path, monkeypatch):
+    """Al reanudar un lote, la búsqueda interrumpida retoma su punto de control y la otra empieza de cero"""
+    monkeypatch.chdir(tmp_path)
+    PuntoControl("hoteles", "Caracas", "20250101_000000", ["https://maps/a", "https://maps/b"], ["https://maps/a"]).guardar()
+    motor = MotorScraping()
+    motor.iniciar()
+    recibidos = {}
+
+    def scrapear(query, location, config, reportar_progreso=True, punto_control=None):
+        recibidos[query] = punto_control.pendientes() if punto_control else None
+        return 0
+
+    monkeypatch.setattr(motor, '_scrapear_busqueda', scrapear)
+    motor.ejecutar_lote([("hoteles", "Caracas"), ("bares", "Lima")], CONFIG_POR_DEFECTO, reanudar=True)
+    assert recibidos == {"hoteles": ["https://maps/b"], "bares": None}
+
+
+def test_red_liviana_bloquea_recursos_en_cada_pestana(tmp_path, monkeypatch):
+    """Cada pestaña nueva recibe su propia lista de bloqueo, no solo la primera"""
+    monkeypatch.chdir(tmp_path)
+    motor = MotorScraping()
+    motor.iniciar()
+    driver = NavegadorConPestanas()
+    # La pestaña principal ya se bloqueó al crear el navegador
+    motor._bloquear_recursos(driver)
+    pestanas_abiertas = []
+    cerrar = driver.close
+
+    def cerrar_registrando():
+        pestanas_abiertas.append(driver.pestanas[driver.actual].get('cdp'))
+        cerrar()
+
+    driver.close = cerrar_registrando
+    config = dict(CONFIG_POR_DEFECTO, pestanas=3, red_liviana=True)
+    escritor = EscritorIncremental("bares", "Lima", "20250101_000000")
+
+    motor._extraer_en_paralelo([f"https://maps/place/lugar{i}" for i in range(4)], 1, config, escritor, driver=driver)
+
+    bloqueo = ['Network.enable', 'Network.setBlockedURLs']
+    assert pestanas_abiertas == [bloqueo, bloqueo]
+    assert driver.pestanas["principal"]['cdp'] == bloqueo
+    escritor.cerrar()
+
+
+def motor_sin_navegador(monkeypatch, lugares, logs):
+    """Motor cuyo navegador es un objeto vacío y cada visita devuelve el lugar de la URL"""
+    motor = MotorScraping(al_log=lambda mensaje, nivel, icono: logs.append(mensaje))
+    motor.iniciar()
+    monkeypatch.setattr(motor, '_abrir_navegador', lambda config: object())
+    monkeypatch.setattr(motor, '_abrir_busqueda', lambda *args: None)
+    monkeypatch.setattr(motor, '_recolectar_urls', lambda driver: list(lugares))
+    monkeypatch.setattr(motor, '_visitar_lugar', lambda driver, url, timeout: lugares[url])
+    return motor
+
+
+def test_busqueda_nueva_informa_carpeta_y_reanudar_no_duplica(tmp_path, monkeypatch):
+    """La carpeta nueva se informa aunque el punto de control se guarde antes que el primer lugar,
+    y al reanudar no se vuelven a escribir lugares que ya estaban en el JSONL"""
+    monkeypatch.chdir(tmp_path)
+    lugares = {
+        f"https://maps/place/{letra}": Lugar(nombre=letra.upper(), direccion=f"Calle {letra}")
+        for letra in "abc"
+    }
+    logs = []
+    motor = motor_sin_navegador(monkeypatch, lugares, logs)
+    config = dict(CONFIG_POR_DEFECTO, reutilizar_navegador=False)
+
+    assert motor.buscar("cafés", "Quito", config) == 3
+    assert any(mensaje.startswith("📁 Carpeta creada") for mensaje in logs)
+    assert motor.lugares_pendientes == 0
+
+    # Un corte dejó "b" escrito en el JSONL pero sin marcar en el punto de control
+    escritor = EscritorIncremental("cafés", "Quito", "20250101_000000")
+    urls = list(lugares)
+    PuntoControl("cafés", "Quito", escritor.timestamp, urls, urls[:1]).guardar()
+    escritor.agregar(lugares[urls[0]])
+    escritor.agregar(lugares[urls[1]])
+    escritor.cerrar()
+
+    motor = motor_sin_navegador(monkeypatch, lugares, [])
+    motor.buscar("cafés", "Quito", config, punto_control=PuntoControl.cargar("cafés", "Quito"))
+    assert [lugar.nombre for lugar in escritor.lugares_guardados()] == ["A", "B", "C"]
+    assert PuntoControl.cargar("cafés", "Quito") is None
+
+
+def test_paralelo_publica_en_orden_aunque_falle_un_lugar(tmp_path, monkeypatch):
+    """Con varios navegadores, un lugar que falla no frena ni desordena a los que terminan antes"""
+    monkeypatch.chdir(tmp_path)
+    lugares = {f"https://maps/place/{i}": Lugar(nombre=f"L{i}", direccion=f"Calle {i}") for i in range(8)}
+    motor = motor_sin_navegador(monkeypatch, lugares, [])
+
+    def visitar(driver, url, timeout):
+        # Los últimos lugares terminan primero
+        time.sleep((8 - int(url.rsplit('/', 1)[-1])) * 0.01)
+        if url.endswith("/3"):
+            raise RuntimeError("sin respuesta")
+        return lugares[url]
+
+    monkeypatch.setattr(motor, '_visitar_lugar', visitar)
+    config = dict(CONFIG_POR_DEFECTO, reutilizar_navegador=False)
+    escritor = EscritorIncremental("bares", "Lima", "20250101_000000")
+
+    assert motor._extraer_en_paralelo(list(lugares), 3, config, escritor) == 7
+    escritor.cerrar()
+    assert [lugar.nombre for lugar in escritor.lugares_guardados()] == [f"L{i}" for i in range(8) if i != 3]
+    assert (motor.estadisticas.fallidos, motor.estadisticas.omitidos) == (1, 0)
+
+
+def test_navegador_caido_deja_huecos_como_omitidos(tmp_path, monkeypatch):
+    """Si el navegador muere a mitad de camino se publica lo anterior y el resto cuenta como omitido"""
+    monkeypatch.chdir(tmp_path)
+    motor = MotorScraping()
+    motor.iniciar()
+    extraer = motor._extraer_informacion
+
+    def extraer_o_morir(driver):
+        if driver.pestanas[driver.actual]['url'].endswith("lugar2"):
+            raise RuntimeError("Chrome se cerró")
+        return extraer(driver)
+
+    monkeypatch.setattr(motor, '_extraer_informacion', extraer_o_morir)
+    config = dict(CONFIG_POR_DEFECTO, pestanas=3)
+    escritor = EscritorIncremental("bares", "Lima", "20250101_000000")
+    urls = [f"https://maps/place/lugar{i}" for i in range(7)]
+
+    assert motor._extraer_en_paralelo(urls, 1, config, escritor, driver=NavegadorConPestanas()) == 2
+    escritor.cerrar()
+    assert [lugar.nombre for lugar in escritor.lugares_guardados()] == ["lugar0", "lugar1"]
+    assert motor.estadisticas.omitidos == escritor.estadisticas.omitidos == 5
+
+
+def test_lote_aisla_el_error_de_cada_busqueda(tmp_path, monkeypatch):
+    """Una búsqueda que falla queda contada como fallida y las demás del lote terminan igual"""
+    monkeypatch.chdir(tmp_path)
+    logs = []
+    motor = MotorScraping(al_log=lambda mensaje, nivel, icono: logs.append(mensaje))
+    motor.iniciar()
+
+    def scrapear(query, location, config, reportar_progreso=True, punto_control=None):
+        if query == "bares":
+            raise RuntimeError("Chrome no arrancó")
+        return 2
+
+    monkeypatch.setattr(motor, '_scrapear_busqueda', scrapear)
+    trabajos = [("hoteles", "Caracas"), ("bares", "Lima"), ("cafés", "Quito")]
+    estado = motor.ejecutar_lote(trabajos, CONFIG_POR_DEFECTO, busquedas_simultaneas=2)
+
+    assert estado == {'terminados': 3, 'fallidos': 1, 'interrumpidos': 0, 'lugares': 4}
+    assert any(mensaje.endswith("bares en Lima: Chrome no arrancó") for mensaje in logs)
+
+
+class FeedFalso:
+    """Feed que en cada scroll devuelve el siguiente (lugares cargados, llegó al final); el último se repite"""
+
+    def __init__(self, pasos):
+        self.pasos = list(pasos)
+
+    def find_element(self, por, selector):
+        return "feed"
+
+    def execute_script(self, script, *args):
+        return self.pasos.pop(0) if len(self.pasos) > 1 else self.pasos[0]
+
+
+@pytest.mark.parametrize("pasos, max_results, esperado", [
+    ([(10, False), (20, False), (25, True)], 100, (25, "fin de la lista")),
+    ([(10, False), (20, False)], 100, (20, "sin cambios en 0.3 s")),
+    ([(10, False), (20, False), (30, False)], 25, (30, "objetivo alcanzado")),
+])
+def test_scroll_se_detiene_por_cada_motivo(pasos, max_results, esperado):
+    """El scroll para al ver el final de la lista, al dejar de crecer o al tener los lugares pedidos"""
+    pytest.importorskip("selenium")
+    motor = MotorScraping()
+    motor.iniciar()
+    assert motor._cargar_feed(FeedFalso(pasos), max_results, 0.3, lambda *a: None) == esperado
+
+
+def test_urls_repetidas_se_visitan_una_vez_en_todo_el_lote(tmp_path, monkeypatch):
+    """El feed repetido colapsa por id de lugar y lo extraído en una búsqueda del lote no se reabre en otra"""
+    monkeypatch.chdir(tmp_path)
+    url_a = "https://www.google.com/maps/place/A/data=!4m7!3m6!1s0x1:0xa!8m2"
+    url_b = "https://www.google.com/maps/place/B/data=!4m7!3m6!1s0x2:0xb!8m2"
+    url_c = "https://www.google.com/maps/place/C/data=!4m7!3m6!1s0x3:0xc!8m2"
+
+    motor = MotorScraping()
+    repetidas = [url_a, url_a + "?authuser=0", url_b, url_a.replace("/A/", "/A%20Centro/")]
+    assert motor._recolectar_urls(DriverFalso(repetidas)) == [url_a, url_b]
+
+    lugares = {url: Lugar(nombre=nombre, direccion=f"Calle {nombre}") for url, nombre in
+               [(url_a, "A"), (url_b, "B"), (url_c, "C")]}
+    logs = []
+    motor = motor_sin_navegador(monkeypatch, lugares, logs)
+    feeds = [[url_a, url_b], [url_b, url_c]]
+    visitadas = []
+
+    def visitar(driver, url, timeout):
+        visitadas.append(url)
+        return lugares[url]
+
+    monkeypatch.setattr(motor, '_recolectar_urls', lambda driver: feeds.pop(0))
+    monkeypatch.setattr(motor, '_visitar_lugar', visitar)
+    config = dict(CONFIG_POR_DEFECTO, reutilizar_navegador=False)
+    estado = motor.ejecutar_lote([("restaurantes", "Córdoba"), ("bares", "Córdoba")], config)
+
+    assert visitadas == [url_a, url_b, url_c]
+    assert estado['lugares'] == 3
+    assert "🔁 1 lugares ya extraídos se omiten" in logs
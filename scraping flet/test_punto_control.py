@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Pruebas de los puntos de control para reanudar búsquedas
+"""
+
+from punto_control import PuntoControl
+
+
+def test_reanudar_solo_pendientes(tmp_path, monkeypatch):
+    """Al recargar el punto de control quedan solo las URLs no extraídas, en orden"""
+    monkeypatch.chdir(tmp_path)
+    urls = ["https://maps/place/a", "https://maps/place/b", "https://maps/place/c"]
+    punto_control = PuntoControl("hoteles", "Caracas, Venezuela", "20250101_000000", urls)
+    punto_control.marcar_hecha(urls[1])
+    punto_control.guardar()
+
+    recargado = PuntoControl.cargar("hoteles", "Caracas, Venezuela")
+    assert recargado.timestamp == "20250101_000000"
+    assert recargado.pendientes() == [urls[0], urls[2]]
+
+    recargado.eliminar()
+    assert PuntoControl.cargar("hoteles", "Caracas, Venezuela") is None
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Pruebas del refresco agrupado de la interfaz
+"""
+
+import time
+
+from refresco_ui import ProgramadorRefresco
+
+
+def test_agrupa_pedidos_de_refresco():
+    """Muchos pedidos seguidos se resuelven en pocos refrescos y todos los cambios se aplican"""
+    llamadas = []
+    aplicados = []
+    refresco = ProgramadorRefresco(lambda: llamadas.append(time.time()), hz=10)
+
+    for i in range(500):
+        refresco.encolar(lambda i=i: aplicados.append(i))
+        refresco.solicitar()
+    time.sleep(0.35)
+    refresco.detener()
+
+    assert aplicados == list(range(500))
+    assert 1 <= len(llamadas) <= 6
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Pruebas del ritmo de extracción en vivo
+"""
+
+import pytest
+
+import ritmo_extraccion
+from ritmo_extraccion import RitmoExtraccion, formatear_eta, sparkline
+
+
+class RelojFalso:
+    """Reloj monotónico que avanza solo cuando la prueba lo mueve"""
+
+    def __init__(self):
+        self.ahora = 1000.0
+
+    def __call__(self):
+        return self.ahora
+
+
+def test_ritmo_eta_y_degradacion(monkeypatch):
+    """El ritmo sale de los últimos lugares, la ETA de los pendientes y se avisa si cae"""
+    reloj = RelojFalso()
+    monkeypatch.setattr(ritmo_extraccion.time, 'monotonic', reloj)
+    ritmo = RitmoExtraccion()
+    ritmo.agregar_pendientes(100)
+
+    # Primeros lugares a uno por segundo
+    for _ in range(21):
+        reloj.ahora += 1
+        ritmo.registrar()
+    resumen = ritmo.resumen()
+    assert resumen['actual'] == pytest.approx(60)
+    assert resumen['eta'] == pytest.approx(79)
+    assert not resumen['degradado']
+
+    # Luego uno cada tres segundos: el ritmo actual cae a un tercio del inicial
+    for _ in range(21):
+        reloj.ahora += 3
+        ritmo.registrar()
+    ritmo.agregar_pendientes(-8)
+    resumen = ritmo.resumen()
+    assert resumen['actual'] == pytest.approx(20)
+    assert resumen['eta'] == pytest.approx(50 / 20 * 60)
+    assert resumen['degradado'] and resumen['relacion_inicial'] == pytest.approx(1 / 3)
+    # Las marcas de publicación no entran al sparkline: solo las latencias anotadas
+    assert resumen['sparkline'] == ""
+
+
+def test_sparkline_de_latencias():
+    """El sparkline dibuja lo que tardó cada visita, aunque los lugares se publiquen en ráfagas"""
+    ritmo = RitmoExtraccion()
+    for segundos in (1.0, 2.0, 8.0):
+        ritmo.registrar_latencia(segundos)
+        ritmo.registrar()
+    assert ritmo.resumen()['sparkline'] == "▁▂█"
+
+
+def test_formatos():
+    """El sparkline escala entre mínimo y máximo y la ETA se lee en la unidad más cómoda"""
+    assert sparkline([1, 2, 3, 8]) == "▁▂▃█"
+    assert sparkline([2, 2]) == "▁▁" and sparkline([]) == ""
+    assert [formatear_eta(s) for s in (35, 260, 3900, None)] == ["35 s", "4 min 20 s", "1 h 05 min", "-"]
@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la línea de comandos
+"""
+
+from motor_scraping import CONFIG_POR_DEFECTO
+from scraping_cli import configuracion_desde_args, crear_parser
+
+
+def test_valores_por_defecto_iguales_a_la_app():
+    """Sin opciones, la línea de comandos usa la misma configuración que la app"""
+    args = crear_parser().parse_args(["hoteles", "Caracas"])
+    assert configuracion_desde_args(args) == CONFIG_POR_DEFECTO
+
+    args = crear_parser().parse_args(["hoteles", "Caracas", "--no-completar-telefonos", "--visible"])
+    configuracion = configuracion_desde_args(args)
+    assert not configuracion['completar_telefonos'] and not configuracion['headless']
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Pruebas del gestor de sesiones de navegador
+"""
+
+import os
+import sys
+
+import pytest
+
+import sesiones_navegador
+from sesiones_navegador import GestorSesiones, memoria_arbol_mb
+
+CONFIG = {'headless': True, 'red_liviana': False, 'perfil_navegador': "perfiles"}
+
+
+class NavegadorFalso:
+    """Responde como un navegador vivo hasta que se cierra"""
+
+    def __init__(self, directorio_perfil):
+        self.directorio_perfil = directorio_perfil
+        self.cerrado = False
+        self.window_handles = ["pestaña"]
+
+    def execute_script(self, script):
+        if self.cerrado:
+            raise RuntimeError("navegador cerrado")
+        return 1
+
+    def quit(self):
+        self.cerrado = True
+
+
+def test_reutiliza_y_recicla():
+    """Un navegador libre y sano se reutiliza; al cumplir su ciclo o morir se abre otro"""
+    creados = []
+
+    def crear(config, directorio_perfil):
+        creados.append(NavegadorFalso(directorio_perfil))
+        return creados[-1]
+
+    gestor = GestorSesiones(crear, lugares_por_sesion=10)
+    primero = gestor.obtener(CONFIG)
+    segundo = gestor.obtener(CONFIG)
+    # Cada navegador simultáneo tiene su propia carpeta de perfil
+    assert primero.directorio_perfil != segundo.directorio_perfil
+
+    gestor.devolver(primero, lugares=4)
+    assert gestor.obtener(CONFIG) is primero
+
+    # Superado el límite de lugares se cierra en lugar de quedar libre
+    gestor.devolver(primero, lugares=6)
+    assert primero.cerrado and gestor.libres == 0
+
+    # Un navegador libre que dejó de responder se descarta al pedirlo
+    gestor.devolver(segundo)
+    segundo.quit()
+    tercero = gestor.obtener(CONFIG)
+    assert tercero is not segundo and len(creados) == 3
+
+    gestor.cerrar_todo()
+    assert tercero.cerrado
+
+
+class Servicio:
+    """Imita driver.service.process con el pid del chromedriver"""
+
+    def __init__(self, pid):
+        self.process = self
+        self.pid = pid
+
+
+def test_recicla_por_memoria_de_todo_chrome(monkeypatch):
+    """El límite de memoria se compara con la de chromedriver y sus procesos, medida por pid"""
+    memorias = {1: 500, 2: 3000}
+    monkeypatch.setattr(sesiones_navegador, 'memoria_arbol_mb', memorias.get)
+
+    def crear(config, directorio_perfil):
+        driver = NavegadorFalso(directorio_perfil)
+        driver.service = Servicio(len(gestor._sesiones) + 1)
+        return driver
+
+    gestor = GestorSesiones(crear, memoria_maxima_mb=2048)
+    liviano, pesado = gestor.obtener(CONFIG), gestor.obtener(CONFIG)
+    assert gestor.memoria_total_mb() == 3500
+
+    gestor.devolver(liviano)
+    gestor.devolver(pesado)
+    assert not liviano.cerrado and pesado.cerrado
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason="sin psutil solo se mide con /proc")
+def test_memoria_arbol_del_proceso_actual():
+    """La memoria de un proceso vivo se puede medir"""
+    assert memoria_arbol_mb(os.getpid()) > 0
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Pruebas del sitio de prueba local del benchmark
+"""
+
+import re
+import urllib.error
+import urllib.request
+
+import pytest
+
+from sitio_prueba import SitioPrueba, id_maps, lugares_sinteticos
+
+
+def leer(url):
+    with urllib.request.urlopen(url, timeout=5) as respuesta:
+        return respuesta.read().decode('utf-8')
+
+
+def test_feed_paginado_y_detalle():
+    """El feed entrega tandas con la marca de fin y cada lugar tiene su panel de detalle"""
+    with SitioPrueba(lugares_sinteticos(25), lugares_por_tanda=20) as sitio:
+        busqueda = leer(f"{sitio.url_base}/search/hoteles+Caracas")
+        anclas = re.findall(r'href="(/maps/place/[^"]+)"', busqueda)
+        assert '<div role="feed"' in busqueda
+        assert len(anclas) == 20 and 'class="HlvSq"' not in busqueda
+
+        resto = leer(f"{sitio.url_base}/feed?desde=20")
+        assert len(re.findall(r'/maps/place/', resto)) == 5 and 'class="HlvSq"' in resto
+
+        detalle = leer(f"http://127.0.0.1:{sitio.puerto}{anclas[0]}")
+        lugar = sitio.lugares[0]
+        assert f'<h1 class="DUwDvf">{lugar.nombre}</h1>' in detalle
+        assert 'data-item-id="address"' in detalle and lugar.direccion in detalle
+        assert id_maps(1) in anclas[0]
+
+        with pytest.raises(urllib.error.HTTPError):
+            leer(f"{sitio.url_base}/place/Nada/data=!1s0x0:0x0")
+        assert sitio.peticiones == 4
+